@@ -0,0 +1,85 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Eager vs. `torch.compile`d one-token decode steps (`enable_compiled_decode`) on a static KV cache.
+
+Both runs use static caches and greedy decoding, so they produce the same audio and the same number of frames.
+The compiled run is warmed up for its bucket first; the warmup time is reported separately.
+"""
+import time
+
+import numpy as np
+import torch
+
+from qwen_tts import Qwen3TTSModel
+
+
+def synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def bench(name: str, fn, device: str, warmup: int, iters: int) -> float:
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    synchronize(device)
+    ms = (time.perf_counter() - t0) / iters * 1000
+    print(f"[{name}] {ms:.2f} ms/request")
+    return ms
+
+
+def main():
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    dtype = torch.bfloat16 if device.startswith("cuda") else torch.float32
+    MODEL_PATH = "Qwen/Qwen3-TTS-12Hz-0.6B-Base/"
+    REF_AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/clone_2.wav"
+    REF_TEXT = "Okay. Yeah. I resent you. I love you. I respect you. But you know what? You blew it! And thanks to you."
+    TEXT = "Good morning everyone, and welcome to the weekly product review."
+    BATCH_SIZES, CACHE_LENGTHS = (1,), (1024,)
+    WARMUP, ITERS = 1, 5
+
+    tts = Qwen3TTSModel.from_pretrained(MODEL_PATH, device_map=device, dtype=dtype)
+    prompt = tts.create_voice_clone_prompt(ref_audio=REF_AUDIO, ref_text=REF_TEXT)
+
+    def run(**kwargs):
+        wavs, _ = tts.generate_voice_clone(
+            text=TEXT, language="English", voice_clone_prompt=prompt,
+            do_sample=False, subtalker_dosample=False, max_new_tokens=512, **kwargs,
+        )
+        return wavs[0]
+
+    eager_wav = run(use_static_cache=True)
+    eager = bench("eager, static cache", lambda: run(use_static_cache=True), device, WARMUP, ITERS)
+
+    tts.model.enable_compiled_decode(batch_sizes=BATCH_SIZES, cache_lengths=CACHE_LENGTHS)
+    t0 = time.perf_counter()
+    tts.model.warmup_compiled_decode()
+    print(f"warmup of {len(BATCH_SIZES) * len(CACHE_LENGTHS)} bucket(s): {time.perf_counter() - t0:.1f} s")
+    compiled_wav = run()
+    compiled = bench("compiled", run, device, WARMUP, ITERS)
+
+    same_length = len(eager_wav) == len(compiled_wav)
+    error = np.abs(eager_wav - compiled_wav).max() if same_length else float("nan")
+    print(f"same length: {same_length}, max abs diff: {error:.2e}")
+    print(f"speedup: {eager / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+CPU generation speed vs. PyTorch intra-op thread count.
+
+The process is first pinned with `configure_cpu_threads` (all available cores, a core list or one NUMA node),
+then the same greedy voice clone request is timed once per thread count. The efficiency column is the speedup
+over one thread divided by the thread count; where it drops, extra threads are better spent on another worker
+(`qwen-tts-demo --workers N`) than on this one.
+"""
+import time
+
+import torch
+
+from qwen_tts import Qwen3TTSModel
+from qwen_tts.core.cpu_threads import configure_cpu_threads, parse_cpu_list
+
+
+def synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def bench(name: str, fn, device: str, warmup: int, iters: int) -> float:
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    synchronize(device)
+    ms = (time.perf_counter() - t0) / iters * 1000
+    print(f"[{name}] {ms:.2f} ms/request")
+    return ms
+
+
+def main():
+    device = "cpu"
+    MODEL_PATH = "Qwen/Qwen3-TTS-12Hz-0.6B-Base/"
+    REF_AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/clone_2.wav"
+    REF_TEXT = "Okay. Yeah. I resent you. I love you. I respect you. But you know what? You blew it! And thanks to you."
+    TEXT = "Good morning everyone, and welcome to the weekly product review."
+    CPUS, NUMA_NODE = None, None  # e.g. "0-15" or 0; None runs on every available core
+    WARMUP, ITERS = 1, 3
+
+    applied = configure_cpu_threads(cpus=CPUS, numa_node=NUMA_NODE)
+    print(f"pinned to cores {applied['cpus']}")
+    num_cores = len(parse_cpu_list(applied["cpus"]))
+    thread_counts = sorted({n for n in (1, 2, 4, 8, 16, 32, 64) if n < num_cores} | {num_cores})
+
+    tts = Qwen3TTSModel.from_pretrained(MODEL_PATH, device_map=device, dtype=torch.float32)
+    prompt = tts.create_voice_clone_prompt(ref_audio=REF_AUDIO, ref_text=REF_TEXT)
+
+    def run():
+        wavs, sr = tts.generate_voice_clone(
+            text=TEXT, language="English", voice_clone_prompt=prompt,
+            do_sample=False, subtalker_dosample=False, max_new_tokens=512,
+        )
+        return len(wavs[0]) / sr
+
+    audio_seconds = run()
+    results = []
+    for num_threads in thread_counts:
+        torch.set_num_threads(num_threads)
+        ms = bench(f"{num_threads} threads", run, device, WARMUP, ITERS)
+        results.append((num_threads, ms))
+
+    single_thread_ms = results[0][1]
+    print(f"{'threads':>8} {'ms/request':>11} {'RTF':>7} {'speedup':>8} {'efficiency':>11}")
+    for num_threads, ms in results:
+        speedup = single_thread_ms / ms
+        print(
+            f"{num_threads:>8} {ms:>11.1f} {ms / 1000 / audio_seconds:>7.3f} "
+            f"{speedup:>8.2f} {speedup / num_threads:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
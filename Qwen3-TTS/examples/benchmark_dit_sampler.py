@@ -0,0 +1,91 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Quality / latency of the 25Hz DiT flow-matching sampler settings.
+
+Every setting starts from the same noise and is compared with a fine RK4 reference trajectory by the mean
+absolute error of the generated log-mel spectrogram. Pick the cheapest setting whose error is acceptable
+for a deployment and pass it to `Qwen3TTSTokenizer.decode(..., **setting)`.
+"""
+import time
+
+import torch
+
+from qwen_tts import Qwen3TTSTokenizer
+
+SETTINGS = {
+    "euler, 10 steps (default)": dict(solver="euler", num_steps=10),
+    "euler, 6 steps": dict(solver="euler", num_steps=6),
+    "euler, 10 steps, cfg until t=0.5": dict(solver="euler", num_steps=10, guidance_stop_time=0.5),
+    "midpoint, 6 steps": dict(solver="midpoint", num_steps=6),
+    "midpoint, 4 steps, cfg until t=0.5": dict(solver="midpoint", num_steps=4, guidance_stop_time=0.5),
+    "rk4, 4 steps": dict(solver="rk4", num_steps=4),
+    "adaptive, rtol=1e-2": dict(solver="adaptive", num_steps=4, rtol=1e-2, atol=1e-3),
+    "adaptive, rtol=5e-2": dict(solver="adaptive", num_steps=4, rtol=5e-2, atol=1e-2),
+}
+
+
+def synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def main():
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    TOKENIZER_PATH = "Qwen/Qwen3-TTS-Tokenizer-25Hz"
+    AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/tokenizer_demo_1.wav"
+    ITERS = 3
+
+    tokenizer = Qwen3TTSTokenizer.from_pretrained(TOKENIZER_PATH, device_map=device)
+    dit = tokenizer.model.decoder.dit
+    enc = tokenizer.encode(AUDIO)
+    codes = enc.audio_codes[0].unsqueeze(0).to(device)
+    xvectors = enc.xvectors[0].unsqueeze(0).to(device).to(tokenizer.model.dtype)
+    ref_mels = enc.ref_mels[0].unsqueeze(0).to(device).to(tokenizer.model.dtype)
+
+    num_evals = 0
+    dit_forward = dit.forward
+
+    def counting_forward(*args, **kwargs):
+        nonlocal num_evals
+        num_evals += 1
+        return dit_forward(*args, **kwargs)
+
+    def run(setting):
+        generator = torch.Generator(device=device).manual_seed(0)
+        return dit.sample(xvectors, ref_mels, codes, generator=generator, **setting)
+
+    with torch.no_grad():
+        reference = run(dict(solver="rk4", num_steps=33))
+        dit.forward = counting_forward
+        print(f"{codes.shape[1] / 25:.1f}s of audio on {device}")
+        print(f"{'setting':<38} {'DiT calls':>9} {'ms':>8} {'mel L1':>8}")
+        for name, setting in SETTINGS.items():
+            run(setting)  # warmup
+            num_evals = 0
+            synchronize(device)
+            t0 = time.perf_counter()
+            for _ in range(ITERS):
+                mel = run(setting)
+            synchronize(device)
+            ms = (time.perf_counter() - t0) / ITERS * 1000
+            error = (mel - reference).abs().mean().item()
+            print(f"{name:<38} {num_evals // ITERS:>9} {ms:>8.1f} {error:>8.4f}")
+        dit.forward = dit_forward
+
+
+if __name__ == "__main__":
+    main()
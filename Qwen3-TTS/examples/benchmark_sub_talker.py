@@ -0,0 +1,93 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Per-frame overhead of the sub-talker (code predictor): HuggingFace `generate()` vs. `generate_codes()`.
+
+Every talker step predicts the remaining `num_code_groups - 1` codebooks of a frame with the sub-talker,
+so its per-call overhead is paid 12.5 times per second of audio.
+"""
+import time
+
+import torch
+
+from qwen_tts import Qwen3TTSModel
+
+
+def synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def bench(name: str, fn, device: str, warmup: int, iters: int) -> float:
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    synchronize(device)
+    ms = (time.perf_counter() - t0) / iters * 1000
+    print(f"[{name}] {ms:.2f} ms/frame")
+    return ms
+
+
+def main():
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    dtype = torch.bfloat16 if device.startswith("cuda") else torch.float32
+    MODEL_PATH = "Qwen/Qwen3-TTS-12Hz-0.6B-Base/"
+    BATCH_SIZE = 1
+    WARMUP, ITERS = 5, 50
+
+    tts = Qwen3TTSModel.from_pretrained(MODEL_PATH, device_map=device, dtype=dtype)
+    code_predictor = tts.model.talker.code_predictor
+    hidden_size = tts.model.config.talker_config.hidden_size
+    num_steps = code_predictor.config.num_code_groups - 1
+
+    # last talker hidden state + first codebook embedding
+    inputs_embeds = torch.randn(BATCH_SIZE, 2, hidden_size, device=device, dtype=dtype)
+    sampling = dict(do_sample=True, top_k=50, top_p=1.0, temperature=0.9)
+
+    def hf_generate():
+        return code_predictor.generate(
+            inputs_embeds=inputs_embeds,
+            max_new_tokens=num_steps,
+            output_hidden_states=True,
+            return_dict_in_generate=True,
+            **sampling,
+        ).sequences
+
+    def fast_dynamic():
+        return code_predictor.generate_codes(inputs_embeds, **sampling)
+
+    def fast_static():
+        return code_predictor.generate_codes(inputs_embeds, cache_implementation="static", **sampling)
+
+    with torch.no_grad():
+        torch.manual_seed(0)
+        ref = hf_generate()
+        torch.manual_seed(0)
+        out = fast_dynamic()
+        print(f"same codes with the same seed: {torch.equal(ref, out)}")
+
+        before = bench("generate()", hf_generate, device, WARMUP, ITERS)
+        after = bench("generate_codes()", fast_dynamic, device, WARMUP, ITERS)
+        after_static = bench("generate_codes(static cache)", fast_static, device, WARMUP, ITERS)
+
+    print(f"speedup: {before / after:.2f}x (dynamic cache), {before / after_static:.2f}x (static cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Varlen attention paths of the 25Hz Whisper encoder: flash-attn vs. packed SDPA vs. the manual fallback.
+
+One `MultiHeadAttention` layer with the 25Hz tokenizer's encoder shape runs on a batch of audios of mixed
+duration, split into windows of `n_window` frames exactly as `WhisperEncoder.forward` does. Flash-attn is
+only measured when it is installed and the device is CUDA.
+"""
+import time
+
+import torch
+
+from qwen_tts.core.tokenizer_25hz.vq import whisper_encoder
+from qwen_tts.core.tokenizer_25hz.vq.whisper_encoder import MultiHeadAttention
+
+
+def synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def bench(name: str, fn, device: str, warmup: int, iters: int) -> float:
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    synchronize(device)
+    ms = (time.perf_counter() - t0) / iters * 1000
+    print(f"[{name}] {ms:.2f} ms/layer")
+    return ms
+
+
+def main():
+    device = "cpu"
+    dtype = torch.float32
+    N_STATE, N_HEAD, N_WINDOW = 1280, 20, 100
+    FRAMES_PER_SECOND = 50  # after the stride-2 conv
+    DURATIONS = [1.3, 2.7, 4.1, 5.0, 6.6, 8.2, 9.9, 12.4]
+    WARMUP, ITERS = 3, 20
+
+    if torch.cuda.is_available() and whisper_encoder.flash_attn_varlen_func is not None:
+        device, dtype = "cuda:0", torch.bfloat16
+
+    seqlens = []
+    for seconds in DURATIONS:
+        frames = int(seconds * FRAMES_PER_SECOND)
+        while frames > N_WINDOW:
+            seqlens.append(N_WINDOW)
+            frames -= N_WINDOW
+        seqlens.append(frames)
+    cu_seqlens = torch.tensor([0] + torch.tensor(seqlens).cumsum(0).tolist(), device=device, dtype=torch.int32)
+
+    attn = MultiHeadAttention(N_STATE, N_HEAD).to(device=device, dtype=dtype).eval()
+    x = torch.randn(sum(seqlens), N_STATE, device=device, dtype=dtype)
+    print(f"{len(DURATIONS)} audios, {len(seqlens)} windows, {sum(seqlens)} frames on {device} ({dtype})")
+
+    with torch.no_grad():
+        q, k, v = attn.query(x), attn.key(x), attn.value(x)
+        paths = {
+            "manual": lambda: attn.qkv_attention_manual(q, k, v, cu_seqlens),
+            "sdpa (packed)": lambda: attn.qkv_attention_sdpa(q, k, v, cu_seqlens),
+        }
+        if device.startswith("cuda"):
+            paths["flash-attn"] = lambda: attn.qkv_flash_attention(q, k, v, cu_seqlens)
+
+        reference = paths["sdpa (packed)"]().float()
+        timings = {}
+        for name, fn in paths.items():
+            error = (fn().float() - reference).abs().max().item()
+            timings[name] = bench(name, fn, device, WARMUP, ITERS)
+            print(f"    max abs diff vs. sdpa: {error:.2e}")
+
+    print(f"sdpa speedup over manual: {timings['manual'] / timings['sdpa (packed)']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Quality and speed of `Qwen3TTSForConditionalGeneration.quantize_for_cpu` against the float32 CPU model.
+
+For every mode:
+  - decoder: the reference audio is encoded (the encoder is not converted) and decoded by the float32 and the
+    converted 12Hz decoder. Same codes in, so the waveforms are compared sample by sample (SNR).
+  - generation: voice clone with greedy decoding. Once the first codebook of one frame differs, the
+    autoregressive outputs diverge. Because of that, the outputs are compared by duration, by the speaker
+    similarity to the reference audio (cosine of the model's own speaker encoder embeddings) and by the
+    similarity to the float32 output, not sample by sample.
+"""
+import gc
+import time
+
+import numpy as np
+import torch
+
+from qwen_tts import Qwen3TTSModel
+from qwen_tts.core.cpu_quantization import cpu_supports_bf16
+from qwen_tts.core.resampler import resample_batch
+
+
+def snr_db(reference: np.ndarray, estimate: np.ndarray) -> float:
+    n = min(len(reference), len(estimate))
+    noise = reference[:n] - estimate[:n]
+    return float(10 * np.log10(np.sum(reference[:n] ** 2) / max(np.sum(noise ** 2), 1e-12)))
+
+
+def speaker_similarity(tts: Qwen3TTSModel, a: np.ndarray, b: np.ndarray, sr: int) -> float:
+    emb = tts.model.extract_speaker_embeddings([a.astype(np.float32), b.astype(np.float32)], sr)
+    return torch.nn.functional.cosine_similarity(emb[0].float(), emb[1].float(), dim=0).item()
+
+
+def generate(tts: Qwen3TTSModel, texts, prompt):
+    kwargs = dict(
+        language="English", voice_clone_prompt=prompt, do_sample=False, subtalker_dosample=False, max_new_tokens=1024
+    )
+    # warmup, so that one-time setup (lazy imports, oneDNN primitives) is not billed to the first mode
+    tts.generate_voice_clone(text=texts[0], **kwargs)
+    wavs = []
+    t0 = time.perf_counter()
+    for text in texts:
+        out, sr = tts.generate_voice_clone(text=text, **kwargs)
+        wavs.append(out[0])
+    seconds = time.perf_counter() - t0
+    return wavs, sr, seconds
+
+
+def main():
+    MODEL_PATH = "Qwen/Qwen3-TTS-12Hz-0.6B-Base/"
+    REF_AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/clone_2.wav"
+    REF_TEXT = "Okay. Yeah. I resent you. I love you. I respect you. But you know what? You blew it! And thanks to you."
+    TEXTS = [
+        "Good morning everyone, and welcome to the weekly product review.",
+        "The quick brown fox jumps over the lazy dog while the rain keeps falling outside.",
+    ]
+    MODES = ["int8", "bf16"] if cpu_supports_bf16() else ["int8"]
+
+    fp32 = None
+    for mode in [None] + MODES:
+        # Fresh float32 model per mode (a converted speech tokenizer is no longer shared with later loads). The
+        # previous one is freed first, so that two models are never held in memory at once.
+        tts = None
+        gc.collect()
+        tts = Qwen3TTSModel.from_pretrained(MODEL_PATH, device_map="cpu", dtype=torch.float32)
+        if mode is not None:
+            tts.model.quantize_for_cpu(mode)
+        # Prompt extraction (speaker encoder, tokenizer encoder) is not converted and identical across modes.
+        prompt = tts.create_voice_clone_prompt(ref_audio=REF_AUDIO, ref_text=REF_TEXT)
+        ref_wav, ref_sr = tts._normalize_audio_inputs(REF_AUDIO)[0]
+        ref_wav = resample_batch([ref_wav], ref_sr, tts.model.speaker_encoder_sample_rate)[0]
+        with torch.no_grad():
+            codes = tts.model.speech_tokenizer.encode(ref_wav, sr=tts.model.speaker_encoder_sample_rate)
+            decoded, _ = tts.model.speech_tokenizer.decode(codes)
+            wavs, sr, seconds = generate(tts, TEXTS, prompt)
+        rtf = seconds / (sum(len(w) for w in wavs) / sr)
+
+        if mode is None:
+            fp32 = dict(decoded=decoded[0], wavs=wavs, seconds=seconds)
+            print(f"[fp32] RTF {rtf:.3f}")
+            continue
+        print(f"[{mode}] RTF {rtf:.3f} ({fp32['seconds'] / seconds:.2f}x vs. fp32)")
+        print(f"    decoder SNR on identical codes: {snr_db(fp32['decoded'], decoded[0]):.1f} dB")
+        for i, (fp32_wav, wav) in enumerate(zip(fp32["wavs"], wavs)):
+            print(
+                f"    text {i}: duration {len(wav) / sr:.2f}s (fp32 {len(fp32_wav) / sr:.2f}s), "
+                f"speaker sim to ref {speaker_similarity(tts, ref_wav, wav, sr):.3f} "
+                f"(fp32 {speaker_similarity(tts, ref_wav, fp32_wav, sr):.3f}), "
+                f"to fp32 output {speaker_similarity(tts, fp32_wav, wav, sr):.3f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ import numpy as np
 import torch
 from qwen_tts.core.models.configuration_qwen3_tts import Qwen3TTSConfig
 from qwen_tts.core.models.modeling_qwen3_tts import mel_spectrogram
+from qwen_tts.core.resampler import resample_batch
 from torch.utils.data import Dataset
 
 AudioLike = Union[
@@ -134,6 +135,8 @@ class TTSDataset(Dataset):
         ref_audio_list = self._ensure_list(ref_audio_path)
         normalized = self._normalize_audio_inputs(ref_audio_list)
         wav,sr = normalized[0]
+        if sr != 24000:
+            wav, sr = resample_batch([wav], sr, 24000)[0], 24000
 
         ref_mel = self.extract_mels(audio=wav, sr=sr)
 
@@ -16,6 +16,7 @@
 
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from qwen_tts import Qwen3TTSTokenizer
 
@@ -27,39 +28,36 @@ def main():
     parser.add_argument("--tokenizer_model_path", type=str, default="Qwen/Qwen3-TTS-Tokenizer-12Hz")
     parser.add_argument("--input_jsonl", type=str, required=True)
     parser.add_argument("--output_jsonl", type=str, required=True)
+    parser.add_argument("--audio_load_workers", type=int, default=None)
     args = parser.parse_args()
 
     tokenizer_12hz = Qwen3TTSTokenizer.from_pretrained(
         args.tokenizer_model_path,
         device_map=args.device,
     )
+    if args.audio_load_workers is not None:
+        tokenizer_12hz.audio_load_workers = args.audio_load_workers
 
     total_lines = open(args.input_jsonl).readlines()
     total_lines = [json.loads(line.strip()) for line in total_lines]
+    batches = [total_lines[i:i + BATCH_INFER_NUM] for i in range(0, len(total_lines), BATCH_INFER_NUM)]
+    input_sr = tokenizer_12hz.get_input_sample_rate()
 
-    final_lines = []
-    batch_lines = []
-    batch_audios = []
-    for line in total_lines:
-
-        batch_lines.append(line)
-        batch_audios.append(line['audio'])
+    def load_batch(batch_lines):
+        return tokenizer_12hz._normalize_audio_inputs([line['audio'] for line in batch_lines], sr=None)
 
-        if len(batch_lines) >= BATCH_INFER_NUM:
-            enc_res = tokenizer_12hz.encode(batch_audios)
+    # Decode the audio files of the next batch while the current one is encoded.
+    final_lines = []
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        next_audios = prefetcher.submit(load_batch, batches[0]) if batches else None
+        for i, batch_lines in enumerate(batches):
+            batch_audios = next_audios.result()
+            if i + 1 < len(batches):
+                next_audios = prefetcher.submit(load_batch, batches[i + 1])
+            enc_res = tokenizer_12hz.encode(batch_audios, sr=input_sr)
             for code, line in zip(enc_res.audio_codes, batch_lines):
                 line['audio_codes'] = code.cpu().tolist()
                 final_lines.append(line)
-            batch_lines.clear()
-            batch_audios.clear()
-
-    if len(batch_audios) > 0:
-        enc_res = tokenizer_12hz.encode(batch_audios)
-        for code, line in zip(enc_res.audio_codes, batch_lines):
-            line['audio_codes'] = code.cpu().tolist()
-            final_lines.append(line)
-        batch_lines.clear()
-        batch_audios.clear()
 
     final_lines = [json.dumps(line, ensure_ascii=False) for line in final_lines]
 
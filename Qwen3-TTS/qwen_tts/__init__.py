@@ -20,5 +20,7 @@ qwen_tts: Qwen-TTS package.
 
 from .inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
 from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+from .inference.qwen3_tts_scheduler import Qwen3TTSTalkerScheduler, Qwen3TTSSchedulerOutput
+from .inference.qwen3_tts_pipeline import Qwen3TTSPipeline
 
 __all__ = ["__version__"]
\ No newline at end of file
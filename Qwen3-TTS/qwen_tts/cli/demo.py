@@ -19,6 +19,8 @@ A gradio demo for Qwen3 TTS models.
 
 import argparse
 import os
+import subprocess
+import sys
 import tempfile
 from dataclasses import asdict
 from typing import Any, Dict, List, Optional, Tuple
@@ -28,6 +30,7 @@ import numpy as np
 import torch
 
 from .. import Qwen3TTSModel, VoiceClonePromptItem
+from ..core.cpu_threads import configure_cpu_threads, format_cpu_list, numa_nodes, parse_cpu_list, worker_cpu_sets
 
 
 def _title_case_display(s: str) -> str:
@@ -69,6 +72,7 @@ def build_parser() -> argparse.ArgumentParser:
             "  qwen-tts-demo Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign --port 8000 --ip 127.0.0.01\n"
             "  qwen-tts-demo Qwen/Qwen3-TTS-12Hz-1.7B-Base --device cuda:0\n"
             "  qwen-tts-demo Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice --dtype bfloat16 --no-flash-attn\n"
+            "  qwen-tts-demo Qwen/Qwen3-TTS-12Hz-0.6B-Base --device cpu --dtype float32 --workers 2 --port 8000\n"
         ),
         formatter_class=argparse.RawTextHelpFormatter,
         add_help=True,
@@ -108,6 +112,36 @@ def build_parser() -> argparse.ArgumentParser:
         help="Enable FlashAttention-2 (default: enabled).",
     )
 
+    # CPU threads / core placement args
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=None,
+        help="PyTorch intra-op threads (default: one per core of --cpus / --numa-node, else the PyTorch default).",
+    )
+    parser.add_argument("--num-interop-threads", type=int, default=None, help="PyTorch inter-op threads (optional).")
+    parser.add_argument(
+        "--ort-threads",
+        type=int,
+        default=None,
+        help="ONNX Runtime intra-op threads of the 25Hz tokenizer's x-vector extractor (optional, default: 1).",
+    )
+    parser.add_argument(
+        "--cpus",
+        default=None,
+        help='Cores to run on, Linux cpulist syntax, e.g. "0-15,32-47" (optional).',
+    )
+    parser.add_argument("--numa-node", type=int, default=None, help="Run on the cores of this NUMA node (optional).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of independent demo processes, each on its own disjoint core set and on ports\n"
+            "--port, --port + 1, ... (default: 1)."
+        ),
+    )
+
     # Gradio server args
     parser.add_argument(
         "--ip",
@@ -175,6 +209,33 @@ def _resolve_checkpoint(args: argparse.Namespace) -> str:
     return ckpt
 
 
+def _launch_workers(args: argparse.Namespace, argv: List[str]) -> int:
+    cpus = args.cpus
+    if args.numa_node is not None:
+        node_cpus = numa_nodes().get(args.numa_node)
+        if node_cpus is None:
+            raise ValueError(f"NUMA node {args.numa_node} not found")
+        cpus = [c for c in node_cpus if cpus is None or c in parse_cpu_list(cpus)]
+    cpu_sets = worker_cpu_sets(args.workers, cpus)
+
+    procs = []
+    for i, cpu_set in enumerate(cpu_sets):
+        cpu_spec = format_cpu_list(cpu_set)
+        port = args.port + i
+        print(f"Worker {i}: cores {cpu_spec}, port {port}")
+        # Later occurrences override the parent's own --workers / --cpus / --port.
+        cmd = [sys.executable, "-m", "qwen_tts.cli.demo", *argv, "--workers", "1", "--cpus", cpu_spec, "--port", str(port)]
+        procs.append(subprocess.Popen(cmd))
+    try:
+        return max(p.wait() for p in procs)
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait()
+        return 130
+
+
 def _collect_gen_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
     mapping = {
         "max_new_tokens": args.max_new_tokens,
@@ -600,6 +661,19 @@ def main(argv=None) -> int:
         parser.print_help()
         return 0
 
+    if args.workers > 1:
+        return _launch_workers(args, list(sys.argv[1:] if argv is None else argv))
+
+    if any(v is not None for v in (args.num_threads, args.num_interop_threads, args.ort_threads, args.cpus, args.numa_node)):
+        applied = configure_cpu_threads(
+            num_threads=args.num_threads,
+            num_interop_threads=args.num_interop_threads,
+            cpus=args.cpus,
+            numa_node=args.numa_node,
+            ort_num_threads=args.ort_threads,
+        )
+        print(f"CPU threads: {applied}")
+
     ckpt = _resolve_checkpoint(args)
 
     dtype = _dtype_from_str(args.dtype)
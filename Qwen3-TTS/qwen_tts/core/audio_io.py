@@ -0,0 +1,130 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Audio file reading shared by the TTS model and tokenizer wrappers.
+
+Plain PCM WAV files (16/32-bit integer or 32-bit float) are memory-mapped and converted with numpy, which
+releases the GIL, so a thread pool decodes several files at once. Every other format goes through
+`librosa.load`, whose soundfile backend releases the GIL while decoding as well. Both paths return the same
+float32 values as `librosa.load(path, sr=None, mono=True)`.
+"""
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import librosa
+import numpy as np
+
+DEFAULT_AUDIO_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _read_wav_mmap(path: str) -> Optional[Tuple[np.ndarray, int]]:
+    """Memory-map the samples of a PCM16/PCM32/float32 WAV file; returns None for any other file."""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if len(fmt) < 16:
+                    return None
+                f.seek(chunk_size & 1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    if fmt is None:
+        return None
+
+    format_tag, channels, sr, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    if format_tag == _WAVE_FORMAT_PCM and bits == 16:
+        dtype, scale = np.dtype("<i2"), 1.0 / 32768.0
+    elif format_tag == _WAVE_FORMAT_PCM and bits == 32:
+        dtype, scale = np.dtype("<i4"), 1.0 / 2147483648.0
+    elif format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        dtype, scale = np.dtype("<f4"), None
+    else:
+        return None
+    if channels < 1 or block_align != channels * dtype.itemsize:
+        return None
+
+    # Streamed WAVs may leave the data size unset, so never trust it beyond the end of the file.
+    data_size = min(chunk_size, os.path.getsize(path) - data_offset)
+    num_frames = data_size // block_align
+    if num_frames == 0:
+        return np.zeros(0, dtype=np.float32), int(sr)
+
+    samples = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(num_frames, channels))
+    audio = samples.astype(np.float32)
+    del samples
+    if scale is not None:
+        audio *= scale
+    if channels > 1:
+        audio = np.mean(audio, axis=-1, dtype=np.float32)
+    else:
+        audio = audio[:, 0]
+    return audio, int(sr)
+
+
+def read_audio_file(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Read an audio file at its native sampling rate as a mono float32 waveform.
+
+    Args:
+        path (str):
+            Local audio file path.
+
+    Returns:
+        Tuple[np.ndarray, int]:
+            (1-D float32 waveform, sampling rate).
+    """
+    try:
+        loaded = _read_wav_mmap(path)
+    except (OSError, ValueError, struct.error):
+        loaded = None
+    if loaded is not None:
+        return loaded
+    audio, sr = librosa.load(path, sr=None, mono=True)
+    return audio.astype(np.float32), int(sr)
+
+
+def map_in_threads(fn: Callable[[_T], _R], items: Sequence[_T], num_workers: int) -> List[_R]:
+    """
+    Apply `fn` to every item on up to `num_workers` threads and return the results in input order.
+
+    The first exception raised by `fn` is re-raised. With one item or `num_workers <= 1`, runs inline.
+    """
+    if num_workers <= 1 or len(items) <= 1:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(num_workers, len(items))) as executor:
+        return list(executor.map(fn, items))
@@ -0,0 +1,123 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Reduced-precision `nn.Linear` layers for float32 CPU inference.
+
+Two modes replace the `nn.Linear` modules of a sub-network in place, leaving its embeddings, norms and
+activations in float32:
+  - "int8": dynamic int8 quantization (`torch.ao.quantization.quantize_dynamic`). Weights are stored as int8
+    with per-output-channel scales and activations are quantized on the fly, which runs on any x86/ARM CPU.
+  - "bf16": weights stored in bfloat16 and matmuls computed in bfloat16 by oneDNN. Only worthwhile on CPUs with
+    native bf16 instructions (AVX512-BF16 / AMX); elsewhere bf16 matmuls are emulated and slower than float32.
+"""
+from typing import Optional
+
+import torch
+import torch.nn.functional as F
+from torch import nn
+
+CPU_QUANTIZATION_MODES = ("int8", "bf16", "auto")
+
+
+def cpu_supports_bf16() -> bool:
+    """Whether this CPU has native bf16 dot-product instructions (AVX512-BF16 or AMX)."""
+    for name in ("_is_avx512_bf16_supported", "_is_amx_tile_supported"):
+        check = getattr(torch.cpu, name, None)
+        if check is not None and check():
+            return True
+    return False
+
+
+def resolve_cpu_quantization(mode: Optional[str]) -> Optional[str]:
+    """
+    Normalize a CPU quantization mode.
+
+    Args:
+        mode (Optional[str]):
+            None / "none", "int8", "bf16" or "auto" (bf16 when `cpu_supports_bf16()`, int8 otherwise).
+
+    Returns:
+        Optional[str]:
+            "int8", "bf16", or None when quantization is disabled.
+    """
+    if mode is None:
+        return None
+    mode = str(mode).lower()
+    if mode == "none":
+        return None
+    if mode not in CPU_QUANTIZATION_MODES:
+        raise ValueError(f"Unknown CPU quantization mode {mode!r}, expected one of {('none',) + CPU_QUANTIZATION_MODES}")
+    if mode == "auto":
+        return "bf16" if cpu_supports_bf16() else "int8"
+    return mode
+
+
+class BFloat16Linear(nn.Module):
+    """`nn.Linear` with bfloat16 weights whose inputs and outputs keep the caller's dtype."""
+
+    def __init__(self, linear: nn.Linear):
+        super().__init__()
+        self.in_features = linear.in_features
+        self.out_features = linear.out_features
+        # Buffers rather than parameters, so `PreTrainedModel.dtype` still reports the float32 activations dtype.
+        self.register_buffer("weight", linear.weight.detach().to(torch.bfloat16))
+        self.register_buffer("bias", linear.bias.detach().to(torch.bfloat16) if linear.bias is not None else None)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return F.linear(x.to(torch.bfloat16), self.weight, self.bias).to(x.dtype)
+
+    def extra_repr(self) -> str:
+        return f"in_features={self.in_features}, out_features={self.out_features}, bias={self.bias is not None}"
+
+
+def _replace_linear_bf16(module: nn.Module) -> int:
+    replaced = 0
+    for name, child in module.named_children():
+        if type(child) is nn.Linear:
+            setattr(module, name, BFloat16Linear(child))
+            replaced += 1
+        else:
+            replaced += _replace_linear_bf16(child)
+    return replaced
+
+
+@torch.no_grad()
+def quantize_linear_layers(module: nn.Module, mode: str) -> int:
+    """
+    Replace every `nn.Linear` inside `module` (in place) with its reduced-precision CPU counterpart.
+
+    Modules already converted are left alone, so calling this twice, or on a sub-network shared by two models,
+    is harmless.
+
+    Args:
+        module (nn.Module):
+            Float32 module on CPU.
+        mode (str):
+            "int8" or "bf16" (see `resolve_cpu_quantization`).
+
+    Returns:
+        int:
+            Number of layers replaced.
+    """
+    if mode == "bf16":
+        return _replace_linear_bf16(module)
+    if mode == "int8":
+        num_linear = sum(1 for m in module.modules() if type(m) is nn.Linear)
+        if num_linear:
+            qconfig_spec = {nn.Linear: torch.ao.quantization.per_channel_dynamic_qconfig}
+            torch.ao.quantization.quantize_dynamic(module, qconfig_spec, dtype=torch.qint8, inplace=True)
+        return num_linear
+    raise ValueError(f"Unknown CPU quantization mode {mode!r}")
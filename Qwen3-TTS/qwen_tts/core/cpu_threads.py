@@ -0,0 +1,208 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+CPU thread and core placement for inference processes.
+
+By default PyTorch starts one intra-op thread per visible core and lets the OS move threads freely, so several
+model processes on one machine oversubscribe the cores, and on multi-socket machines threads and the memory
+they touch end up on different NUMA nodes. `configure_cpu_threads` pins the process to a set of cores (or one
+NUMA node) and sizes the PyTorch and ONNX Runtime thread pools to it; `worker_cpu_sets` splits the machine into
+disjoint core sets for independent worker processes.
+
+Core sets use the Linux cpulist syntax, e.g. "0-15,32-47". Affinity and NUMA topology are only available on
+Linux; elsewhere only the thread counts are applied.
+"""
+import os
+from typing import Dict, List, Optional, Sequence, Union
+
+import torch
+
+_NUMA_SYSFS = "/sys/devices/system/node"
+
+# ONNX Runtime threads used by sessions created after `configure_cpu_threads` (e.g. the 25Hz x-vector extractor).
+_ORT_NUM_THREADS = 1
+
+
+def parse_cpu_list(spec: Union[str, Sequence[int]]) -> List[int]:
+    """Parse a cpulist such as "0-3,8,10-11" (or pass a sequence of core ids through) into sorted core ids."""
+    if not isinstance(spec, str):
+        return sorted({int(c) for c in spec})
+    cpus = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus: Sequence[int]) -> str:
+    """Inverse of `parse_cpu_list`: [0, 1, 2, 3, 8] -> "0-3,8"."""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def available_cpus() -> List[int]:
+    """Cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def numa_nodes() -> Dict[int, List[int]]:
+    """NUMA node id -> its cores, read from sysfs. Empty when the topology is unknown."""
+    nodes = {}
+    if not os.path.isdir(_NUMA_SYSFS):
+        return nodes
+    for name in os.listdir(_NUMA_SYSFS):
+        if not (name.startswith("node") and name[4:].isdigit()):
+            continue
+        try:
+            with open(os.path.join(_NUMA_SYSFS, name, "cpulist")) as f:
+                cpus = parse_cpu_list(f.read().strip())
+        except OSError:
+            continue
+        if cpus:
+            nodes[int(name[4:])] = cpus
+    return dict(sorted(nodes.items()))
+
+
+def _split(cpus: List[int], num_parts: int) -> List[List[int]]:
+    size, extra = divmod(len(cpus), num_parts)
+    parts, start = [], 0
+    for i in range(num_parts):
+        end = start + size + (1 if i < extra else 0)
+        parts.append(cpus[start:end])
+        start = end
+    return parts
+
+
+def worker_cpu_sets(num_workers: int, cpus: Optional[Union[str, Sequence[int]]] = None) -> List[List[int]]:
+    """
+    Split cores into `num_workers` disjoint, contiguous core sets.
+
+    When the cores span several NUMA nodes and `num_workers` is a multiple of their number, every node gets the
+    same number of workers and no set crosses a node boundary. Otherwise the cores are split in order.
+
+    Args:
+        num_workers (int):
+            Number of workers.
+        cpus (str or Sequence[int], optional):
+            Cores to split, default `available_cpus()`.
+
+    Returns:
+        List[List[int]]:
+            One core list per worker.
+    """
+    cpus = parse_cpu_list(cpus) if cpus is not None else available_cpus()
+    if num_workers < 1 or num_workers > len(cpus):
+        raise ValueError(f"Cannot split {len(cpus)} cores into {num_workers} workers")
+    allowed = set(cpus)
+    nodes = [c for c in ([c for c in node if c in allowed] for node in numa_nodes().values()) if c]
+    if len(nodes) > 1 and num_workers % len(nodes) == 0 and all(len(n) >= num_workers // len(nodes) for n in nodes):
+        return [part for node in nodes for part in _split(node, num_workers // len(nodes))]
+    return _split(cpus, num_workers)
+
+
+def _set_process_affinity(cpus: List[int]):
+    # `sched_setaffinity(0, ...)` only moves the calling thread; pin every thread that already exists (thread
+    # pools, loader threads) so that threads they start later inherit the mask as well.
+    try:
+        thread_ids = [int(t) for t in os.listdir("/proc/self/task")]
+    except OSError:
+        thread_ids = [0]
+    for tid in thread_ids:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except OSError:
+            pass  # thread exited meanwhile
+    os.sched_setaffinity(0, cpus)
+
+
+def configure_cpu_threads(
+    num_threads: Optional[int] = None,
+    num_interop_threads: Optional[int] = None,
+    cpus: Optional[Union[str, Sequence[int]]] = None,
+    numa_node: Optional[int] = None,
+    ort_num_threads: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    Pin this process to a core set and size the PyTorch / ONNX Runtime thread pools to it.
+
+    Call it before loading a model: threads started earlier keep running, but on Linux they are moved onto the
+    new cores as well, and the weights loaded afterwards are first touched (hence allocated) on the NUMA node of
+    these cores. The inter-op pool can only be sized before PyTorch first uses it; a later call leaves it as is.
+
+    Args:
+        num_threads (int, optional):
+            Intra-op threads, default one per core of the set.
+        num_interop_threads (int, optional):
+            Inter-op threads; left at the PyTorch default if not given.
+        cpus (str or Sequence[int], optional):
+            Cores to run on, e.g. "0-15".
+        numa_node (int, optional):
+            Run on the cores of this NUMA node (intersected with `cpus` if both are given).
+        ort_num_threads (int, optional):
+            Intra-op threads of ONNX Runtime sessions created afterwards; default 1.
+
+    Returns:
+        Dict[str, object]:
+            The applied settings: "cpus", "num_threads", "num_interop_threads", "ort_num_threads".
+    """
+    global _ORT_NUM_THREADS
+    selected = parse_cpu_list(cpus) if cpus is not None else None
+    if numa_node is not None:
+        nodes = numa_nodes()
+        if numa_node not in nodes:
+            raise ValueError(f"NUMA node {numa_node} not found (available: {sorted(nodes)})")
+        selected = [c for c in nodes[numa_node] if selected is None or c in selected]
+    if selected is not None:
+        if not selected:
+            raise ValueError("The requested core set is empty")
+        if hasattr(os, "sched_setaffinity"):
+            _set_process_affinity(selected)
+        else:
+            print("CPU affinity is not supported on this platform; only thread counts are applied.")
+
+    cores = selected if selected is not None else available_cpus()
+    torch.set_num_threads(num_threads or len(cores))
+    if num_interop_threads:
+        try:
+            torch.set_num_interop_threads(num_interop_threads)
+        except RuntimeError as e:
+            print(f"Inter-op threads unchanged ({torch.get_num_interop_threads()}): {e}")
+    if ort_num_threads:
+        _ORT_NUM_THREADS = ort_num_threads
+
+    return {
+        "cpus": format_cpu_list(cores),
+        "num_threads": torch.get_num_threads(),
+        "num_interop_threads": torch.get_num_interop_threads(),
+        "ort_num_threads": _ORT_NUM_THREADS,
+    }
+
+
+def get_ort_num_threads() -> int:
+    """Intra-op thread count for new ONNX Runtime sessions (see `configure_cpu_threads`)."""
+    return _ORT_NUM_THREADS
@@ -16,8 +16,12 @@
 
 import json
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, Optional
+from functools import lru_cache
+from queue import Queue
+from typing import Callable, Iterator, Optional
 
 import huggingface_hub
 import torch
@@ -26,8 +30,10 @@ from librosa.filters import mel as librosa_mel_fn
 from torch import nn
 from torch.nn import functional as F
 from transformers.activations import ACT2FN
-from transformers.cache_utils import Cache, DynamicCache
-from transformers.generation import GenerationMixin
+from transformers.cache_utils import Cache, DynamicCache, StaticCache
+from transformers.generation import (GenerationMixin, StoppingCriteria,
+                                     StoppingCriteriaList)
+from transformers.generation.streamers import BaseStreamer
 from transformers.integrations import use_kernel_forward_from_hub
 from transformers.masking_utils import (create_causal_mask,
                                         create_sliding_window_causal_mask)
@@ -44,6 +50,7 @@ from transformers.utils import can_return_tuple, logging
 from transformers.utils.hub import cached_file
 
 from ...inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+from ..cpu_quantization import quantize_linear_layers, resolve_cpu_quantization
 from .configuration_qwen3_tts import (Qwen3TTSConfig,
                                       Qwen3TTSSpeakerEncoderConfig,
                                       Qwen3TTSTalkerCodePredictorConfig,
@@ -92,6 +99,18 @@ def download_weights_from_hf_specific(
     return hf_folder
 
 
+def _reflect_pad_tails(hidden_states: torch.Tensor, lengths: torch.Tensor, padding: int) -> torch.Tensor:
+    """
+    Write the reflection of every sequence's last frames right after its end, which is what `padding_mode="reflect"`
+    sees for an unpadded sequence. The batch needs at least `padding` frames of room after its longest sequence.
+    """
+    channels = hidden_states.shape[1]
+    offsets = torch.arange(padding, device=hidden_states.device)
+    source = (lengths[:, None] - 2 - offsets).clamp(min=0)[:, None, :].expand(-1, channels, -1)
+    target = (lengths[:, None] + offsets)[:, None, :].expand(-1, channels, -1)
+    return hidden_states.scatter(2, target, torch.gather(hidden_states, 2, source))
+
+
 class Res2NetBlock(torch.nn.Module):
     def __init__(self, in_channels, out_channels, scale=8, kernel_size=3, dilation=1):
         super().__init__()
@@ -112,15 +131,15 @@ class Res2NetBlock(torch.nn.Module):
         )
         self.scale = scale
 
-    def forward(self, hidden_states):
+    def forward(self, hidden_states, lengths=None):
         outputs = []
         for i, hidden_part in enumerate(torch.chunk(hidden_states, self.scale, dim=1)):
             if i == 0:
                 output_part = hidden_part
             elif i == 1:
-                output_part = self.blocks[i - 1](hidden_part)
+                output_part = self.blocks[i - 1](hidden_part, lengths)
             else:
-                output_part = self.blocks[i - 1](hidden_part + output_part)
+                output_part = self.blocks[i - 1](hidden_part + output_part, lengths)
             outputs.append(output_part)
         output = torch.cat(outputs, dim=1)
         return output
@@ -147,8 +166,13 @@ class SqueezeExcitationBlock(nn.Module):
         )
         self.sigmoid = nn.Sigmoid()
 
-    def forward(self, hidden_states):
-        hidden_states_mean = hidden_states.mean(dim=2, keepdim=True)
+    def forward(self, hidden_states, lengths=None):
+        if lengths is None:
+            hidden_states_mean = hidden_states.mean(dim=2, keepdim=True)
+        else:
+            mask = torch.arange(hidden_states.shape[2], device=hidden_states.device) < lengths[:, None]
+            mask = mask.unsqueeze(1).to(hidden_states.dtype)
+            hidden_states_mean = (hidden_states * mask).sum(dim=2, keepdim=True) / lengths.view(-1, 1, 1)
 
         hidden_states_mean = self.relu(self.conv1(hidden_states_mean))
         hidden_states_mean = self.sigmoid(self.conv2(hidden_states_mean))
@@ -211,13 +235,14 @@ class AttentiveStatisticsPooling(nn.Module):
         std = torch.sqrt((m * (x - mean.unsqueeze(dim)).pow(2)).sum(dim).clamp(self.eps))
         return mean, std
 
-    def forward(self, hidden_states):
+    def forward(self, hidden_states, lengths=None):
         seq_length = hidden_states.shape[-1]
-        lengths = torch.ones(hidden_states.shape[0], device=hidden_states.device)
+        if lengths is None:
+            lengths = torch.ones(hidden_states.shape[0], device=hidden_states.device) * seq_length
 
         # Make binary mask of shape [N, 1, L]
         mask = self._length_to_mask(
-            lengths * seq_length, max_len=seq_length, dtype=hidden_states.dtype, device=hidden_states.device
+            lengths, max_len=seq_length, dtype=hidden_states.dtype, device=hidden_states.device
         )
         mask = mask.unsqueeze(1)
 
@@ -262,8 +287,12 @@ class TimeDelayNetBlock(nn.Module):
             padding_mode="reflect",
         )
         self.activation = nn.ReLU()
+        # frames of "same" padding on the right
+        self.padding = dilation * (kernel_size - 1) - dilation * (kernel_size - 1) // 2
 
-    def forward(self, hidden_states: torch.Tensor):
+    def forward(self, hidden_states: torch.Tensor, lengths: Optional[torch.Tensor] = None):
+        if lengths is not None and self.padding > 0:
+            hidden_states = _reflect_pad_tails(hidden_states, lengths, self.padding)
         return self.activation(self.conv(hidden_states))
 
 class SqueezeExcitationRes2NetBlock(nn.Module):
@@ -297,13 +326,13 @@ class SqueezeExcitationRes2NetBlock(nn.Module):
         )
         self.se_block = SqueezeExcitationBlock(out_channels, se_channels, out_channels)
 
-    def forward(self, hidden_state):
+    def forward(self, hidden_state, lengths=None):
         residual = hidden_state
 
-        hidden_state = self.tdnn1(hidden_state)
-        hidden_state = self.res2net_block(hidden_state)
-        hidden_state = self.tdnn2(hidden_state)
-        hidden_state = self.se_block(hidden_state)
+        hidden_state = self.tdnn1(hidden_state, lengths)
+        hidden_state = self.res2net_block(hidden_state, lengths)
+        hidden_state = self.tdnn2(hidden_state, lengths)
+        hidden_state = self.se_block(hidden_state, lengths)
 
         return hidden_state + residual
 
@@ -370,21 +399,34 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
             padding_mode="reflect",
         )
 
-    def forward(self, hidden_states):
+    def forward(self, hidden_states, lengths=None):
+        """
+        Args:
+            hidden_states (`torch.Tensor` of shape `(batch_size, num_frames, mel_dim)`):
+                Mel spectrograms, right-padded when `lengths` is given.
+            lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*):
+                Number of valid frames of every spectrogram. Padding frames are then kept out of the reflect
+                padding of the convolutions and out of all time statistics, so each embedding is the one of the
+                unpadded input.
+        """
         # Minimize transpose for efficiency
         hidden_states = hidden_states.transpose(1, 2)
+        if lengths is not None:
+            # room after the longest sequence for the reflected tails
+            max_padding = max(m.padding for m in self.modules() if isinstance(m, TimeDelayNetBlock))
+            hidden_states = F.pad(hidden_states, (0, max_padding))
 
         hidden_states_list = []
         for layer in self.blocks:
-            hidden_states = layer(hidden_states)
+            hidden_states = layer(hidden_states, lengths)
             hidden_states_list.append(hidden_states)
 
         # Multi-layer feature aggregation
         hidden_states = torch.cat(hidden_states_list[1:], dim=1)
-        hidden_states = self.mfa(hidden_states)
+        hidden_states = self.mfa(hidden_states, lengths)
 
         # Attentive Statistical Pooling
-        hidden_states = self.asp(hidden_states)
+        hidden_states = self.asp(hidden_states, lengths)
 
         # Final linear transformation
         hidden_states = self.fc(hidden_states)
@@ -396,6 +438,32 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
 def dynamic_range_compression_torch(x, C=1, clip_val=1e-5):
     return torch.log(torch.clamp(x, min=clip_val) * C)
 
+@lru_cache(maxsize=None)
+def mel_filterbank(
+    sampling_rate: int, n_fft: int, num_mels: int, fmin: int, fmax: Optional[int], device: torch.device, dtype: torch.dtype
+) -> torch.Tensor:
+    """
+    Slaney-normalised librosa mel filterbank of shape `(num_mels, n_fft // 2 + 1)`, built once per argument set.
+    The returned tensor is shared between callers and must not be modified in place.
+    """
+    mel = librosa_mel_fn(sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax)
+    return torch.from_numpy(mel).to(device=device, dtype=dtype)
+
+
+@lru_cache(maxsize=None)
+def hann_window(win_size: int, device: torch.device, dtype: torch.dtype) -> torch.Tensor:
+    """Shared Hann window for `torch.stft`, built once per argument set. Must not be modified in place."""
+    return torch.hann_window(win_size, device=device, dtype=dtype)
+
+
+def _check_waveform_range(y: torch.Tensor):
+    min_value, max_value = torch.aminmax(y)
+    if min_value < -1.0:
+        print(f"[WARNING] Min value of input waveform signal is {min_value}")
+    if max_value > 1.0:
+        print(f"[WARNING] Max value of input waveform signal is {max_value}")
+
+
 def mel_spectrogram(
     y: torch.Tensor,
     n_fft: int,
@@ -406,10 +474,12 @@ def mel_spectrogram(
     fmin: int,
     fmax: int = None,
     center: bool = False,
+    check_range: bool = False,
 ) -> torch.Tensor:
     """
     Calculate the mel spectrogram of an input signal.
     This function uses slaney norm for the librosa mel filterbank (using librosa.filters.mel) and uses Hann window for STFT (using torch.stft).
+    The filterbank and the window are cached per sampling rate, sizes, device and dtype.
 
     Args:
         y (torch.Tensor): Input signal.
@@ -421,23 +491,16 @@ def mel_spectrogram(
         fmin (int): Minimum frequency for mel filterbank.
         fmax (int): Maximum frequency for mel filterbank. If None, defaults to half the sampling rate (fmax = sr / 2.0) inside librosa_mel_fn
         center (bool): Whether to pad the input to center the frames. Default is False.
+        check_range (bool): Print a warning if the signal leaves [-1, 1]. Default is False.
 
     Returns:
         torch.Tensor: Mel spectrogram.
     """
-    if torch.min(y) < -1.0:
-        print(f"[WARNING] Min value of input waveform signal is {torch.min(y)}")
-    if torch.max(y) > 1.0:
-        print(f"[WARNING] Max value of input waveform signal is {torch.max(y)}")
-
-    device = y.device
-
-    mel = librosa_mel_fn(
-        sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax
-    )
+    if check_range:
+        _check_waveform_range(y)
 
-    mel_basis = torch.from_numpy(mel).float().to(device)
-    hann_window = torch.hann_window(win_size).to(device)
+    mel_basis = mel_filterbank(sampling_rate, n_fft, num_mels, fmin, fmax, y.device, y.dtype)
+    window = hann_window(win_size, y.device, y.dtype)
 
     padding = (n_fft - hop_size) // 2
     y = torch.nn.functional.pad(
@@ -449,7 +512,7 @@ def mel_spectrogram(
         n_fft,
         hop_length=hop_size,
         win_length=win_size,
-        window=hann_window,
+        window=window,
         center=center,
         pad_mode="reflect",
         normalized=False,
@@ -464,6 +527,68 @@ def mel_spectrogram(
     return mel_spec
 
 
+def mel_spectrogram_batch(
+    y: torch.Tensor,
+    lengths: torch.Tensor,
+    n_fft: int,
+    num_mels: int,
+    sampling_rate: int,
+    hop_size: int,
+    win_size: int,
+    fmin: int,
+    fmax: int = None,
+    check_range: bool = False,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    `mel_spectrogram` (with `center=False`) of a right-padded batch of signals in a single STFT.
+
+    Every signal is reflect-padded at its own end, so the frames within its length are the same as those of
+    `mel_spectrogram` on the unpadded signal.
+
+    Args:
+        y (torch.Tensor): Padded signals of shape `(batch_size, max_length)`.
+        lengths (torch.Tensor): Number of valid samples of every signal, shape `(batch_size,)`.
+        Other arguments are the same as for `mel_spectrogram`.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Mel spectrograms `(batch_size, num_mels, max_frames)` and the number of
+        valid frames of every signal `(batch_size,)`. Frames past a signal's length are padding.
+    """
+    if check_range:
+        _check_waveform_range(y)
+
+    mel_basis = mel_filterbank(sampling_rate, n_fft, num_mels, fmin, fmax, y.device, y.dtype)
+    window = hann_window(win_size, y.device, y.dtype)
+
+    lengths = lengths.to(y.device)
+    padding = (n_fft - hop_size) // 2
+    # reflect the head as usual, then write the reflection of each signal's own tail right after its end
+    padded = torch.nn.functional.pad(y.unsqueeze(1), (padding, padding), mode="reflect").squeeze(1)
+    offsets = torch.arange(padding, device=y.device)
+    tail_source = (lengths[:, None] - 2 - offsets).clamp(min=0)
+    tail = torch.gather(y, 1, tail_source)
+    padded = padded.scatter(1, lengths[:, None] + padding + offsets, tail)
+
+    spec = torch.stft(
+        padded,
+        n_fft,
+        hop_length=hop_size,
+        win_length=win_size,
+        window=window,
+        center=False,
+        normalized=False,
+        onesided=True,
+        return_complex=True,
+    )
+    spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
+
+    mel_spec = torch.matmul(mel_basis, spec)
+    mel_spec = dynamic_range_compression_torch(mel_spec)
+
+    frame_lengths = (lengths + 2 * padding - n_fft) // hop_size + 1
+    return mel_spec, frame_lengths
+
+
 class Qwen3TTSPreTrainedModel(PreTrainedModel):
     config_class = Qwen3TTSConfig
     base_model_prefix = "model"
@@ -1012,6 +1137,41 @@ class Qwen3TTSDecoderLayer(GradientCheckpointingLayer):
         return outputs
 
 
+def sample_next_token(
+    logits: torch.Tensor,
+    do_sample: bool = True,
+    top_k: Optional[int] = None,
+    top_p: Optional[float] = None,
+    temperature: Optional[float] = None,
+) -> torch.LongTensor:
+    """
+    Pick the next token from `(batch_size, vocab_size)` logits.
+
+    Applies temperature, top-k and top-p in the same order and with the same semantics as the
+    `transformers` logits warpers used by `generate(do_sample=True)`, then samples with `torch.multinomial`.
+    Falls back to greedy argmax when `do_sample` is False.
+    """
+    if not do_sample:
+        return torch.argmax(logits, dim=-1)
+
+    if temperature is not None and temperature != 1.0:
+        logits = logits / temperature
+    if top_k is not None and top_k != 0:
+        top_k = min(top_k, logits.shape[-1])
+        kth_logits = torch.topk(logits, top_k)[0][..., -1, None]
+        logits = logits.masked_fill(logits < kth_logits, -float("inf"))
+    if top_p is not None and top_p < 1.0:
+        sorted_logits, sorted_indices = torch.sort(logits, descending=False)
+        cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        sorted_indices_to_remove = cumulative_probs <= (1 - top_p)
+        sorted_indices_to_remove[..., -1:] = False
+        indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+        logits = logits.masked_fill(indices_to_remove, -float("inf"))
+
+    probs = nn.functional.softmax(logits, dim=-1)
+    return torch.multinomial(probs, num_samples=1).squeeze(1)
+
+
 class Qwen3TTSTalkerCodePredictorModel(Qwen3TTSPreTrainedModel):
     config_class = Qwen3TTSTalkerCodePredictorConfig
     base_model_prefix = "talker.code_predictor.model"
@@ -1172,6 +1332,7 @@ class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTraine
             self.small_to_mtp_projection = torch.nn.Linear(talker_config.hidden_size, config.hidden_size, bias=True)
         else:
             self.small_to_mtp_projection = torch.nn.Identity()
+        self.decode_compiler = None
 
         # Initialize weights and apply final processing
         self.post_init()
@@ -1318,6 +1479,80 @@ class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTraine
         model_kwargs["generation_steps"] = outputs.generation_steps
         return model_kwargs
 
+    def _get_static_codes_cache(self, batch_size: int, dtype: torch.dtype, device: torch.device) -> StaticCache:
+        cache_key = (batch_size, dtype, device)
+        if getattr(self, "_static_codes_cache_key", None) != cache_key:
+            self._static_codes_cache = StaticCache(config=self.config, max_cache_len=self.config.num_code_groups)
+            self._static_codes_cache_key = cache_key
+        else:
+            self._static_codes_cache.reset()
+        return self._static_codes_cache
+
+    def decode_step(self, inputs_embeds: torch.Tensor, past_key_values: Cache, cache_position: torch.LongTensor):
+        """One sub-talker step without the output head; the unit compiled by `Qwen3TTSDecodeCompiler`."""
+        outputs = self.model(
+            inputs_embeds=inputs_embeds,
+            past_key_values=past_key_values,
+            use_cache=True,
+            cache_position=cache_position,
+        )
+        return outputs.last_hidden_state[:, -1, :]
+
+    @torch.no_grad()
+    def generate_codes(
+        self,
+        inputs_embeds: torch.Tensor,
+        do_sample: bool = True,
+        top_k: Optional[int] = 50,
+        top_p: Optional[float] = 1.0,
+        temperature: Optional[float] = 0.9,
+        cache_implementation: Optional[str] = None,
+    ) -> torch.LongTensor:
+        """
+        Predict the residual codebooks of one frame with a fixed-length decoding loop.
+
+        Equivalent to `generate(inputs_embeds=..., max_new_tokens=num_code_groups - 1, ...)` with the same
+        temperature / top-k / top-p semantics as the `transformers` logits warpers, but without the
+        `GenerationMixin` setup, logits processor construction and output collection on every frame.
+
+        Args:
+            inputs_embeds (`torch.FloatTensor` of shape `(batch_size, 2, hidden_size)`):
+                Last talker hidden state followed by the embedding of the first codebook.
+            cache_implementation (`str`, *optional*):
+                `"static"` reuses a preallocated cache kept on the module, otherwise a `DynamicCache` is used.
+
+        Returns:
+            `torch.LongTensor` of shape `(batch_size, num_code_groups - 1)`.
+        """
+        batch_size = inputs_embeds.shape[0]
+        num_steps = self.config.num_code_groups - 1
+        compiled_step = None
+        if self.decode_compiler is not None and cache_implementation == "static":
+            compiled_step = self.decode_compiler.sub_talker_step(self, batch_size)
+        if compiled_step is not None:
+            past_key_values = self.decode_compiler.sub_talker_cache(self, batch_size)
+        elif cache_implementation == "static":
+            past_key_values = self._get_static_codes_cache(batch_size, inputs_embeds.dtype, inputs_embeds.device)
+        else:
+            past_key_values = DynamicCache()
+
+        hidden_states = self.small_to_mtp_projection(inputs_embeds)
+        cache_position = torch.arange(hidden_states.shape[1], device=hidden_states.device)
+        codes = []
+        for step in range(num_steps):
+            # the two-position prefill initializes the static cache and always runs eagerly
+            decode_step = compiled_step if compiled_step is not None and step > 0 else self.decode_step
+            last_hidden_state = decode_step(hidden_states, past_key_values, cache_position)
+            logits = self.lm_head[step](last_hidden_state).float()
+            next_codes = sample_next_token(logits, do_sample, top_k, top_p, temperature)
+            codes.append(next_codes)
+            if step + 1 < num_steps:
+                hidden_states = self.small_to_mtp_projection(
+                    self.model.get_input_embeddings()[step](next_codes.unsqueeze(1))
+                )
+                cache_position = cache_position[-1:] + 1
+        return torch.stack(codes, dim=1)
+
 
 @dataclass
 class Qwen3TTSTalkerOutputWithPast(ModelOutput):
@@ -1567,6 +1802,7 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
     _pp_plan = {"lm_head": (["hidden_states"], ["logits"])}
     config_class = Qwen3TTSTalkerConfig
     base_model_prefix = "talker"
+    static_cache_length_multiple = 256
 
     def __init__(self, config: Qwen3TTSTalkerConfig):
         super().__init__(config)
@@ -1582,6 +1818,7 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             talker_config=config
         )
         self.rope_deltas = None
+        self.decode_compiler = None
 
         # Initialize weights and apply final processing
         self.post_init()
@@ -1632,6 +1869,19 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         sub_talker_loss = sub_talker_outputs.loss
         return sub_talker_logits, sub_talker_loss
 
+    def decode_step(self, inputs_embeds, attention_mask, position_ids, past_key_values, cache_position):
+        """One talker step on a static cache; the unit compiled by `Qwen3TTSDecodeCompiler`."""
+        hidden_states = self.model(
+            input_ids=None,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=past_key_values,
+            inputs_embeds=inputs_embeds,
+            use_cache=True,
+            cache_position=cache_position,
+        ).last_hidden_state
+        return hidden_states, self.codec_head(hidden_states)
+
     @can_return_tuple
     def forward(
         self,
@@ -1653,6 +1903,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         subtalker_top_p=None,
         subtalker_top_k=None,
         subtalker_temperature=None,
+        subtalker_cache_implementation=None,
+        codec_streamer=None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
         r"""
@@ -1660,6 +1912,13 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             Labels for computing the masked language modeling loss. Indices should either be in `[0, ...,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
+        subtalker_cache_implementation (`str`, *optional*):
+            Cache used by the sub-talker for every frame, `"static"` reuses a preallocated cache instead of
+            growing a new `DynamicCache`.
+        codec_streamer (`Qwen3TTSCodecStreamer`, *optional*):
+            Receives every completed codec frame of shape `(batch_size, num_code_groups)` as soon as the
+            sub-talker has predicted its residual codebooks, together with the last-layer talker hidden state
+            of shape `(batch_size, 1, hidden_size)` the frame was predicted from.
         ```"""
         # Prefill
         if inputs_embeds is not None and inputs_embeds.shape[1] > 1:
@@ -1668,20 +1927,20 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         # Generate
         else:
             last_id_hidden = self.get_input_embeddings()(input_ids)
-            predictor_result = self.code_predictor.generate(
+            predictor_codes = self.code_predictor.generate_codes(
                 inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
-                max_new_tokens=self.config.num_code_groups - 1,
                 do_sample=subtalker_dosample,
                 top_p=subtalker_top_p,
                 top_k=subtalker_top_k,
                 temperature=subtalker_temperature,
-                output_hidden_states=True,
-                return_dict_in_generate=True,
+                cache_implementation=subtalker_cache_implementation,
             )
-            codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
+            codec_ids = torch.cat((input_ids, predictor_codes), dim=-1)
+            if codec_streamer is not None:
+                codec_streamer.put(codec_ids, past_hidden)
             codec_hiddens = torch.cat(
                 [last_id_hidden]
-                + [self.code_predictor.get_input_embeddings()[i](predictor_result.sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
+                + [self.code_predictor.get_input_embeddings()[i](predictor_codes[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
                 dim=1,
             )
             inputs_embeds = codec_hiddens.sum(1, keepdim=True)
@@ -1695,11 +1954,14 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
                 cache_position is None
                 or (cache_position is not None and cache_position[0] == 0)
                 or self.rope_deltas is None
+                or generation_step == -1
             ):
                 delta0 = (1 - attention_mask).sum(dim=-1).unsqueeze(1)
                 position_ids, rope_deltas = self.get_rope_index(
                     attention_mask,
                 )
+                # a prefill on top of a cached prompt prefix only runs the remaining positions
+                position_ids = position_ids[..., -inputs_embeds.shape[1]:]
                 rope_deltas = rope_deltas - delta0
                 self.rope_deltas = rope_deltas
             else:
@@ -1710,21 +1972,36 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
                 position_ids = position_ids.add(delta)
                 position_ids = position_ids.unsqueeze(0).expand(3, -1, -1)
 
-        outputs: BaseModelOutputWithPast = self.model(
-            input_ids=None,
-            attention_mask=attention_mask,
-            position_ids=position_ids,
-            past_key_values=past_key_values,
-            inputs_embeds=inputs_embeds,
-            use_cache=use_cache,
-            output_attentions=output_attentions,
-            output_hidden_states=output_hidden_states,
-            cache_position=cache_position,
-            **kwargs,
-        )
-
-        hidden_states = outputs.last_hidden_state
-        logits = self.codec_head(hidden_states)
+        compiled_step = None
+        if self.decode_compiler is not None and generation_step != -1 and isinstance(past_key_values, StaticCache):
+            compiled_step = self.decode_compiler.talker_step(
+                self, inputs_embeds.shape[0], past_key_values.max_cache_len
+            )
+        if compiled_step is not None and not output_attentions and not output_hidden_states:
+            if attention_mask is not None:
+                # a fixed-size padding mask; positions past the current one are hidden by the causal mask
+                attention_mask = F.pad(
+                    attention_mask, (0, past_key_values.max_cache_len - attention_mask.shape[1]), value=1
+                )
+            hidden_states, logits = compiled_step(
+                inputs_embeds, attention_mask, position_ids, past_key_values, cache_position
+            )
+            outputs = BaseModelOutputWithPast(last_hidden_state=hidden_states, past_key_values=past_key_values)
+        else:
+            outputs: BaseModelOutputWithPast = self.model(
+                input_ids=None,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=past_key_values,
+                inputs_embeds=inputs_embeds,
+                use_cache=use_cache,
+                output_attentions=output_attentions,
+                output_hidden_states=output_hidden_states,
+                cache_position=cache_position,
+                **kwargs,
+            )
+            hidden_states = outputs.last_hidden_state
+            logits = self.codec_head(hidden_states)
 
         loss = None
         if labels is not None:
@@ -1799,6 +2076,40 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
 
         return position_ids, mrope_position_deltas
 
+    def prepare_inputs_for_generation(
+        self,
+        input_ids,
+        past_key_values=None,
+        attention_mask=None,
+        inputs_embeds=None,
+        cache_position=None,
+        **kwargs,
+    ):
+        model_inputs = super().prepare_inputs_for_generation(
+            input_ids,
+            past_key_values=past_key_values,
+            attention_mask=attention_mask,
+            inputs_embeds=inputs_embeds,
+            cache_position=cache_position,
+            **kwargs,
+        )
+        # `forward` derives the rope index from the 2D padding mask, so keep it even when a static cache
+        # makes `generate` prepare a 4D mask in advance.
+        model_inputs["attention_mask"] = attention_mask
+        return model_inputs
+
+    def _get_cache(self, cache_implementation: str, batch_size: int, max_cache_len: int, model_kwargs) -> Cache:
+        # Round the static cache length up so that requests with different prompt lengths reuse the same
+        # preallocated cache instead of reallocating it whenever a longer request comes in.
+        multiple = self.static_cache_length_multiple
+        if self.decode_compiler is not None and cache_implementation == "static":
+            # compiled decode steps only run on the compiler's own cache of the bucket
+            bucket_len = self.decode_compiler.cache_length(max_cache_len)
+            if bucket_len is not None and self.decode_compiler.talker_step(self, batch_size, bucket_len) is not None:
+                return self.decode_compiler.talker_cache(self, batch_size, bucket_len)
+        max_cache_len = (max_cache_len + multiple - 1) // multiple * multiple
+        return super()._get_cache(cache_implementation, batch_size, max_cache_len, model_kwargs)
+
     def _update_model_kwargs_for_generation(self, outputs, model_kwargs, is_encoder_decoder=False, num_new_tokens=1):
         model_kwargs = super()._update_model_kwargs_for_generation(
             outputs, model_kwargs, is_encoder_decoder, num_new_tokens
@@ -1810,6 +2121,262 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         return model_kwargs
 
 
+class Qwen3TTSCodecStreamer(BaseStreamer):
+    """
+    Base class for objects that receive the codec frames produced by the talker.
+
+    Unlike `transformers` streamers, which only see the sampled token ids, `put` is called with the full
+    `(batch_size, num_code_groups)` frame once the sub-talker has filled in the residual codebooks, and with
+    the last-layer talker hidden state `(batch_size, 1, hidden_size)` of the step that sampled its first codebook.
+    """
+
+    def put(self, codec_ids: torch.Tensor, talker_hidden: Optional[torch.Tensor] = None):
+        raise NotImplementedError()
+
+    def end(self):
+        raise NotImplementedError()
+
+
+class Qwen3TTSCodecIteratorStreamer(Qwen3TTSCodecStreamer):
+    """
+    Codec streamer that stores frames in a queue so they can be consumed from another thread.
+
+    The talker loop runs in a background thread and calls `put`/`end`, while the caller iterates over the
+    streamer to receive `(batch_size, num_code_groups)` frames as they are sampled. Exceptions raised by the
+    producer are forwarded with `end(error)` and re-raised on the consumer side. `cancel` asks the producer
+    to stop at the next decoding step, see `Qwen3TTSCodecStreamerStoppingCriteria`.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.frame_queue = Queue()
+        self.stop_signal = None
+        self.timeout = timeout
+        self.cancelled = False
+        self.error = None
+
+    def put(self, codec_ids: torch.Tensor, talker_hidden: Optional[torch.Tensor] = None):
+        self.frame_queue.put(codec_ids.detach(), timeout=self.timeout)
+
+    def end(self, error: Optional[BaseException] = None):
+        self.error = error
+        self.frame_queue.put(self.stop_signal, timeout=self.timeout)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> torch.Tensor:
+        value = self.frame_queue.get(timeout=self.timeout)
+        if value is self.stop_signal:
+            if self.error is not None:
+                raise self.error
+            raise StopIteration()
+        return value
+
+
+class Qwen3TTSCodecCollector(Qwen3TTSCodecStreamer):
+    """
+    Codec streamer that keeps the codec frames and the matching talker hidden states of one `generate` call.
+
+    This replaces `output_hidden_states=True`, which keeps the hidden states of every talker layer for every
+    decoding step (and for the whole prompt) alive until generation ends, although only the last-layer state
+    of the last position is needed per frame. `stack` returns `(batch_size, num_frames, num_code_groups)` codes
+    and `(batch_size, num_frames, hidden_size)` hidden states.
+    """
+
+    def __init__(self):
+        self.codec_ids = []
+        self.talker_hiddens = []
+
+    def put(self, codec_ids: torch.Tensor, talker_hidden: Optional[torch.Tensor] = None):
+        self.codec_ids.append(codec_ids.detach())
+        if talker_hidden is not None:
+            # the prefill state is a view of the whole prompt's output, copy the last position only
+            self.talker_hiddens.append(talker_hidden.detach().clone())
+
+    def end(self):
+        pass
+
+    def stack(self) -> tuple[torch.Tensor, Optional[torch.Tensor]]:
+        talker_codes = torch.stack(self.codec_ids, dim=1)
+        talker_hidden_states = torch.cat(self.talker_hiddens, dim=1) if self.talker_hiddens else None
+        return talker_codes, talker_hidden_states
+
+
+class Qwen3TTSCodecStreamerStoppingCriteria(StoppingCriteria):
+    """Stops the talker once the consumer of a `Qwen3TTSCodecIteratorStreamer` has cancelled it."""
+
+    def __init__(self, streamer: Qwen3TTSCodecIteratorStreamer):
+        self.streamer = streamer
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return torch.full((input_ids.shape[0],), self.streamer.cancelled, device=input_ids.device, dtype=torch.bool)
+
+
+@dataclass
+class Qwen3TTSPromptCacheEntry:
+    inputs_embeds: torch.Tensor                          # (1, L, D) talker prompt the states were computed from
+    key_values: list[tuple[torch.Tensor, torch.Tensor]]  # per layer, (1, num_kv_heads, L, head_dim)
+
+
+class Qwen3TTSPromptCache:
+    """
+    LRU cache of talker KV states after prefill, keyed by prompt identity (e.g. a saved voice).
+
+    Only the longest prefix whose input embeddings are identical to the stored prompt is reused, so a stale
+    key can never change the result, it only lowers the hit length. Every `update` crops an entry to the
+    prefix it shares with the new prompt, so after two requests with the same voice an entry holds just the
+    voice-dependent part of the prompt (role, codec prefill, speaker and the leading ICL positions).
+    """
+
+    def __init__(self, max_entries: int = 8):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[object, Qwen3TTSPromptCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def _shared_prefix_length(entry: Qwen3TTSPromptCacheEntry, inputs_embeds: torch.Tensor, max_length: int) -> int:
+        length = min(entry.inputs_embeds.shape[1], max_length)
+        if length <= 0:
+            return 0
+        same = (entry.inputs_embeds[0, :length] == inputs_embeds[0, :length].to(entry.inputs_embeds.device)).all(dim=-1)
+        return length if bool(same.all()) else int((~same).long().argmax())
+
+    def lookup(self, key, inputs_embeds: torch.Tensor) -> tuple[Optional[DynamicCache], int]:
+        """
+        Returns a `DynamicCache` pre-filled with the reusable prefix of `inputs_embeds` (batch size 1) and the
+        prefix length, or `(None, 0)`. At least two prompt positions are always left to prefill.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, 0
+            self._entries.move_to_end(key)
+        prefix_length = self._shared_prefix_length(entry, inputs_embeds, inputs_embeds.shape[1] - 2)
+        if prefix_length == 0:
+            return None, 0
+        past_key_values = DynamicCache(
+            ddp_cache_data=[(k[:, :, :prefix_length], v[:, :, :prefix_length]) for k, v in entry.key_values]
+        )
+        return past_key_values, prefix_length
+
+    def update(self, key, inputs_embeds: torch.Tensor, past_key_values: Cache):
+        """Store the prompt states of a finished prefill, or crop the existing entry to the shared prefix."""
+        prompt_length = inputs_embeds.shape[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                prefix_length = self._shared_prefix_length(entry, inputs_embeds, prompt_length)
+                if prefix_length > 0:
+                    if prefix_length < entry.inputs_embeds.shape[1]:
+                        entry.inputs_embeds = entry.inputs_embeds[:, :prefix_length].clone()
+                        entry.key_values = [
+                            (k[:, :, :prefix_length].clone(), v[:, :, :prefix_length].clone())
+                            for k, v in entry.key_values
+                        ]
+                    self._entries.move_to_end(key)
+                    return
+            if past_key_values is None or past_key_values.get_seq_length() < prompt_length:
+                return
+            self._entries[key] = Qwen3TTSPromptCacheEntry(
+                inputs_embeds=inputs_embeds[:, :prompt_length].clone(),
+                key_values=[
+                    (layer.keys[:, :, :prompt_length].clone(), layer.values[:, :, :prompt_length].clone())
+                    for layer in past_key_values.layers
+                ],
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Qwen3TTSDecodeCompiler:
+    """
+    `torch.compile`d one-token decode steps of the talker and the sub-talker, specialized per shape bucket.
+
+    A bucket is a (batch size, talker static cache length) pair. Generation with a compiler attached always uses
+    static KV caches, and the talker cache length is rounded up to the smallest bucket length that fits, so
+    requests with different prompt lengths run the same graphs. Decode steps outside the buckets and all
+    prefills run eagerly. Graphs are built on the first step of a bucket (or by `Qwen3TTSForConditionalGeneration.
+    warmup_compiled_decode`) and kept for the lifetime of the compiler.
+
+    Static cache tensors have fixed addresses that the graphs are specialized on, so every bucket keeps its own
+    talker cache (and every batch size its own sub-talker cache), reset in place between requests. That is
+    `batch_size * cache_length * num_layers * 2 * num_key_value_heads * head_dim` elements per talker bucket.
+    """
+
+    def __init__(self, batch_sizes=(1,), cache_lengths=(512, 1024, 2048, 4096), **compile_kwargs):
+        self.batch_sizes = tuple(sorted(set(batch_sizes)))
+        self.cache_lengths = tuple(sorted(set(cache_lengths)))
+        self.compile_kwargs = {"dynamic": False, **compile_kwargs}
+        self._talker_step = None
+        self._sub_talker_step = None
+        self._talker_caches = {}        # (batch_size, cache_len) -> StaticCache
+        self._sub_talker_caches = {}    # batch_size -> StaticCache
+        # Dynamo keeps the graphs of every bucket on the same code object; make room for all of them.
+        num_graphs = len(self.batch_sizes) * len(self.cache_lengths)
+        torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, num_graphs + 8)
+
+    def cache_length(self, max_cache_len: int) -> Optional[int]:
+        """Smallest bucket length holding `max_cache_len` positions, or None if it exceeds every bucket."""
+        for length in self.cache_lengths:
+            if length >= max_cache_len:
+                return length
+        return None
+
+    def talker_cache(self, talker, batch_size: int, cache_len: int) -> StaticCache:
+        cache = self._talker_caches.get((batch_size, cache_len))
+        if cache is None:
+            cache = self._talker_caches[(batch_size, cache_len)] = StaticCache(
+                config=talker.config, max_cache_len=cache_len
+            )
+        else:
+            cache.reset()
+        return cache
+
+    def sub_talker_cache(self, code_predictor, batch_size: int) -> StaticCache:
+        cache = self._sub_talker_caches.get(batch_size)
+        if cache is None:
+            cache = self._sub_talker_caches[batch_size] = StaticCache(
+                config=code_predictor.config, max_cache_len=code_predictor.config.num_code_groups
+            )
+        else:
+            cache.reset()
+        return cache
+
+    def talker_step(self, talker, batch_size: int, cache_len: int) -> Optional[Callable]:
+        if batch_size not in self.batch_sizes or cache_len not in self.cache_lengths:
+            return None
+        if self._talker_step is None:
+            self._talker_step = torch.compile(talker.decode_step, **self.compile_kwargs)
+        return self._talker_step
+
+    def sub_talker_step(self, code_predictor, batch_size: int) -> Optional[Callable]:
+        if batch_size not in self.batch_sizes:
+            return None
+        if self._sub_talker_step is None:
+            self._sub_talker_step = torch.compile(code_predictor.decode_step, **self.compile_kwargs)
+        return self._sub_talker_step
+
+
 class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin):
     config_class = Qwen3TTSConfig
 
@@ -1826,6 +2393,9 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
 
         self.speech_tokenizer = None
         self.generate_config = None
+        self.prompt_cache = None
+        self.cpu_quantization = None
+        self.decode_compiler = None
 
         self.supported_speakers = self.config.talker_config.spk_id.keys()
         self.supported_languages = ["auto"]
@@ -1845,6 +2415,129 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
     
     def load_generate_config(self, generate_config):
         self.generate_config = generate_config
+
+    def enable_prompt_cache(self, max_entries: int = 8):
+        """
+        Keep the talker KV states of recent prompts so that `generate(..., prompt_cache_key=...)` only prefills
+        the part of a prompt that differs from the last one with the same key.
+        """
+        self.prompt_cache = Qwen3TTSPromptCache(max_entries=max_entries)
+
+    def disable_prompt_cache(self):
+        self.prompt_cache = None
+
+    def enable_compiled_decode(self, batch_sizes=(1,), cache_lengths=(512, 1024, 2048, 4096), **compile_kwargs):
+        """
+        Run the one-token decode steps of the talker and the sub-talker through `torch.compile`, with one graph per
+        (batch size, talker cache length) bucket; see `Qwen3TTSDecodeCompiler`. From now on `generate` always
+        uses static KV caches (and therefore no prompt cache). Graphs are built lazily; call
+        `warmup_compiled_decode` to build them up front.
+
+        Args:
+            batch_sizes: Batch sizes to compile for; other batch sizes decode eagerly.
+            cache_lengths: Talker cache length buckets. Prompt length + `max_new_tokens` is rounded up to the
+                next bucket; longer requests decode eagerly.
+            **compile_kwargs: Forwarded to `torch.compile` (e.g. `mode="max-autotune-no-cudagraphs"`).
+        """
+        self.decode_compiler = Qwen3TTSDecodeCompiler(batch_sizes, cache_lengths, **compile_kwargs)
+        self.talker.decode_compiler = self.decode_compiler
+        self.talker.code_predictor.decode_compiler = self.decode_compiler
+
+    def disable_compiled_decode(self):
+        self.decode_compiler = None
+        self.talker.decode_compiler = None
+        self.talker.code_predictor.decode_compiler = None
+
+    @torch.no_grad()
+    def warmup_compiled_decode(self, batch_sizes=None, cache_lengths=None):
+        """
+        Build the compiled graphs of the given buckets (default: all buckets of `enable_compiled_decode`) by
+        running one decode step of the talker and the sub-talker on dummy inputs. This also allocates the static
+        caches of these buckets.
+        """
+        compiler = self.decode_compiler
+        if compiler is None:
+            raise ValueError("Call `enable_compiled_decode()` before `warmup_compiled_decode()`.")
+        talker = self.talker
+        code_predictor = talker.code_predictor
+        hidden_size = talker.config.hidden_size
+        device, dtype = self.talker.device, self.talker.dtype
+        for batch_size in batch_sizes or compiler.batch_sizes:
+            # sub-talker: eager two-position prefill, then one compiled step
+            inputs_embeds = torch.zeros(batch_size, 2, hidden_size, device=device, dtype=dtype)
+            code_predictor.generate_codes(inputs_embeds, do_sample=False, cache_implementation="static")
+
+            for cache_len in sorted(cache_lengths or compiler.cache_lengths):
+                compiled_step = compiler.talker_step(talker, batch_size, cache_len)
+                if compiled_step is None:
+                    continue
+                past_key_values = compiler.talker_cache(talker, batch_size, cache_len)
+                inputs_embeds = torch.zeros(batch_size, 1, hidden_size, device=device, dtype=dtype)
+                attention_mask = torch.ones(batch_size, cache_len, device=device, dtype=torch.long)
+                for step in range(2):
+                    # float and expanded over the 3 rope sections, like the ids `forward` derives from the prompt
+                    position_ids = torch.full((batch_size, 1), step, device=device, dtype=torch.float)
+                    position_ids = position_ids.unsqueeze(0).expand(3, -1, -1)
+                    cache_position = torch.full((1,), step, device=device, dtype=torch.long)
+                    # the first update initializes the cache tensors, so it runs eagerly like a real prefill
+                    decode_step = compiled_step if step > 0 else talker.decode_step
+                    decode_step(inputs_embeds, attention_mask, position_ids, past_key_values, cache_position)
+
+    def quantize_for_cpu(self, mode: str = "auto") -> Optional[str]:
+        """
+        Swap the `nn.Linear` layers of the talker, the code predictor and the 12Hz decoder transformer for
+        reduced-precision CPU versions (see `qwen_tts.core.cpu_quantization`). Embeddings, norms, the output heads
+        and the speaker encoder stay in float32, so sampling and speaker embeddings are unaffected.
+
+        The model must be a float32 model on CPU, and cannot be moved to another device afterwards. A speech
+        tokenizer shared with other loaded checkpoints (see `Qwen3TTSTokenizer.from_pretrained_shared`) is
+        withdrawn from the shared cache before its decoder is converted: checkpoints loaded afterwards get their
+        own float32 decoder, while those already holding it use the converted one too.
+
+        Args:
+            mode (str): "int8", "bf16", or "auto" (bf16 on CPUs with AVX512-BF16/AMX, int8 otherwise).
+
+        Returns:
+            Optional[str]: The mode applied.
+        """
+        mode = resolve_cpu_quantization(mode)
+        if mode is None or self.cpu_quantization is not None:
+            return self.cpu_quantization
+        if self.device.type != "cpu" or self.dtype != torch.float32:
+            raise ValueError(f"CPU quantization needs a float32 model on CPU, got {self.dtype} on {self.device}")
+        modules = [self.talker.model, self.talker.code_predictor.model]
+        decoder = getattr(getattr(self.speech_tokenizer, "model", None), "decoder", None)
+        if self.tokenizer_type == "qwen3_tts_tokenizer_12hz" and decoder is not None:
+            if hasattr(self.speech_tokenizer, "unshare"):
+                self.speech_tokenizer.unshare()
+            modules.append(decoder.pre_transformer)
+        for module in modules:
+            quantize_linear_layers(module, mode)
+        self.cpu_quantization = mode
+        return mode
+
+    def _get_prompt_cache_key(
+        self,
+        prompt_cache_key,
+        input_ids: list[torch.Tensor],
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode: bool = False,
+        use_static_cache: bool = False,
+    ):
+        # The prefix cache holds single prompts, and everything placed before the target text is part of the key
+        # so that entries are not cropped down by prompts that could never share them.
+        if prompt_cache_key is None or self.prompt_cache is None or use_static_cache or len(input_ids) != 1:
+            return None
+        instruct_id = instruct_ids[0] if instruct_ids is not None else None
+        return (
+            prompt_cache_key,
+            languages[0].lower() if languages is not None else None,
+            speakers[0].lower() if speakers is not None and speakers[0] else None,
+            tuple(instruct_id.reshape(-1).tolist()) if instruct_id is not None else None,
+            bool(non_streaming_mode),
+        )
     
     def get_supported_speakers(self):
         return self.supported_speakers
@@ -1912,7 +2605,8 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         if speech_tokenizer_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{speech_tokenizer_path} not exists""")
         speech_tokenizer_dir = os.path.dirname(speech_tokenizer_path)
-        speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
+        # Checkpoints shipping the same tokenizer (e.g. Base and VoiceDesign) share one instance per dtype/device.
+        speech_tokenizer = Qwen3TTSTokenizer.from_pretrained_shared(
             speech_tokenizer_dir,
             *model_args,
             **kwargs,
@@ -1952,6 +2646,35 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         ).transpose(1, 2)
         speaker_embedding = self.speaker_encoder(mels.to(self.device).to(self.dtype))[0]
         return speaker_embedding
+
+    @torch.inference_mode()
+    def extract_speaker_embeddings(self, audios: list, sr: int, batch_size: int = 32) -> list[torch.Tensor]:
+        """
+        Batched `extract_speaker_embedding`: clips are sorted by length and run through one mel STFT and one speaker
+        encoder forward per `batch_size` clips, with length masks. Returns the embeddings in input order.
+        """
+        assert sr == 24000, "Only support 24kHz audio"
+        order = sorted(range(len(audios)), key=lambda i: len(audios[i]), reverse=True)
+        speaker_embeddings = [None] * len(audios)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            lengths = torch.tensor([len(audios[i]) for i in indices])
+            wavs = nn.utils.rnn.pad_sequence([torch.from_numpy(audios[i]) for i in indices], batch_first=True)
+            mels, frame_lengths = mel_spectrogram_batch(
+                wavs.to(self.device),
+                lengths,
+                n_fft=1024,
+                num_mels=128,
+                sampling_rate=24000,
+                hop_size=256,
+                win_size=1024,
+                fmin=0,
+                fmax=12000
+            )
+            embeddings = self.speaker_encoder(mels.transpose(1, 2).to(self.dtype), lengths=frame_lengths)
+            for i, embedding in zip(indices, embeddings):
+                speaker_embeddings[i] = embedding
+        return speaker_embeddings
     
     @torch.inference_mode()
     def generate_speaker_prompt(
@@ -2018,16 +2741,8 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 text_embed = torch.cat([text_embed] + [tts_pad_embed] * (codec_lens - text_lens), dim=1)
                 return text_embed + codec_embed, tts_pad_embed
 
-    @torch.no_grad()
-    def generate(
+    def _build_talker_kwargs(
         self,
-        input_ids: Optional[list[torch.Tensor]] = None,
-        instruct_ids: Optional[list[torch.Tensor]] = None,
-        ref_ids: Optional[list[torch.Tensor]] = None,
-        voice_clone_prompt: list[dict] = None,
-        languages: list[str] = None,
-        speakers: list[str] = None,
-        non_streaming_mode = False,
         max_new_tokens: int = 4096,
         do_sample: bool = True,
         top_k: int = 50,
@@ -2039,8 +2754,9 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         subtalker_temperature: float = 0.9,
         eos_token_id: Optional[int] = None,
         repetition_penalty: float = 1.05,
+        use_static_cache: bool = False,
         **kwargs,
-    ):
+    ) -> dict:
         talker_kwargs = {
             "max_new_tokens": max_new_tokens,
             "min_new_tokens": 2,
@@ -2061,10 +2777,26 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
                 if i not in (self.config.talker_config.codec_eos_token_id,)
             ],
-            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
-            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
+            # codec frames and hidden states are collected through `codec_streamer` instead
+            "output_hidden_states": False,
+            "return_dict_in_generate": False,
         }
-        
+        if use_static_cache:
+            # Preallocated KV caches that are written in place and kept on the modules between calls.
+            talker_kwargs["cache_implementation"] = "static"
+            talker_kwargs["subtalker_cache_implementation"] = "static"
+        return talker_kwargs
+
+    def _build_talker_inputs(
+        self,
+        input_ids: list[torch.Tensor],
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode: bool = False,
+    ):
         talker_input_embeds = [[] for _ in range(len(input_ids))]
 
         voice_clone_spk_embeds = None
@@ -2268,17 +3000,200 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         padded_hiddens[padding_mask] = pad_embedding_vector
         trailing_text_hiddens = padded_hiddens
 
+        return talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed
+
+    @torch.no_grad()
+    def generate_stream(
+        self,
+        input_ids: Optional[list[torch.Tensor]] = None,
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        use_static_cache: bool = False,
+        prompt_cache_key=None,
+        **kwargs,
+    ) -> Iterator[torch.Tensor]:
+        """
+        Same inputs as `generate`, but yields codec frames while the talker is still decoding.
+
+        The talker loop runs in a background thread and every completed frame of shape
+        `(batch_size, num_code_groups)` is yielded as soon as the sub-talker has predicted it. Rows that
+        have already emitted `codec_eos_token_id` keep producing EOS-padded frames until the whole batch is
+        done, so callers should stop consuming a row at its first EOS frame. Closing the generator stops
+        the talker at its next decoding step.
+        """
+        # compiled decode steps need the fixed shapes of static caches
+        use_static_cache = use_static_cache or self.decode_compiler is not None
+        talker_kwargs = self._build_talker_kwargs(
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            top_k=top_k,
+            top_p=top_p,
+            temperature=temperature,
+            subtalker_dosample=subtalker_dosample,
+            subtalker_top_k=subtalker_top_k,
+            subtalker_top_p=subtalker_top_p,
+            subtalker_temperature=subtalker_temperature,
+            eos_token_id=eos_token_id,
+            repetition_penalty=repetition_penalty,
+            use_static_cache=use_static_cache,
+            **kwargs,
+        )
+        talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed = self._build_talker_inputs(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+        )
+
+        cache_key = self._get_prompt_cache_key(
+            prompt_cache_key, input_ids, instruct_ids, languages, speakers, non_streaming_mode, use_static_cache
+        )
+        past_key_values = None
+        if cache_key is not None:
+            past_key_values, _ = self.prompt_cache.lookup(cache_key, talker_input_embeds)
+            if past_key_values is None:
+                past_key_values = DynamicCache()
+
+        codec_streamer = Qwen3TTSCodecIteratorStreamer()
+        talker_kwargs["stopping_criteria"] = StoppingCriteriaList(
+            [Qwen3TTSCodecStreamerStoppingCriteria(codec_streamer)]
+        )
+
+        def _run_talker():
+            error = None
+            try:
+                self.talker.generate(
+                    inputs_embeds=talker_input_embeds,
+                    attention_mask=talker_attention_mask,
+                    trailing_text_hidden=trailing_text_hiddens,
+                    tts_pad_embed=tts_pad_embed,
+                    codec_streamer=codec_streamer,
+                    past_key_values=past_key_values,
+                    **talker_kwargs,
+                )
+                if cache_key is not None:
+                    self.prompt_cache.update(cache_key, talker_input_embeds, past_key_values)
+            except BaseException as e:
+                error = e
+            finally:
+                codec_streamer.end(error)
+
+        thread = threading.Thread(target=_run_talker, daemon=True)
+        thread.start()
+        try:
+            for codec_ids in codec_streamer:
+                yield codec_ids
+        finally:
+            codec_streamer.cancel()
+            thread.join()
+
+    @torch.no_grad()
+    def generate(
+        self,
+        input_ids: Optional[list[torch.Tensor]] = None,
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        use_static_cache: bool = False,
+        prompt_cache_key=None,
+        **kwargs,
+    ):
+        """
+        Generate codec frames for a batch of prompts.
+
+        Set `use_static_cache=True` to run the talker and the sub-talker with preallocated static KV caches
+        (sized from the prompt length plus `max_new_tokens`) that are updated in place and reused across
+        calls. The caches are stored on the modules, so a model instance should not run several `generate`
+        calls concurrently in this mode.
+
+        `prompt_cache_key` identifies the voice of a single prompt (e.g. a hash of its saved prompt file). After
+        `enable_prompt_cache()`, the talker KV states of the part of the prompt shared with the previous
+        request with the same key are reused and only the rest of the prompt is prefilled. It is ignored for
+        batches and with `use_static_cache`.
+        """
+        # compiled decode steps need the fixed shapes of static caches
+        use_static_cache = use_static_cache or self.decode_compiler is not None
+        talker_kwargs = self._build_talker_kwargs(
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            top_k=top_k,
+            top_p=top_p,
+            temperature=temperature,
+            subtalker_dosample=subtalker_dosample,
+            subtalker_top_k=subtalker_top_k,
+            subtalker_top_p=subtalker_top_p,
+            subtalker_temperature=subtalker_temperature,
+            eos_token_id=eos_token_id,
+            repetition_penalty=repetition_penalty,
+            use_static_cache=use_static_cache,
+            **kwargs,
+        )
+        talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed = self._build_talker_inputs(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+        )
+
+        cache_key = self._get_prompt_cache_key(
+            prompt_cache_key, input_ids, instruct_ids, languages, speakers, non_streaming_mode, use_static_cache
+        )
+        past_key_values = None
+        if cache_key is not None:
+            past_key_values, _ = self.prompt_cache.lookup(cache_key, talker_input_embeds)
+            if past_key_values is None:
+                past_key_values = DynamicCache()
+
         # forward
-        talker_result = self.talker.generate(
+        codec_collector = Qwen3TTSCodecCollector()
+        self.talker.generate(
             inputs_embeds=talker_input_embeds,
             attention_mask=talker_attention_mask,
             trailing_text_hidden=trailing_text_hiddens,
             tts_pad_embed=tts_pad_embed,
+            past_key_values=past_key_values,
+            codec_streamer=codec_collector,
             **talker_kwargs,
         )
+        if cache_key is not None:
+            self.prompt_cache.update(cache_key, talker_input_embeds, past_key_values)
 
-        talker_codes = torch.stack([hid[-1] for hid in talker_result.hidden_states if hid[-1] is not None], dim=1)
-        talker_hidden_states = torch.cat([hid[0][-1][:, -1:] for hid in talker_result.hidden_states], dim=1)[:, :-1]
+        talker_codes, talker_hidden_states = codec_collector.stack()
         
         first_codebook = talker_codes[:, :, 0]
         is_stop_token = (first_codebook ==  self.config.talker_config.codec_eos_token_id)
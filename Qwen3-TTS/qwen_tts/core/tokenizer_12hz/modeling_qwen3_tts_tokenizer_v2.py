@@ -191,6 +191,20 @@ class Qwen3TTSTokenizerV2CausalConvNet(nn.Module):
         hidden_state = F.pad(hidden_state, (self.padding, extra_padding), mode="constant", value=0)
         return self.conv(hidden_state).contiguous()
 
+    def streaming_forward(self, hidden_state, conv_cache: dict):
+        """
+        Causal convolution over a new block of samples, using the last `padding` input samples kept in
+        `conv_cache` instead of zero padding. Only stride 1 is supported, which is all the decoder uses.
+        """
+        if self.stride != 1:
+            raise ValueError(f"Streaming is only supported for stride 1 convolutions, got stride={self.stride}")
+        context = conv_cache.get(self)
+        if context is None:
+            context = hidden_state.new_zeros(*hidden_state.shape[:-1], self.padding)
+        hidden_state = torch.cat([context, hidden_state], dim=-1)
+        conv_cache[self] = hidden_state[..., hidden_state.shape[-1] - self.padding :]
+        return self.conv(hidden_state).contiguous()
+
 
 class Qwen3TTSTokenizerV2CausalTransConvNet(nn.Module):
     def __init__(self, in_channels, out_channels, kernel_size, stride=1):
@@ -206,6 +220,28 @@ class Qwen3TTSTokenizerV2CausalTransConvNet(nn.Module):
         hidden_state = hidden_state[..., self.left_pad : hidden_state.shape[-1] - self.right_pad]
         return hidden_state.contiguous()
 
+    def streaming_forward(self, hidden_state, conv_cache: dict):
+        """
+        Transposed convolution over a new block of frames. The overlapping `kernel_size - stride` output
+        samples are kept in `conv_cache` and added to the next block, so only samples that no future input
+        can change are returned. The leading `left_pad` samples are dropped once, like in `forward`.
+        """
+        stride = self.conv.stride[0]
+        tail, skip = conv_cache.get(self, (None, self.left_pad))
+
+        hidden_state = F.conv_transpose1d(hidden_state, self.conv.weight, stride=stride)
+        if tail is not None:
+            hidden_state[..., : tail.shape[-1]] += tail
+        num_ready = hidden_state.shape[-1] - (self.conv.kernel_size[0] - stride)
+        tail = hidden_state[..., num_ready:]
+
+        hidden_state = hidden_state[..., :num_ready]
+        if self.conv.bias is not None:
+            hidden_state = hidden_state + self.conv.bias[:, None]
+        num_skip = min(skip, hidden_state.shape[-1])
+        conv_cache[self] = (tail, skip - num_skip)
+        return hidden_state[..., num_skip:].contiguous()
+
 
 class Qwen3TTSTokenizerV2ConvNeXtBlock(nn.Module):
     def __init__(self, dim: int):
@@ -241,6 +277,22 @@ class Qwen3TTSTokenizerV2ConvNeXtBlock(nn.Module):
 
         return hidden_states
 
+    def streaming_forward(self, hidden_states, conv_cache: dict):
+        input = hidden_states
+
+        hidden_states = self.dwconv.streaming_forward(hidden_states, conv_cache)
+        hidden_states = hidden_states.permute(0, 2, 1)
+        hidden_states = self.norm(hidden_states)
+        hidden_states = self.pwconv1(hidden_states)
+        hidden_states = self.act(hidden_states)
+        hidden_states = self.pwconv2(hidden_states)
+
+        hidden_states = self.gamma * hidden_states
+
+        hidden_states = hidden_states.permute(0, 2, 1)
+
+        return input + hidden_states
+
 
 class Qwen3TTSTokenizerV2DecoderRotatoryEmbedding(nn.Module):
     inv_freq: torch.Tensor  # fix linting for `register_buffer`
@@ -633,6 +685,15 @@ class Qwen3TTSTokenizerV2DecoderDecoderResidualUnit(nn.Module):
         hidden_state = self.conv2(hidden_state)
         return hidden_state + residual
 
+    def streaming_forward(self, hidden_state, conv_cache: dict):
+        residual = hidden_state
+
+        hidden_state = self.act1(hidden_state)
+        hidden_state = self.conv1.streaming_forward(hidden_state, conv_cache)
+        hidden_state = self.act2(hidden_state)
+        hidden_state = self.conv2.streaming_forward(hidden_state, conv_cache)
+        return hidden_state + residual
+
 
 class Qwen3TTSTokenizerV2DecoderDecoderBlock(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
     def __init__(self, config: Qwen3TTSTokenizerV2DecoderConfig, layer_idx):
@@ -656,6 +717,14 @@ class Qwen3TTSTokenizerV2DecoderDecoderBlock(Qwen3TTSTokenizerV2DecoderPreTraine
             hidden = block(hidden)
         return hidden
 
+    def streaming_forward(self, hidden, conv_cache: dict):
+        for block in self.block:
+            if isinstance(block, SnakeBeta):
+                hidden = block(hidden)
+            else:
+                hidden = block.streaming_forward(hidden, conv_cache)
+        return hidden
+
 
 class EuclideanCodebook(nn.Module):
     def __init__(
@@ -882,19 +951,91 @@ class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
             wav = block(wav)
         return wav.clamp(min=-1, max=1)
 
+    def streaming_decode(self, codes, session: "Qwen3TTSTokenizerV2DecoderStreamingSession"):
+        """
+        Decode only the new `codes` of shape `(batch_size, num_quantizers, n_frames)`, continuing from the
+        conv tails, transformer KV cache and upsampler state held by `session`.
+
+        Concatenating the outputs of successive calls gives the same waveform as `forward` on all frames.
+        The last few samples of each frame depend on the next frame, so they are returned by the next call.
+        """
+        if codes.shape[1] != self.config.num_quantizers:
+            raise ValueError(f"Expected {self.config.num_quantizers} layer of codes, got {codes.shape[1]}")
+
+        if codes.shape[-1] == 0:
+            return torch.zeros(codes.shape[0], 1, 0, dtype=self.dtype, device=codes.device)
+
+        conv_cache = session.conv_cache
+        hidden = self.quantizer.decode(codes)
+        hidden = self.pre_conv.streaming_forward(hidden, conv_cache).transpose(1, 2)
+
+        hidden = self.pre_transformer(
+            inputs_embeds=hidden,
+            past_key_values=session.past_key_values,
+            use_cache=True,
+        ).last_hidden_state
+        hidden = hidden.permute(0, 2, 1)
+        for blocks in self.upsample:
+            for block in blocks:
+                hidden = block.streaming_forward(hidden, conv_cache)
+        wav = hidden
+        for block in self.decoder:
+            if isinstance(block, SnakeBeta):
+                wav = block(wav)
+            else:
+                wav = block.streaming_forward(wav, conv_cache)
+        session.num_frames += codes.shape[-1]
+        return wav.clamp(min=-1, max=1)
+
+    def streaming_session(self) -> "Qwen3TTSTokenizerV2DecoderStreamingSession":
+        """Start a new incremental decoding session, see `Qwen3TTSTokenizerV2DecoderStreamingSession`."""
+        return Qwen3TTSTokenizerV2DecoderStreamingSession(self)
+
     def chunked_decode(self, codes, chunk_size=300, left_context_size=25):
+        # Chunks are decoded with a streaming session, so no left context has to be recomputed and the
+        # result is identical to a single forward pass. `left_context_size` is kept for compatibility.
+        session = self.streaming_session()
         wavs = []
-        start_index = 0
-        while start_index < codes.shape[-1]:
-            end_index = min(start_index + chunk_size, codes.shape[-1])
-            context_size = left_context_size if start_index - left_context_size > 0 else start_index
-            codes_chunk = codes[..., start_index - context_size : end_index]
-            wav_chunk = self(codes_chunk)
-            wavs.append(wav_chunk[..., context_size * self.total_upsample :])
-            start_index = end_index
+        for start_index in range(0, codes.shape[-1], chunk_size):
+            wavs.append(session.decode(codes[..., start_index : start_index + chunk_size]))
         return torch.cat(wavs, dim=-1)
 
 
+class Qwen3TTSTokenizerV2DecoderStreamingSession:
+    """
+    Incremental decoding state for `Qwen3TTSTokenizerV2Decoder`.
+
+    Holds the causal conv tails, the transposed conv overlaps and the sliding-window KV cache of the
+    pre-transformer, so that each call to `decode` only runs the decoder on the new frames. State is
+    bounded by the receptive field, so a session can be kept for arbitrarily long streams.
+
+    Example:
+        session = decoder.streaming_session()
+        for codes in frames:                 # (batch_size, num_quantizers, n_frames)
+            wav_chunk = session.decode(codes)
+    """
+
+    def __init__(self, decoder: Qwen3TTSTokenizerV2Decoder):
+        self.decoder = decoder
+        self.reset()
+
+    def reset(self):
+        self.conv_cache = {}
+        self.past_key_values = DynamicCache(config=self.decoder.config)
+        self.num_frames = 0
+
+    def decode(self, codes: torch.Tensor) -> torch.Tensor:
+        """
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, n_frames)`):
+                New codec frames that follow the frames already decoded in this session.
+
+        Returns:
+            `torch.FloatTensor` of shape `(batch_size, 1, n_samples)` with the newly available samples.
+        """
+        return self.decoder.streaming_decode(codes, self)
+
+
 class Qwen3TTSTokenizerV2Encoder(MimiModel):
     def __init__(self, config: MimiConfig):
         super().__init__(config)
@@ -992,6 +1133,7 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
     def decode(
         self,
         audio_codes: torch.Tensor,
+        audio_lengths: Optional[torch.Tensor] = None,
         return_dict: Optional[bool] = None,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV2DecoderOutput]:
         """
@@ -1003,6 +1145,9 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         Args:
             audio_codes (`torch.LongTensor`  of shape `(batch_size, codes_length, num_quantizers)`, *optional*):
                 Discret code embeddings computed using `model.encode`.
+            audio_lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*):
+                Number of valid frames of each sample in `audio_codes`. Without it, the non-zero frames of the
+                first codebook are counted, which undercounts samples that contain code 0.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
 
@@ -1011,7 +1156,9 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
 
         audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2)).squeeze(1)
 
-        audio_lengths = (audio_codes[..., 0] > 0).sum(1) * self.decode_upsample_rate
+        if audio_lengths is None:
+            audio_lengths = (audio_codes[..., 0] > 0).sum(1)
+        audio_lengths = audio_lengths * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
 
         if not return_dict:
@@ -1122,7 +1122,7 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         drop_code=False,
         apply_cfg=True,
     ):
-        batch_size = hidden_states.shape[0] * 2
+        batch_size = hidden_states.shape[0] * 2 if apply_cfg else hidden_states.shape[0]
         if time_step.ndim == 0:
             time_step = time_step.repeat(batch_size)
 
@@ -1177,14 +1177,51 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         num_steps=10,
         guidance_scale=0.5,
         sway_coefficient=-1.0,
+        solver="euler",
+        guidance_stop_time=1.0,
+        rtol=1e-2,
+        atol=1e-3,
+        generator=None,
     ):
-        noise_initialization = torch.randn([quantized_code.shape[0], 30000, self.mel_dim], dtype=reference_mel_spectrogram.dtype)
+        """
+        Integrates the flow-matching ODE from Gaussian noise at `t=0` to a mel spectrogram at `t=1`.
+
+        Args:
+            num_steps (`int`):
+                Number of points of the time grid, i.e. `num_steps - 1` solver steps. For `"adaptive"` it only
+                sets the size of the first step.
+            guidance_scale (`float`):
+                Classifier-free guidance strength. Every guided evaluation runs the DiT on a doubled batch.
+            sway_coefficient (`float`, *optional*):
+                Sway sampling of the time grid, which puts more steps near `t=0`. Not used by `"adaptive"`.
+            solver (`str`):
+                `"euler"` (1 DiT evaluation per step), `"midpoint"` (2), `"rk4"` (4), or `"adaptive"`, an
+                embedded Bogacki-Shampine 3(2) solver whose step size follows `rtol` / `atol`.
+            guidance_stop_time (`float`):
+                Guidance is dropped for evaluations at `t >= guidance_stop_time`, where the trajectory is mostly
+                settled, which halves their batch. `1.0` keeps guidance on for the whole trajectory.
+            rtol (`float`):
+                Relative error tolerance per `"adaptive"` step. Ignored by the fixed-grid solvers.
+            atol (`float`):
+                Absolute error tolerance per `"adaptive"` step. Ignored by the fixed-grid solvers. Tight tolerances
+                need more steps; once the solver's step budget is spent it finishes in one final step and warns.
+            generator (`torch.Generator`, *optional*):
+                Generator for the initial noise, on the device of `quantized_code`.
+        """
+        if solver not in ("euler", "midpoint", "rk4", "adaptive"):
+            raise ValueError(f"Unknown solver: {solver}. Expected one of euler, midpoint, rk4, adaptive")
         maximum_duration = quantized_code.shape[1] * self.repeats
-        initial_state = noise_initialization[:, :maximum_duration].to(quantized_code.device)
+        initial_state = torch.randn(
+            [quantized_code.shape[0], maximum_duration, self.mel_dim],
+            dtype=reference_mel_spectrogram.dtype,
+            device=quantized_code.device,
+            generator=generator,
+        )
         conditioning_vector = conditioning_vector.unsqueeze(1).repeat(1, maximum_duration, 1)
 
-        def ode_function(time_step, hidden_states):
-            if guidance_scale < 1e-5:
+        def ode_function(time_step, hidden_states, time_value):
+            # `time_value` is `time_step` as a python float, so the guidance schedule needs no device sync
+            if guidance_scale < 1e-5 or time_value >= guidance_stop_time:
                 prediction = self(
                     hidden_states=hidden_states,
                     speaker_embedding=conditioning_vector,
@@ -1193,6 +1230,7 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
                     time_step=time_step,
                     drop_audio_conditioning=False,
                     drop_code=False,
+                    apply_cfg=False,
                 )
                 return prediction
 
@@ -1208,23 +1246,77 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
 
             return guided_prediction + (guided_prediction - null_prediction) * guidance_scale
 
-        initial_time = 0
-        time_embedding = torch.linspace(
-            initial_time, 1, num_steps, device=quantized_code.device, dtype=conditioning_vector.dtype
-        )
-
-        if sway_coefficient is not None:
-            time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
+        if solver == "adaptive":
+            values = self._solve_adaptive(
+                ode_function, initial_state, 1.0 / max(num_steps - 1, 1), rtol, atol, conditioning_vector.dtype
+            )
+        else:
+            initial_time = 0
+            time_embedding = torch.linspace(
+                initial_time, 1, num_steps, device=quantized_code.device, dtype=conditioning_vector.dtype
+            )
 
-        values = initial_state.clone()
-        for t0, t1 in zip(time_embedding[:-1], time_embedding[1:]):
-            dt = t1 - t0
-            vt = ode_function(t0, values)
-            values = values + vt * dt
+            if sway_coefficient is not None:
+                time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
+
+            time_values = time_embedding.tolist()
+            values = initial_state.clone()
+            for i, (t0, t1) in enumerate(zip(time_embedding[:-1], time_embedding[1:])):
+                dt = t1 - t0
+                t_mid = (time_values[i] + time_values[i + 1]) / 2
+                if solver == "euler":
+                    vt = ode_function(t0, values, time_values[i])
+                elif solver == "midpoint":
+                    k1 = ode_function(t0, values, time_values[i])
+                    vt = ode_function(t0 + dt / 2, values + k1 * (dt / 2), t_mid)
+                else:
+                    k1 = ode_function(t0, values, time_values[i])
+                    k2 = ode_function(t0 + dt / 2, values + k1 * (dt / 2), t_mid)
+                    k3 = ode_function(t0 + dt / 2, values + k2 * (dt / 2), t_mid)
+                    k4 = ode_function(t1, values + k3 * dt, time_values[i + 1])
+                    vt = (k1 + 2 * k2 + 2 * k3 + k4) / 6
+                values = values + vt * dt
 
         generated_mel_spectrogram = values.permute(0, 2, 1)
         return generated_mel_spectrogram
 
+    @staticmethod
+    def _solve_adaptive(ode_function, values, first_step, rtol, atol, dtype, max_num_steps=100):
+        # Bogacki-Shampine 3(2) with first-same-as-last, error measured as the RMS over all mel bins.
+        def evaluate(time_value, hidden_states):
+            time_step = torch.tensor(time_value, device=hidden_states.device, dtype=dtype)
+            return ode_function(time_step, hidden_states, time_value)
+
+        def step(time_value, values, slope, step_size):
+            k2 = evaluate(time_value + step_size / 2, values + slope * (step_size / 2))
+            k3 = evaluate(time_value + step_size * 3 / 4, values + k2 * (step_size * 3 / 4))
+            next_values = values + (slope * 2 / 9 + k2 / 3 + k3 * 4 / 9) * step_size
+            k4 = evaluate(time_value + step_size, next_values)
+            error = (slope * -5 / 72 + k2 / 12 + k3 / 9 - k4 / 8) * step_size
+            return next_values, k4, error
+
+        time_value, step_size = 0.0, first_step
+        slope = evaluate(time_value, values)
+        for num_steps in range(max_num_steps):
+            if time_value >= 1.0:
+                break
+            step_size = min(step_size, 1.0 - time_value)
+            next_values, k4, error = step(time_value, values, slope, step_size)
+            tolerance = atol + rtol * torch.maximum(values.abs(), next_values.abs())
+            error_norm = (error / tolerance).pow(2).mean().sqrt().item()
+            if error_norm <= 1.0 or num_steps == max_num_steps - 1:
+                time_value += step_size
+                values, slope = next_values, k4
+            step_size *= min(5.0, max(0.2, 0.9 * max(error_norm, 1e-10) ** (-1 / 3)))
+        if time_value < 1.0:
+            # out of steps: finish the trajectory in one step rather than return a partly integrated mel
+            logger.warning(
+                f"Adaptive solver reached max_num_steps={max_num_steps} at t={time_value:.3f} "
+                f"(rtol={rtol}, atol={atol}); taking a final step to t=1. Loosen rtol/atol to stay within the step budget."
+            )
+            values, _, _ = step(time_value, values, slope, 1.0 - time_value)
+        return values
+
 
 @auto_docstring
 class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
@@ -1263,7 +1355,11 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
         sway_coefficient=-1.0,
         **kwargs,
     ):
-        """Generates a waveform from input code and conditioning parameters."""
+        """Generates a waveform from input code and conditioning parameters.
+
+        Extra keyword arguments (`solver`, `guidance_stop_time`, ...) are passed to
+        `Qwen3TTSTokenizerV1DecoderDiTModel.sample`.
+        """
 
         mel_spectrogram = self.dit.sample(
             conditioning,
@@ -1272,6 +1368,7 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
             num_steps=num_steps,
             guidance_scale=guidance_scale,
             sway_coefficient=sway_coefficient,
+            **kwargs,
         )
 
         waveform = self.bigvgan(mel_spectrogram)
@@ -1375,8 +1472,12 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
 
         self.post_init()
     
-    def load_encoder_xvector_extractor(self, model_path):
-        self.encoder_xvector_extractor = XVectorExtractor(model_path)
+    def load_encoder_xvector_extractor(self, model_path, **kwargs):
+        """
+        Load the CAM++ x-vector extractor. `kwargs` (`intra_op_num_threads`, `inter_op_num_threads`,
+        `num_workers`, `providers`) are passed to `XVectorExtractor`.
+        """
+        self.encoder_xvector_extractor = XVectorExtractor(model_path, **kwargs)
     
     def get_model_type(self):
         return self.config.model_type
@@ -1407,6 +1508,7 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         revision="main",
         use_safetensors=None,
         weights_only=True,
+        xvector_extractor_kwargs=None,
         **kwargs,
     ):
         model = super().from_pretrained(
@@ -1437,7 +1539,7 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         )
         if encoder_xvector_extractor_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{encoder_xvector_extractor_path} not exists""")
-        model.load_encoder_xvector_extractor(encoder_xvector_extractor_path)
+        model.load_encoder_xvector_extractor(encoder_xvector_extractor_path, **(xvector_extractor_kwargs or {}))
 
         return model
 
@@ -1468,8 +1570,8 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
 
         xvectors = []
         ref_mels = []
-        for wav in wavs:
-            xvector, ref_mel = self.encoder_xvector_extractor.extract_code(wav.cpu().numpy())
+        xvector_list, ref_mel_list = self.encoder_xvector_extractor.extract_codes([wav.cpu().numpy() for wav in wavs])
+        for wav, xvector, ref_mel in zip(wavs, xvector_list, ref_mel_list):
             xvector = torch.tensor(xvector).to(wav.dtype).to(wav.device)
             ref_mel = torch.tensor(ref_mel).to(wav.dtype).to(wav.device)
             xvectors.append(xvector)
@@ -1489,7 +1591,9 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         audio_codes: torch.Tensor,
         xvectors: torch.Tensor,
         ref_mels: torch.Tensor,
+        audio_lengths: Optional[torch.Tensor] = None,
         return_dict: Optional[bool] = None,
+        **kwargs,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV1DecoderOutput]:
         """
         Decodes the given frames into an output audio waveform.
@@ -1504,17 +1608,26 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
                 X-vector embeddings computed using `model.encode`.
             ref_mels (`torch.FloatTensor` of shape `(batch_size, mel_length, mel_dim)`, *optional*):
                 Reference mel spectrogram computed using `model.encode`.
+            audio_lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*):
+                Number of valid frames of each sample in `audio_codes`. Without it, the non-zero codes are counted,
+                which undercounts samples that contain code 0.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            kwargs:
+                Options of the DiT flow-matching sampler (`num_steps`, `guidance_scale`, `solver`,
+                `guidance_stop_time`, ...), see `Qwen3TTSTokenizerV1DecoderDiTModel.sample`.
 
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
         audio_values = self.decoder(code=audio_codes,
                                     reference_mel=ref_mels,
-                                    conditioning=xvectors)
+                                    conditioning=xvectors,
+                                    **kwargs)
         
-        audio_lengths = (audio_codes > 0).sum(1) * self.decode_upsample_rate
+        if audio_lengths is None:
+            audio_lengths = (audio_codes > 0).sum(1)
+        audio_lengths = audio_lengths * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
 
         if not return_dict:
@@ -101,6 +101,40 @@ def kmeans(samples, num_clusters: int, num_iters: int = 10):
     return means, bins
 
 
+# Upper bound on the size of the frames x codebook distance matrix built at once by `nearest_code_indices`.
+MAX_DISTANCE_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def nearest_code_indices(x, embed, embed_sq_norm=None, max_chunk_bytes: int = MAX_DISTANCE_CHUNK_BYTES):
+    """Index of the nearest (Euclidean) row of `embed` for every row of `x`.
+
+    `argmin ||x - e||^2 = argmin (||e||^2 - 2 x.e)`, since `||x||^2` is the same for every code. Each chunk of
+    frames is scored with one `addmm` against the precomputed code norms, and chunks are sized so that the
+    distance matrix stays under `max_chunk_bytes` however long the input is.
+    Args:
+        x (torch.Tensor): Frames, shape (N, D).
+        embed (torch.Tensor): Codebook, shape (K, D).
+        embed_sq_norm (torch.Tensor, optional): Precomputed `embed.pow(2).sum(-1)`, shape (K,).
+        max_chunk_bytes (int): Memory budget of one distance chunk.
+    """
+    if embed_sq_norm is None:
+        embed_sq_norm = embed.pow(2).sum(-1)
+    embed_t = embed.t()
+    chunk_size = max(1, max_chunk_bytes // (embed.shape[0] * x.element_size()))
+    if x.shape[0] <= chunk_size:
+        return torch.addmm(embed_sq_norm, x, embed_t, alpha=-2).argmin(dim=-1)
+
+    embed_ind = torch.empty(x.shape[0], dtype=torch.long, device=x.device)
+    dist = None
+    for start in range(0, x.shape[0], chunk_size):
+        x_chunk = x[start:start + chunk_size]
+        if dist is None or dist.shape[0] != x_chunk.shape[0]:
+            dist = x.new_empty(x_chunk.shape[0], embed.shape[0])
+        torch.addmm(embed_sq_norm, x_chunk, embed_t, alpha=-2, out=dist)
+        torch.argmin(dist, dim=-1, out=embed_ind[start:start + x_chunk.shape[0]])
+    return embed_ind
+
+
 def preprocess(x):
     x = rearrange(x, "... d -> (...) d")
     return x
@@ -183,28 +217,21 @@ class EuclideanCodebook(nn.Module):
         # sync buffers outside for efficiency
         # distrib.broadcast_tensors(self.buffers())
 
-    def quantize(self, x):
-        embed = self.embed.t()
-        dist = -(
-            x.pow(2).sum(1, keepdim=True)
-            - 2 * x @ embed
-            + embed.pow(2).sum(0, keepdim=True)
-        )
-        embed_ind = dist.max(dim=-1).indices
-        return embed_ind
+    def quantize(self, x, embed_sq_norm=None):
+        return nearest_code_indices(x, self.embed, embed_sq_norm)
 
     def dequantize(self, embed_ind):
         quantize = F.embedding(embed_ind, self.embed)
         return quantize
 
-    def encode(self, x, buffers):
+    def encode(self, x, buffers, embed_sq_norm=None):
         self.inited, self.cluster_size, self.embed, self.embed_avg = buffers
 
         shape = x.shape
         # pre-process
         x = preprocess(x)
         # quantize
-        embed_ind = self.quantize(x)
+        embed_ind = self.quantize(x, embed_sq_norm)
         # post-process
         embed_ind = postprocess_emb(embed_ind, shape)
         return embed_ind
@@ -297,10 +324,10 @@ class VectorQuantization(nn.Module):
     def codebook(self):
         return self._codebook.embed
 
-    def encode(self, x, buffers):
+    def encode(self, x, buffers, embed_sq_norm=None):
         # x = rearrange(x, "b d n -> b n d")
         x = self.project_in(x)
-        embed_in = self._codebook.encode(x, buffers)
+        embed_in = self._codebook.encode(x, buffers, embed_sq_norm)
         return embed_in
 
     def decode(self, embed_ind, buffers):
@@ -385,6 +412,21 @@ class DistributedResidualVectorQuantization(nn.Module):
         self.quantize_dropout = quantize_dropout
         self.rand_num_quant = rand_num_quant
 
+        # Squared codebook norms for inference, computed once per loaded/moved `embed` buffer.
+        self._embed_sq_norm = None
+        self._embed_sq_norm_key = None
+
+    def embed_sq_norm(self) -> torch.Tensor:
+        """`embed.pow(2).sum(-1)` of all quantizers, shape (num_quantizers, codebook_size)."""
+        if self.training:
+            # EMA updates write through `.data`, which does not bump the version counter.
+            return self.embed.pow(2).sum(-1)
+        key = (self.embed.data_ptr(), self.embed.device, self.embed.dtype, self.embed._version)
+        if self._embed_sq_norm_key != key:
+            self._embed_sq_norm = self.embed.pow(2).sum(-1)
+            self._embed_sq_norm_key = key
+        return self._embed_sq_norm
+
     def forward(self, x, n_q: tp.Optional[int] = None):
         quantized_out = torch.zeros_like(x)
         residual = x
@@ -442,13 +484,14 @@ class DistributedResidualVectorQuantization(nn.Module):
         residual = x
         all_indices = []
         n_q = n_q or len(self.layers)
+        embed_sq_norm = self.embed_sq_norm()
         for i, layer in enumerate(self.layers[:n_q]):
             indices = layer.encode(residual, [
                 self.inited[i],
                 self.cluster_size[i],
                 self.embed[i],
                 self.embed_avg[i]
-            ])
+            ], embed_sq_norm[i])
             quantized = layer.decode(indices, [
                 self.inited[i],
                 self.cluster_size[i],
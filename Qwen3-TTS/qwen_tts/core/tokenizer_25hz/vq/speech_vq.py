@@ -18,6 +18,7 @@ import copy
 import torch
 import operator
 import onnxruntime
+import numpy as np
 
 import torch.nn as nn
 import torch.nn.functional as F
@@ -25,9 +26,11 @@ import torchaudio.compliance.kaldi as kaldi
 
 from librosa.filters import mel as librosa_mel_fn
 from itertools import accumulate
-from typing import List
+from typing import List, Optional, Tuple
 from torch import Tensor
 
+from ...audio_io import map_in_threads
+from ...cpu_threads import get_ort_num_threads
 from .core_vq import DistributedGroupResidualVectorQuantization
 from .whisper_encoder import WhisperEncoder, Conv1d, ConvTranspose1d
 
@@ -98,8 +101,9 @@ class MelSpectrogramFeatures(nn.Module):
         y = audio
         if len(list(self.mel_basis.keys())) == 0:
             mel = librosa_mel_fn(sr=self.sampling_rate, n_fft=self.filter_length, n_mels=self.n_mel_channels, fmin=self.mel_fmin, fmax=self.mel_fmax)
-            self.mel_basis[str(self.mel_fmax)+'_'+str(y.device)] = torch.from_numpy(mel).float().to(y.device)
+            # window first: `extract_codes` preprocesses on several threads, which skip this block once mel_basis is set
             self.hann_window[str(y.device)] = torch.hann_window(self.win_length).to(y.device)
+            self.mel_basis[str(self.mel_fmax)+'_'+str(y.device)] = torch.from_numpy(mel).float().to(y.device)
 
         y = torch.nn.functional.pad(y.unsqueeze(1), (int((self.filter_length-self.hop_length)/2), int((self.filter_length-self.hop_length)/2)), mode='reflect')
         y = y.squeeze(1)
@@ -116,13 +120,42 @@ class MelSpectrogramFeatures(nn.Module):
         
 
 class XVectorExtractor(nn.Module):
-    def __init__(self, audio_codec_with_xvector):
+    """
+    Speaker x-vector (CAM++ ONNX) and reference mel extraction for the 25Hz tokenizer.
+
+    Args:
+        audio_codec_with_xvector (str): Path of the CAM++ ONNX model.
+        intra_op_num_threads (int, optional): ONNX Runtime threads used inside one operator. Default is the
+            `ort_num_threads` of `qwen_tts.core.cpu_threads.configure_cpu_threads` (1 unless configured).
+        inter_op_num_threads (int): ONNX Runtime threads used across independent operators. Default is 1.
+        num_workers (int): Threads for the sox normalisation, fbank and mel preprocessing of `extract_codes`. Default is 1.
+        providers (list, optional): ONNX Runtime execution providers. Default is `["CPUExecutionProvider"]`.
+        max_padding_ratio (float): Default of `extract_codes`. Default is 0 (exact per-clip x-vectors).
+    """
+    def __init__(
+        self,
+        audio_codec_with_xvector,
+        intra_op_num_threads: Optional[int] = None,
+        inter_op_num_threads: int = 1,
+        num_workers: int = 1,
+        providers: Optional[List[str]] = None,
+        max_padding_ratio: float = 0.0,
+    ):
         super().__init__()
         option = onnxruntime.SessionOptions()
         option.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
-        option.intra_op_num_threads = 1
-        providers = ["CPUExecutionProvider"]
+        option.intra_op_num_threads = intra_op_num_threads if intra_op_num_threads is not None else get_ort_num_threads()
+        option.inter_op_num_threads = inter_op_num_threads
+        providers = providers if providers is not None else ["CPUExecutionProvider"]
         self.ort_session = onnxruntime.InferenceSession(audio_codec_with_xvector, sess_options=option, providers=providers)
+        self.ort_input_name = self.ort_session.get_inputs()[0].name
+        # exported with a fixed batch dimension of 1, clips have to be run one at a time
+        batch_dim = self.ort_session.get_inputs()[0].shape[0]
+        self.max_onnx_batch_size = 1 if batch_dim == 1 else None
+
+        self.max_padding_ratio = max_padding_ratio
+        # the preprocessing threads are started per `extract_codes` call, none stay alive with the extractor
+        self.num_workers = num_workers
 
         self.tfm = sox.Transformer()
         self.tfm.norm(db_level=-6)
@@ -138,21 +171,82 @@ class XVectorExtractor(nn.Module):
         )
 
     def extract_code(self, audio):
+        xvectors, ref_mels = self.extract_codes([audio])
+        return xvectors[0], ref_mels[0]
+
+    def extract_codes(
+        self,
+        audios: List[np.ndarray],
+        batch_size: int = 16,
+        max_padding_ratio: Optional[float] = None,
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Extract x-vectors and reference mels of several 16kHz clips.
+
+        Preprocessing runs on `num_workers` threads, and the fbank features are run through the ONNX model in
+        batches of up to `batch_size` clips. With `max_padding_ratio` 0 (the constructor's default, used when it
+        is None) only clips with the same number of frames share a batch, which gives exactly the per-clip result.
+        A positive ratio also batches clips that need up to that fraction of padding: a shorter clip is then
+        padded to the longest clip of its batch by repeating its own frames. This keeps the statistics pooling of
+        CAM++ close to, but not equal to, the unpadded result, and makes its x-vector depend on the other clips
+        of the call.
+
+        Returns:
+            Tuple[List[np.ndarray], List[np.ndarray]]: L2-normalised x-vectors `(xvector_dim,)` and reference mels
+            `(mel_len, 80)`, in input order.
+        """
         with torch.no_grad():
-            norm_audio = self.sox_norm(audio)
-
-            norm_audio = torch.from_numpy(copy.deepcopy(norm_audio)).unsqueeze(0)
-            feat = kaldi.fbank(norm_audio,
-                            num_mel_bins=80,
-                            dither=0,
-                            sample_frequency=16000)
-            feat = feat - feat.mean(dim=0, keepdim=True)
-            norm_embedding = self.ort_session.run(None, {self.ort_session.get_inputs()[0].name: feat.unsqueeze(dim=0).cpu().numpy()})[0].flatten()
-            norm_embedding = F.normalize(torch.from_numpy(norm_embedding), dim=0)
-            
-            ref_mel = self.mel_ext.extract(audio=norm_audio)
-        
-        return norm_embedding.numpy(), ref_mel.permute(0,2,1).squeeze(0).numpy()
+            features = map_in_threads(self._preprocess, audios, self.num_workers)
+            feats = [feat for feat, _ in features]
+            ref_mels = [ref_mel for _, ref_mel in features]
+
+            if max_padding_ratio is None:
+                max_padding_ratio = self.max_padding_ratio
+            if self.max_onnx_batch_size is not None:
+                batch_size = min(batch_size, self.max_onnx_batch_size)
+            xvectors = [None] * len(feats)
+            for bucket in self._make_buckets([feat.shape[0] for feat in feats], batch_size, max_padding_ratio):
+                num_frames = feats[bucket[0]].shape[0]
+                batch = np.stack([self._pad_frames(feats[i], num_frames).numpy() for i in bucket])
+                embeddings = self.ort_session.run(None, {self.ort_input_name: batch})[0].reshape(len(bucket), -1)
+                for i, embedding in zip(bucket, embeddings):
+                    xvectors[i] = F.normalize(torch.from_numpy(embedding), dim=0).numpy()
+
+        return xvectors, ref_mels
+
+    def _preprocess(self, audio):
+        norm_audio = self.sox_norm(audio)
+
+        norm_audio = torch.from_numpy(copy.deepcopy(norm_audio)).unsqueeze(0)
+        feat = kaldi.fbank(norm_audio,
+                        num_mel_bins=80,
+                        dither=0,
+                        sample_frequency=16000)
+        feat = feat - feat.mean(dim=0, keepdim=True)
+
+        ref_mel = self.mel_ext.extract(audio=norm_audio)
+        return feat, ref_mel.permute(0,2,1).squeeze(0).numpy()
+
+    @staticmethod
+    def _make_buckets(lengths: List[int], batch_size: int, max_padding_ratio: float) -> List[List[int]]:
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+        buckets = []
+        for i in order:
+            if buckets:
+                bucket = buckets[-1]
+                longest = lengths[bucket[0]]
+                if len(bucket) < batch_size and longest - lengths[i] <= max_padding_ratio * longest:
+                    bucket.append(i)
+                    continue
+            buckets.append([i])
+        return buckets
+
+    @staticmethod
+    def _pad_frames(feat: Tensor, num_frames: int) -> Tensor:
+        if feat.shape[0] == num_frames:
+            return feat
+        num_repeats = -(-num_frames // feat.shape[0])
+        return feat.repeat(num_repeats, 1)[:num_frames]
     
     def sox_norm(self, audio):
         wav_norm = self.tfm.build_array(input_array=audio, sample_rate_in=16000)
@@ -228,9 +322,9 @@ class WhisperEncoderVQ(WhisperEncoder):
             self.project_after_vq_pe = nn.Linear(self.n_state, self.n_state)
 
     def _calc_quantize_activities(self, indices):
-        indices_onehot = F.one_hot(indices.long().flatten(), self.audio_vq_codebook_size).sum(dim=0)
-        vq_num_activities = sum(indices_onehot>0)
-        vq_num_tokens = sum(indices_onehot)
+        code_counts = torch.bincount(indices.long().flatten(), minlength=self.audio_vq_codebook_size)
+        vq_num_activities = (code_counts > 0).sum()
+        vq_num_tokens = code_counts.sum()
         return {
             "vq_num_activities": vq_num_activities,
             "vq_num_tokens": vq_num_tokens,
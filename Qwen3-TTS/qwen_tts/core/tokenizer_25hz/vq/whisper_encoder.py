@@ -32,7 +32,7 @@ except ImportError:
     try:
         from flash_attn.flash_attn_interface import flash_attn_unpadded_func as flash_attn_varlen_func
     except ImportError:
-        print("\n********\nWarning: flash-attn is not installed. Will only run the manual PyTorch version. Please install flash-attn for faster inference.\n********\n ")
+        print("\n********\nWarning: flash-attn is not installed. Will only run the PyTorch SDPA version. Please install flash-attn for faster inference.\n********\n ")
         flash_attn_varlen_func = None
 
 
@@ -168,6 +168,8 @@ class MultiHeadAttention(nn.Module):
         self.out = Linear(n_state, n_state)
 
         self.use_flash_attention = True
+        # Without flash-attn (e.g. on CPU or in fp32), use fused SDPA instead of `qkv_attention_manual`.
+        self.use_sdpa_attention = True
 
     def forward(
         self,
@@ -178,15 +180,13 @@ class MultiHeadAttention(nn.Module):
         k = self.key(x)
         v = self.value(x)
         
-        if self.use_flash_attention:
-            if flash_attn_varlen_func is None:
-                x = self.qkv_attention_manual(q, k, v, cu_seqlens=cu_seqlens)
-            else:
-                if q.dtype not in [torch.float16, torch.bfloat16]:
-                    x = self.qkv_attention_manual(q, k, v, cu_seqlens=cu_seqlens)
-                    self.use_flash_attention = False
-                else:
-                    x = self.qkv_flash_attention(q, k, v, cu_seqlens=cu_seqlens)
+        if self.use_flash_attention and flash_attn_varlen_func is not None and q.dtype not in [torch.float16, torch.bfloat16]:
+            self.use_flash_attention = False
+
+        if self.use_flash_attention and flash_attn_varlen_func is not None:
+            x = self.qkv_flash_attention(q, k, v, cu_seqlens=cu_seqlens)
+        elif self.use_sdpa_attention:
+            x = self.qkv_attention_sdpa(q, k, v, cu_seqlens=cu_seqlens)
         else:
             x = self.qkv_attention_manual(q, k, v, cu_seqlens=cu_seqlens)
 
@@ -211,6 +211,55 @@ class MultiHeadAttention(nn.Module):
         x = x.reshape(n_ctx, n_state)
         return x
 
+    def qkv_attention_sdpa(
+        self, q: Tensor, k: Tensor, v: Tensor, cu_seqlens: Tensor
+    ):
+        """
+        Varlen attention with `F.scaled_dot_product_attention` over packed sequences.
+
+        Consecutive sequences are packed greedily into rows of at most the longest sequence length, and every
+        row attends through a block-diagonal mask, so short tails of different audios share a row instead of
+        being padded to a full window each. Padding slots only attend to themselves and are dropped afterwards.
+        """
+        n_ctx, n_state = q.shape
+        head_dim = n_state // self.n_head
+
+        seqlens = (cu_seqlens[1:] - cu_seqlens[:-1]).tolist()
+        row_len = max(seqlens)
+
+        # Greedy packing: row/offset of every sequence, in order.
+        row_ids, offsets = [], []
+        num_rows, fill = 0, row_len
+        for seq_len in seqlens:
+            if fill + seq_len > row_len:
+                num_rows += 1
+                fill = 0
+            row_ids.append(num_rows - 1)
+            offsets.append(fill)
+            fill += seq_len
+
+        device = q.device
+        seqlens_t = torch.tensor(seqlens, device=device)
+        starts = torch.tensor(row_ids, device=device) * row_len + torch.tensor(offsets, device=device)
+        token_seq = torch.repeat_interleave(torch.arange(len(seqlens), device=device), seqlens_t)
+        token_pos = torch.arange(n_ctx, device=device) - cu_seqlens[:-1].to(device).long()[token_seq]
+        slots = starts[token_seq] + token_pos
+
+        num_slots = num_rows * row_len
+        segment_ids = -1 - torch.arange(num_slots, device=device)  # unique ids: padding attends to itself
+        segment_ids[slots] = token_seq
+        segment_ids = segment_ids.view(num_rows, row_len)
+        attn_mask = (segment_ids[:, :, None] == segment_ids[:, None, :]).unsqueeze(1)
+
+        def _pack(t: Tensor) -> Tensor:
+            packed = t.new_zeros(num_slots, n_state)
+            packed[slots] = t
+            return packed.view(num_rows, row_len, self.n_head, head_dim).transpose(1, 2)
+
+        context = F.scaled_dot_product_attention(_pack(q), _pack(k), _pack(v), attn_mask=attn_mask)
+        context = context.transpose(1, 2).reshape(num_slots, n_state)
+        return context[slots]
+
     def qkv_attention_manual(
         self, q: Tensor, k: Tensor, v: Tensor, cu_seqlens: Tensor
     ):
@@ -245,7 +294,9 @@ class MultiHeadAttention(nn.Module):
         attn_mask = torch.arange(max_seqlen, device=q.device)[None, :] < torch.tensor(seqlens, device=q.device)[:, None]
         attn_mask = attn_mask.unsqueeze(1).unsqueeze(2)
 
-        attn_mask = attn_mask.masked_fill(attn_mask == 0, -torch.finfo(q.dtype).max)
+        attn_mask = torch.zeros(attn_mask.shape, dtype=q.dtype, device=q.device).masked_fill(
+            ~attn_mask, -torch.finfo(q.dtype).max
+        )
 
         attn_scores = torch.matmul(q_padded, k_padded.transpose(-2, -1)) * scale
         attn_scores = attn_scores + attn_mask
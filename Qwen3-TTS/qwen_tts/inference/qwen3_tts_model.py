@@ -17,16 +17,17 @@ import base64
 import io
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import librosa
 import numpy as np
 import soundfile as sf
 import torch
 from transformers import AutoConfig, AutoModel, AutoProcessor
 
 from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from ..core.audio_io import DEFAULT_AUDIO_LOAD_WORKERS, map_in_threads, read_audio_file
+from ..core.resampler import resample_batch
 
 AudioLike = Union[
     str,                     # wav path, URL, base64
@@ -71,6 +72,8 @@ class Qwen3TTSModel:
         self.model = model
         self.processor = processor
         self.generate_defaults = generate_defaults or {}
+        # Number of threads used to read reference audio files concurrently.
+        self.audio_load_workers = DEFAULT_AUDIO_LOAD_WORKERS
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -215,7 +218,7 @@ class Qwen3TTSModel:
             with io.BytesIO(wav_bytes) as f:
                 audio, sr = sf.read(f, dtype="float32", always_2d=False)
         else:
-            audio, sr = librosa.load(x, sr=None, mono=True)
+            audio, sr = read_audio_file(x)
 
         if audio.ndim > 1:
             audio = np.mean(audio, axis=-1)
@@ -237,7 +240,8 @@ class Qwen3TTSModel:
 
         Returns:
             List[Tuple[np.ndarray, int]]:
-                List of (float32 waveform, original sr).
+                List of (float32 waveform, original sr). Paths, URLs and base64 strings are decoded
+                concurrently on `self.audio_load_workers` threads.
 
         Raises:
             ValueError: If a numpy waveform is provided without sr.
@@ -247,10 +251,13 @@ class Qwen3TTSModel:
         else:
             items = [audios]
 
+        str_items = [a for a in items if isinstance(a, str)]
+        loaded = iter(map_in_threads(self._load_audio_to_np, str_items, self.audio_load_workers))
+
         out: List[Tuple[np.ndarray, int]] = []
         for a in items:
             if isinstance(a, str):
-                out.append(self._load_audio_to_np(a))
+                out.append(next(loaded))
             elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray):
                 out.append((a[0].astype(np.float32), int(a[1])))
             elif isinstance(a, np.ndarray):
@@ -383,7 +390,8 @@ class Qwen3TTSModel:
             ref_audio:
                 Reference audio(s) used to extract:
                   - ref_code via `model.speech_tokenizer.encode(...)`
-                  - ref_spk_embedding via `model.extract_speaker_embedding(...)` (resampled to 24k)
+                  - ref_spk_embedding via `model.extract_speaker_embeddings(...)` (resampled to 24k)
+                All references are resampled once and encoded in one batch; items are returned in input order.
             ref_text:
                 Reference transcript(s). Required when x_vector_only_mode=False (ICL mode).
             x_vector_only_mode:
@@ -415,40 +423,39 @@ class Qwen3TTSModel:
                 f"Batch size mismatch: ref_audio={len(ref_audio_list)}, ref_text={len(ref_text_list)}, x_vector_only_mode={len(xvec_list)}"
             )
 
-        normalized = self._normalize_audio_inputs(ref_audio_list)
-
-        ref_wavs_for_code: List[np.ndarray] = []
-        ref_sr_for_code: List[int] = []
-        for wav, sr in normalized:
-            ref_wavs_for_code.append(wav)
-            ref_sr_for_code.append(sr)
-
-        if len(set(ref_sr_for_code)) == 1:
-            enc = self.model.speech_tokenizer.encode(ref_wavs_for_code, sr=ref_sr_for_code[0])
-            ref_codes = enc.audio_codes
-        else:
-            ref_codes = []
-            for wav, sr in normalized:
-                ref_codes.append(self.model.speech_tokenizer.encode(wav, sr=sr).audio_codes[0])
-
-        items: List[VoiceClonePromptItem] = []
-        for i, ((wav, sr), code, rtext, xvec_only) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list)):
+        for i, (rtext, xvec_only) in enumerate(zip(ref_text_list, xvec_list)):
             if not xvec_only:
                 if rtext is None or rtext == "":
                     raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
 
-            wav_resample = wav
-            if sr != self.model.speaker_encoder_sample_rate:
-                wav_resample = librosa.resample(y=wav_resample.astype(np.float32), 
-                                           orig_sr=int(sr), 
-                                           target_sr=self.model.speaker_encoder_sample_rate)
+        normalized = self._normalize_audio_inputs(ref_audio_list)
+
+        # Resample every reference once to the rates of the speech tokenizer and the speaker encoder, so both
+        # run as a single batch regardless of the input sampling rates.
+        code_sr = self.model.speech_tokenizer.get_input_sample_rate()
+        spk_sr = self.model.speaker_encoder_sample_rate
+        wavs = [wav for wav, _ in normalized]
+        srs = [sr for _, sr in normalized]
+        ref_wavs_for_code = resample_batch(wavs, srs, code_sr, device=self.device)
+        if spk_sr == code_sr:
+            ref_wavs_for_spk = ref_wavs_for_code
+        else:
+            ref_wavs_for_spk = resample_batch(wavs, srs, spk_sr, device=self.device)
+
+        ref_codes: List[Optional[torch.Tensor]] = [None] * len(normalized)
+        icl_indices = [i for i, xvec_only in enumerate(xvec_list) if not xvec_only]
+        if icl_indices:
+            enc = self.model.speech_tokenizer.encode([ref_wavs_for_code[i] for i in icl_indices], sr=code_sr)
+            for i, code in zip(icl_indices, enc.audio_codes):
+                ref_codes[i] = code
 
-            spk_emb = self.model.extract_speaker_embedding(audio=wav_resample,
-                                                           sr=self.model.speaker_encoder_sample_rate)
+        spk_embs = self.model.extract_speaker_embeddings(ref_wavs_for_spk, sr=spk_sr)
 
+        items: List[VoiceClonePromptItem] = []
+        for code, spk_emb, rtext, xvec_only in zip(ref_codes, spk_embs, ref_text_list, xvec_list):
             items.append(
                 VoiceClonePromptItem(
-                    ref_code=None if xvec_only else code,
+                    ref_code=code,
                     ref_spk_embedding=spk_emb,
                     x_vector_only_mode=bool(xvec_only),
                     icl_mode=bool(not xvec_only),
@@ -465,6 +472,356 @@ class Qwen3TTSModel:
             icl_mode=[it.icl_mode for it in items],
         )
 
+    def _prepare_voice_clone_inputs(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+    ) -> Tuple[List[torch.Tensor], Optional[List[Optional[torch.Tensor]]], Dict[str, Any], List[str]]:
+        """
+        Validate voice clone inputs and build (input_ids, ref_ids, voice_clone_prompt_dict, languages)
+        for `Qwen3TTSForConditionalGeneration.generate` / `generate_stream`.
+        """
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(texts) != len(languages):
+            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
+
+        self._validate_languages(languages)
+
+        if voice_clone_prompt is None:
+            if ref_audio is None:
+                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
+            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
+            if len(prompt_items) == 1 and len(texts) > 1:
+                prompt_items = prompt_items * len(texts)
+            if len(prompt_items) != len(texts):
+                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+            ref_texts_for_ids = [it.ref_text for it in prompt_items]
+        else:
+            if isinstance(voice_clone_prompt, list):
+                prompt_items = voice_clone_prompt
+                if len(prompt_items) == 1 and len(texts) > 1:
+                    prompt_items = prompt_items * len(texts)
+                if len(prompt_items) != len(texts):
+                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+                ref_texts_for_ids = [it.ref_text for it in prompt_items]
+            else:
+                voice_clone_prompt_dict = voice_clone_prompt
+                ref_texts_for_ids = None
+
+        input_texts = [self._build_assistant_text(t) for t in texts]
+        input_ids = self._tokenize_texts(input_texts)
+
+        ref_ids = None
+        if ref_texts_for_ids is not None:
+            ref_ids = []
+            for i, rt in enumerate(ref_texts_for_ids):
+                if rt is None or rt == "":
+                    ref_ids.append(None)
+                else:
+                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
+                    ref_ids.append(ref_tok)
+
+        return input_ids, ref_ids, voice_clone_prompt_dict, languages
+
+    def _prepare_voice_design_inputs(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+    ) -> Tuple[List[torch.Tensor], List[Optional[torch.Tensor]], List[str]]:
+        """
+        Validate voice design inputs and build (input_ids, instruct_ids, languages).
+        """
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        instructs = self._ensure_list(instruct)
+
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(instructs) == 1 and len(texts) > 1:
+            instructs = instructs * len(texts)
+
+        if not (len(texts) == len(languages) == len(instructs)):
+            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}, instruct={len(instructs)}")
+
+        self._validate_languages(languages)
+
+        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
+
+        instruct_ids: List[Optional[torch.Tensor]] = []
+        for ins in instructs:
+            if ins is None or ins == "":
+                instruct_ids.append(None)
+            else:
+                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+
+        return input_ids, instruct_ids, languages
+
+    def _prepare_custom_voice_inputs(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+    ) -> Tuple[List[torch.Tensor], List[Optional[torch.Tensor]], List[str], List[str]]:
+        """
+        Validate custom voice inputs and build (input_ids, instruct_ids, languages, speakers).
+        """
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        speakers = self._ensure_list(speaker)
+        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
+            instruct = None
+        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
+
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(speakers) == 1 and len(texts) > 1:
+            speakers = speakers * len(texts)
+        if len(instructs) == 1 and len(texts) > 1:
+            instructs = instructs * len(texts)
+
+        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
+            raise ValueError(
+                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
+            )
+
+        self._validate_languages(languages)
+        self._validate_speakers(speakers)
+
+        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
+
+        instruct_ids: List[Optional[torch.Tensor]] = []
+        for ins in instructs:
+            if ins is None or ins == "":
+                instruct_ids.append(None)
+            else:
+                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+
+        return input_ids, instruct_ids, languages, speakers
+
+    def _stream_decode(
+        self,
+        frames: Iterator[torch.Tensor],
+        context_codes: Optional[torch.Tensor] = None,
+        chunk_size: int = 8,
+    ) -> Iterator[np.ndarray]:
+        """
+        Incrementally decode talker codec frames into waveform chunks with the 12Hz causal decoder.
+
+        Frames are fed to a decoder streaming session every `chunk_size` frames, so each step only runs the
+        decoder on the new frames and concatenating the chunks gives exactly the non-streaming waveform.
+
+        Args:
+            frames:
+                Iterator over `(1, num_code_groups)` frames from `model.generate_stream(...)`.
+                Decoding stops at the first frame whose first codebook is `codec_eos_token_id`.
+            context_codes:
+                Optional `(T, num_code_groups)` codes that precede the generated frames (e.g. the
+                reference codes in ICL mode). They prime the decoder state but are never emitted.
+            chunk_size:
+                Number of codec frames decoded per emitted chunk.
+
+        Yields:
+            np.ndarray:
+                float32 waveform chunks at `speech_tokenizer.get_output_sample_rate()`.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+        decoder = self.model.speech_tokenizer.model.decoder
+        upsample = int(self.model.speech_tokenizer.get_decode_upsample_rate())
+        eos_token_id = self.model.config.talker_config.codec_eos_token_id
+
+        session = decoder.streaming_session()
+        skip = 0
+        if context_codes is not None:
+            context_codes = context_codes.to(self.device).long()
+            primed = session.decode(context_codes.transpose(0, 1).unsqueeze(0))
+            skip = context_codes.shape[0] * upsample - primed.shape[-1]
+
+        def _decode(codes):
+            nonlocal skip
+            wav = session.decode(torch.stack(codes, dim=1).unsqueeze(0)).reshape(-1)
+            num_skip = min(skip, wav.shape[0])
+            skip -= num_skip
+            return wav[num_skip:].float().cpu().numpy()
+
+        pending = []
+        for frame in frames:
+            frame = frame.reshape(-1)
+            if int(frame[0]) == eos_token_id:
+                break
+            pending.append(frame.to(self.device))
+            if len(pending) >= chunk_size:
+                wav = _decode(pending)
+                pending = []
+                if wav.shape[0] > 0:
+                    yield wav
+
+        if pending:
+            wav = _decode(pending)
+            if wav.shape[0] > 0:
+                yield wav
+
+    def _check_streaming_supported(self, text: Union[str, List[str]]) -> str:
+        if self.model.tokenizer_type != "qwen3_tts_tokenizer_12hz":
+            raise ValueError(
+                f"Streaming synthesis requires the 12Hz speech tokenizer, got tokenizer_type: {self.model.tokenizer_type}"
+            )
+        texts = self._ensure_list(text)
+        if len(texts) != 1:
+            raise ValueError(f"Streaming synthesis supports a single text, got {len(texts)}")
+        return texts[0]
+
+    def _decode_talker_codes(
+        self,
+        talker_codes_list: List[torch.Tensor],
+        ref_code_list: Optional[List[Optional[torch.Tensor]]] = None,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Decode talker codes into waveforms. When a sample has reference codes (voice clone ICL mode) they are
+        decoded together with the generated codes as context and the reference part is cut from the output.
+        """
+        codes_for_decode = []
+        for i, codes in enumerate(talker_codes_list):
+            if ref_code_list is not None and ref_code_list[i] is not None:
+                codes_for_decode.append(torch.cat([ref_code_list[i].to(codes.device), codes], dim=0))
+            else:
+                codes_for_decode.append(codes)
+
+        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
+
+        wavs_out: List[np.ndarray] = []
+        for i, wav in enumerate(wavs_all):
+            if ref_code_list is not None and ref_code_list[i] is not None:
+                ref_len = int(ref_code_list[i].shape[0])
+                total_len = int(codes_for_decode[i].shape[0])
+                cut = int(ref_len / max(total_len, 1) * wav.shape[0])
+                wavs_out.append(wav[cut:])
+            else:
+                wavs_out.append(wav)
+
+        return wavs_out, fs
+
+    def _generate_voice_clone_codes(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], Optional[List[Optional[torch.Tensor]]]]:
+        """Talker stage of `generate_voice_clone`. Returns (talker_codes_list, ref_code_list)."""
+        if self.model.tts_model_type != "base":
+            raise ValueError(
+                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
+                f"tts_model_size: {self.model.tts_model_size}\n"
+                f"tts_model_type: {self.model.tts_model_type}\n"
+                "does not support generate_voice_clone, Please check Model Card or Readme for more details."
+            )
+        
+        input_ids, ref_ids, voice_clone_prompt_dict, languages = self._prepare_voice_clone_inputs(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+        )
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        talker_codes_list, _ = self.model.generate(
+            input_ids=input_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt_dict,
+            languages=languages,
+            non_streaming_mode=non_streaming_mode,
+            **gen_kwargs,
+        )
+
+        ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
+        return talker_codes_list, ref_code_list
+
+    def _generate_voice_design_codes(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], None]:
+        """Talker stage of `generate_voice_design`. Returns (talker_codes_list, None)."""
+        if self.model.tts_model_type != "voice_design":
+            raise ValueError(
+                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
+                f"tts_model_size: {self.model.tts_model_size}\n"
+                f"tts_model_type: {self.model.tts_model_type}\n"
+                "does not support generate_voice_design, Please check Model Card or Readme for more details."
+            )
+        
+        input_ids, instruct_ids, languages = self._prepare_voice_design_inputs(text=text, instruct=instruct, language=language)
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        talker_codes_list, _ = self.model.generate(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            languages=languages,
+            non_streaming_mode=non_streaming_mode,
+            **gen_kwargs,
+        )
+
+        return talker_codes_list, None
+
+    def _generate_custom_voice_codes(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], None]:
+        """Talker stage of `generate_custom_voice`. Returns (talker_codes_list, None)."""
+        if self.model.tts_model_type != "custom_voice":
+            raise ValueError(
+                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
+                f"tts_model_size: {self.model.tts_model_size}\n"
+                f"tts_model_type: {self.model.tts_model_type}\n"
+                "does not support generate_custom_voice, Please check Model Card or Readme for more details."
+            )
+
+        input_ids, instruct_ids, languages, speakers = self._prepare_custom_voice_inputs(
+            text=text, speaker=speaker, language=language, instruct=instruct
+        )
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        talker_codes_list, _ = self.model.generate(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+            **gen_kwargs,
+        )
+
+        return talker_codes_list, None
+
     # voice clone model
     @torch.no_grad()
     def generate_voice_clone(
@@ -533,6 +890,13 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            use_static_cache:
+                If True, decode with preallocated static KV caches that are reused across calls instead of
+                growing a new cache every step. Do not share one model between concurrent calls in this mode.
+            prompt_cache_key:
+                Identity of the voice prompt (e.g. a hash of the saved prompt file plus the model id). After
+                `self.model.enable_prompt_cache()`, single-text calls with the same key reuse the talker
+                states of the prompt prefix they share (speaker and reference part) instead of prefilling it again.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -545,62 +909,80 @@ class Qwen3TTSModel:
             ValueError:
                 If batch sizes mismatch or required prompt inputs are missing.
         """
+        talker_codes_list, ref_code_list = self._generate_voice_clone_codes(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(talker_codes_list, ref_code_list)
+
+    @torch.no_grad()
+    def generate_voice_clone_stream(
+        self,
+        text: str,
+        language: str = None,
+        ref_audio: Optional[AudioLike] = None,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        chunk_size: int = 8,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_voice_clone` for a single text.
+
+        Audio chunks are yielded while the talker is still generating, so playback can start after the
+        first `chunk_size` codec frames instead of after the whole utterance.
+
+        Args:
+            text, language, ref_audio, ref_text, x_vector_only_mode, voice_clone_prompt, non_streaming_mode:
+                See `generate_voice_clone`. Only one sample is supported.
+            chunk_size:
+                Number of codec frames (12.5 frames per second) decoded per yielded chunk. Smaller values
+                lower the latency to the first chunk at the cost of more decoder calls.
+            **kwargs:
+                Same generation arguments as `generate_voice_clone`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+
+        Raises:
+            ValueError:
+                If the model does not use the 12Hz tokenizer or more than one text is given.
+        """
         if self.model.tts_model_type != "base":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
                 f"tts_model_size: {self.model.tts_model_size}\n"
                 f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_clone, Please check Model Card or Readme for more details."
+                "does not support generate_voice_clone_stream, Please check Model Card or Readme for more details."
             )
-        
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(texts) != len(languages):
-            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
-
-        self._validate_languages(languages)
-
-        if voice_clone_prompt is None:
-            if ref_audio is None:
-                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
-            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
-            if len(prompt_items) == 1 and len(texts) > 1:
-                prompt_items = prompt_items * len(texts)
-            if len(prompt_items) != len(texts):
-                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-            ref_texts_for_ids = [it.ref_text for it in prompt_items]
-        else:
-            if isinstance(voice_clone_prompt, list):
-                prompt_items = voice_clone_prompt
-                if len(prompt_items) == 1 and len(texts) > 1:
-                    prompt_items = prompt_items * len(texts)
-                if len(prompt_items) != len(texts):
-                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-                ref_texts_for_ids = [it.ref_text for it in prompt_items]
-            else:
-                voice_clone_prompt_dict = voice_clone_prompt
-                ref_texts_for_ids = None
-
-        input_texts = [self._build_assistant_text(t) for t in texts]
-        input_ids = self._tokenize_texts(input_texts)
-
-        ref_ids = None
-        if ref_texts_for_ids is not None:
-            ref_ids = []
-            for i, rt in enumerate(ref_texts_for_ids):
-                if rt is None or rt == "":
-                    ref_ids.append(None)
-                else:
-                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
-                    ref_ids.append(ref_tok)
+        text = self._check_streaming_supported(text)
+
+        input_ids, ref_ids, voice_clone_prompt_dict, languages = self._prepare_voice_clone_inputs(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+        )
+        if len(input_ids) != len(voice_clone_prompt_dict["ref_spk_embedding"]):
+            raise ValueError("Streaming synthesis supports a single voice clone prompt.")
 
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
+        ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
+        context_codes = ref_code_list[0] if ref_code_list is not None else None
+
+        frames = self.model.generate_stream(
             input_ids=input_ids,
             ref_ids=ref_ids,
             voice_clone_prompt=voice_clone_prompt_dict,
@@ -608,29 +990,12 @@ class Qwen3TTSModel:
             non_streaming_mode=non_streaming_mode,
             **gen_kwargs,
         )
-
-        codes_for_decode = []
-        for i, codes in enumerate(talker_codes_list):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
-                codes_for_decode.append(torch.cat([ref_code_list[i].to(codes.device), codes], dim=0))
-            else:
-                codes_for_decode.append(codes)
-
-        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
-
-        wavs_out: List[np.ndarray] = []
-        for i, wav in enumerate(wavs_all):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
-                ref_len = int(ref_code_list[i].shape[0])
-                total_len = int(codes_for_decode[i].shape[0])
-                cut = int(ref_len / max(total_len, 1) * wav.shape[0])
-                wavs_out.append(wav[cut:])
-            else:
-                wavs_out.append(wav)
-
-        return wavs_out, fs
+        fs = self.model.speech_tokenizer.get_output_sample_rate()
+        try:
+            for wav in self._stream_decode(frames, context_codes=context_codes, chunk_size=chunk_size):
+                yield wav, fs
+        finally:
+            frames.close()
 
     # voice design model
     @torch.no_grad()
@@ -675,6 +1040,9 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            use_static_cache:
+                If True, decode with preallocated static KV caches that are reused across calls instead of
+                growing a new cache every step. Do not share one model between concurrent calls in this mode.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -683,49 +1051,71 @@ class Qwen3TTSModel:
             Tuple[List[np.ndarray], int]:
                 (wavs, sample_rate)
         """
+        talker_codes_list, _ = self._generate_voice_design_codes(
+            text=text,
+            instruct=instruct,
+            language=language,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(talker_codes_list)
+
+    @torch.no_grad()
+    def generate_voice_design_stream(
+        self,
+        text: str,
+        instruct: str,
+        language: str = None,
+        non_streaming_mode: bool = True,
+        chunk_size: int = 8,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_voice_design` for a single text.
+
+        Args:
+            text, instruct, language, non_streaming_mode:
+                See `generate_voice_design`. Only one sample is supported.
+            chunk_size:
+                Number of codec frames (12.5 frames per second) decoded per yielded chunk. Smaller values
+                lower the latency to the first chunk at the cost of more decoder calls.
+            **kwargs:
+                Same generation arguments as `generate_voice_design`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+
+        Raises:
+            ValueError:
+                If the model does not use the 12Hz tokenizer or more than one text is given.
+        """
         if self.model.tts_model_type != "voice_design":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
                 f"tts_model_size: {self.model.tts_model_size}\n"
                 f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_design, Please check Model Card or Readme for more details."
+                "does not support generate_voice_design_stream, Please check Model Card or Readme for more details."
             )
-        
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        instructs = self._ensure_list(instruct)
-
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(instructs) == 1 and len(texts) > 1:
-            instructs = instructs * len(texts)
+        text = self._check_streaming_supported(text)
 
-        if not (len(texts) == len(languages) == len(instructs)):
-            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}, instruct={len(instructs)}")
-
-        self._validate_languages(languages)
-
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
-
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        input_ids, instruct_ids, languages = self._prepare_voice_design_inputs(text=text, instruct=instruct, language=language)
 
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
+        frames = self.model.generate_stream(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
             languages=languages,
             non_streaming_mode=non_streaming_mode,
             **gen_kwargs,
         )
-
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        fs = self.model.speech_tokenizer.get_output_sample_rate()
+        try:
+            for wav in self._stream_decode(frames, chunk_size=chunk_size):
+                yield wav, fs
+        finally:
+            frames.close()
 
     # custom voice model
     @torch.no_grad()
@@ -773,6 +1163,9 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            use_static_cache:
+                If True, decode with preallocated static KV caches that are reused across calls instead of
+                growing a new cache every step. Do not share one model between concurrent calls in this mode.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -785,48 +1178,63 @@ class Qwen3TTSModel:
             ValueError:
                 If any speaker/language is unsupported or batch sizes mismatch.
         """
+        talker_codes_list, _ = self._generate_custom_voice_codes(
+            text=text,
+            speaker=speaker,
+            language=language,
+            instruct=instruct,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(talker_codes_list)
+
+    @torch.no_grad()
+    def generate_custom_voice_stream(
+        self,
+        text: str,
+        speaker: str,
+        language: str = None,
+        instruct: Optional[str] = None,
+        non_streaming_mode: bool = True,
+        chunk_size: int = 8,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_custom_voice` for a single text.
+
+        Args:
+            text, speaker, language, instruct, non_streaming_mode:
+                See `generate_custom_voice`. Only one sample is supported.
+            chunk_size:
+                Number of codec frames (12.5 frames per second) decoded per yielded chunk. Smaller values
+                lower the latency to the first chunk at the cost of more decoder calls.
+            **kwargs:
+                Same generation arguments as `generate_custom_voice`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+
+        Raises:
+            ValueError:
+                If the model does not use the 12Hz tokenizer or more than one text is given.
+        """
         if self.model.tts_model_type != "custom_voice":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
                 f"tts_model_size: {self.model.tts_model_size}\n"
                 f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_custom_voice, Please check Model Card or Readme for more details."
-            )
-
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        speakers = self._ensure_list(speaker)
-        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
-            instruct = None
-        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
-
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(speakers) == 1 and len(texts) > 1:
-            speakers = speakers * len(texts)
-        if len(instructs) == 1 and len(texts) > 1:
-            instructs = instructs * len(texts)
-
-        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
-            raise ValueError(
-                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
+                "does not support generate_custom_voice_stream, Please check Model Card or Readme for more details."
             )
+        text = self._check_streaming_supported(text)
 
-        self._validate_languages(languages)
-        self._validate_speakers(speakers)
-
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
-
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        input_ids, instruct_ids, languages, speakers = self._prepare_custom_voice_inputs(
+            text=text, speaker=speaker, language=language, instruct=instruct
+        )
 
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
+        frames = self.model.generate_stream(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
             languages=languages,
@@ -834,9 +1242,12 @@ class Qwen3TTSModel:
             non_streaming_mode=non_streaming_mode,
             **gen_kwargs,
         )
-
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        fs = self.model.speech_tokenizer.get_output_sample_rate()
+        try:
+            for wav in self._stream_decode(frames, chunk_size=chunk_size):
+                yield wav, fs
+        finally:
+            frames.close()
 
 
     def get_supported_speakers(self) -> Optional[List[str]]:
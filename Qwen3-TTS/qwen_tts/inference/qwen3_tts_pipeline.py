@@ -0,0 +1,159 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from .qwen3_tts_model import Qwen3TTSModel
+
+_STAGE_METHODS = {
+    "voice_clone": "_generate_voice_clone_codes",
+    "voice_design": "_generate_voice_design_codes",
+    "custom_voice": "_generate_custom_voice_codes",
+}
+
+_DONE = object()
+
+
+class Qwen3TTSPipeline:
+    """
+    Two-stage executor that overlaps talker generation with waveform decoding.
+
+    `Qwen3TTSModel.generate_*` runs talker `generate` -> `speech_tokenizer.decode` -> writing the result one
+    request after the other, so the talker is idle while a request is decoded and saved. Here the talker
+    (stage 1) and the speech tokenizer decoder plus an optional `sink` (stage 2) run on two worker threads
+    connected by a bounded queue: while request N is decoded and written, the codec frames of request N+1
+    are already being generated. `queue_size` bounds how many generated requests may wait for decoding, which
+    applies backpressure to the talker when decoding is the slower stage. On CUDA, decoding runs on its own
+    stream.
+
+    Example:
+        pipeline = Qwen3TTSPipeline(tts)
+        requests = [dict(text=line, language="English", voice_clone_prompt=prompt) for line in lines]
+        sink = lambda index, wavs, sr: sf.write(f"out_{index}.wav", wavs[0], sr)
+        for index, _ in pipeline.run("voice_clone", requests, sink=sink):
+            ...
+    """
+
+    def __init__(self, model: Qwen3TTSModel, queue_size: int = 2):
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+        self.model = model
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        task: str,
+        requests: Iterable[Dict[str, Any]],
+        sink: Optional[Callable[[int, List[np.ndarray], int], Any]] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Run every request through both stages and yield the results in request order.
+
+        Args:
+            task:
+                One of `"voice_clone"`, `"voice_design"` or `"custom_voice"`.
+            requests:
+                Keyword arguments of the matching `generate_<task>` call, one dict per request. Each request may
+                itself be a batch.
+            sink:
+                Optional `sink(index, wavs, sample_rate)` called on the decode thread right after a request is
+                decoded (e.g. to write it to disk), so it also overlaps with generation.
+
+        Yields:
+            `(index, result)` where `result` is the return value of `sink`, or `(wavs, sample_rate)` without one.
+        """
+        if task not in _STAGE_METHODS:
+            raise ValueError(f"Unknown task: {task}. Expected one of {sorted(_STAGE_METHODS)}")
+        generate_codes = getattr(self.model, _STAGE_METHODS[task])
+
+        codes_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        use_cuda = torch.device(self.model.device).type == "cuda"
+        decode_stream = torch.cuda.Stream(device=self.model.device) if use_cuda else None
+
+        def _put(q: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _generate_stage():
+            try:
+                with torch.no_grad():
+                    for index, kwargs in enumerate(requests):
+                        if stop.is_set():
+                            return
+                        talker_codes_list, ref_code_list = generate_codes(**kwargs)
+                        ready = None
+                        if use_cuda:
+                            ready = torch.cuda.Event()
+                            ready.record()
+                        if not _put(codes_queue, (index, talker_codes_list, ref_code_list, ready)):
+                            return
+                _put(codes_queue, _DONE)
+            except BaseException as e:
+                _put(codes_queue, e)
+
+        def _decode_stage():
+            try:
+                with torch.no_grad():
+                    while not stop.is_set():
+                        try:
+                            item = codes_queue.get(timeout=0.1)
+                        except queue.Empty:
+                            continue
+                        if item is _DONE or isinstance(item, BaseException):
+                            _put(results_queue, item)
+                            return
+                        index, talker_codes_list, ref_code_list, ready = item
+                        if decode_stream is not None:
+                            with torch.cuda.stream(decode_stream):
+                                decode_stream.wait_event(ready)
+                                wavs, fs = self.model._decode_talker_codes(talker_codes_list, ref_code_list)
+                        else:
+                            wavs, fs = self.model._decode_talker_codes(talker_codes_list, ref_code_list)
+                        result = sink(index, wavs, fs) if sink is not None else (wavs, fs)
+                        if not _put(results_queue, (index, result)):
+                            return
+            except BaseException as e:
+                _put(results_queue, e)
+
+        threads = [
+            threading.Thread(target=_generate_stage, name="qwen3-tts-generate", daemon=True),
+            threading.Thread(target=_decode_stage, name="qwen3-tts-decode", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = results_queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
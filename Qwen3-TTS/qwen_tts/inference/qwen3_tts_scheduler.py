@@ -0,0 +1,451 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import torch
+from transformers.cache_utils import DynamicCache
+
+from ..core.models import Qwen3TTSForConditionalGeneration
+from ..core.models.modeling_qwen3_tts import sample_next_token
+
+
+@dataclass
+class Qwen3TTSSchedulerOutput:
+    """
+    One event produced by `Qwen3TTSTalkerScheduler.step()` for a request.
+
+    `codec_ids` is the `(num_code_groups,)` frame completed during the step (None when the step only
+    finished the request). When `finished` is True, `codes` holds every frame of the request as a
+    `(T, num_code_groups)` tensor, ready for `speech_tokenizer.decode`.
+    """
+    request_id: Any
+    codec_ids: Optional[torch.Tensor]
+    finished: bool = False
+    codes: Optional[torch.Tensor] = None
+
+
+@dataclass
+class _TalkerRequest:
+    request_id: Any
+    input_ids: torch.Tensor
+    instruct_ids: Optional[torch.Tensor] = None
+    ref_ids: Optional[torch.Tensor] = None
+    voice_clone_prompt: Optional[Dict[str, Any]] = None
+    language: str = "Auto"
+    speaker: Optional[str] = None
+    non_streaming_mode: bool = False
+    max_new_tokens: int = 4096
+    prompt_cache_key: Any = None
+    # decoding state, filled in at admission
+    trailing_text_hidden: Optional[torch.Tensor] = None  # (T, D)
+    generation_step: int = 0
+    num_tokens: int = 0
+    frames: List[torch.Tensor] = field(default_factory=list)
+
+
+class Qwen3TTSTalkerScheduler:
+    """
+    Continuous batching engine for the talker.
+
+    `Qwen3TTSForConditionalGeneration.generate` left-pads a fixed batch and decodes until its longest row
+    emits EOS. This scheduler keeps up to `max_batch_size` rows decoding at once instead: waiting requests
+    are prefilled and merged into free slots between steps, and rows that emit EOS (or reach their
+    `max_new_tokens`) are evicted right away. After an eviction the KV cache and attention mask are compacted
+    by dropping the leading columns that are padding for every remaining row.
+
+    Every row keeps its own `generation_step` into its own `trailing_text_hidden` and its own rope position,
+    so a row decodes exactly as it would alone in `generate` (up to the numerics of batched matmuls).
+
+    `add_request` / `abort_request` may be called from other threads, `step` must be driven by a single
+    engine loop. Sampling arguments are shared by all requests and have the same meaning as in `generate`.
+
+    Example:
+        scheduler = Qwen3TTSTalkerScheduler(tts.model, max_batch_size=8, **tts.generate_defaults)
+        input_ids, ref_ids, prompt, languages = tts._prepare_voice_clone_inputs(text, "English", voice_clone_prompt=items)
+        scheduler.add_request(input_ids[0], ref_ids=ref_ids[0], voice_clone_prompt=prompt, language=languages[0])
+        while scheduler.has_unfinished_requests():
+            for out in scheduler.step():
+                ...
+    """
+
+    def __init__(
+        self,
+        model: Qwen3TTSForConditionalGeneration,
+        max_batch_size: int = 8,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        use_static_cache: bool = False,
+        **kwargs,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.model = model
+        self.talker = model.talker
+        self.max_batch_size = max_batch_size
+
+        self.generate_kwargs = model._build_talker_kwargs(
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            top_k=top_k,
+            top_p=top_p,
+            temperature=temperature,
+            subtalker_dosample=subtalker_dosample,
+            subtalker_top_k=subtalker_top_k,
+            subtalker_top_p=subtalker_top_p,
+            subtalker_temperature=subtalker_temperature,
+            eos_token_id=eos_token_id,
+            repetition_penalty=repetition_penalty,
+            use_static_cache=use_static_cache,
+        )
+        self.eos_token_id = self.generate_kwargs["eos_token_id"]
+        vocab_size = self.talker.config.vocab_size
+        self.suppress_mask = torch.zeros(vocab_size, dtype=torch.bool, device=self.talker.device)
+        self.suppress_mask[self.generate_kwargs["suppress_tokens"]] = True
+
+        self._request_counter = itertools.count()
+        self._lock = threading.Lock()
+        self._waiting: deque = deque()
+        self._aborted: set = set()
+        self._running: List[_TalkerRequest] = []
+        self._tts_pad_embed = None
+        self._reset_batch()
+
+    def _reset_batch(self):
+        self._past_key_values = None
+        self._attention_mask = None  # (B, L)
+        self._last_tokens = None     # (B, 1)
+        self._past_hidden = None     # (B, 1, D)
+        self._positions = None       # (B,)
+        self._seen_tokens = None     # (B, vocab_size) bool, for the repetition penalty
+
+    def add_request(
+        self,
+        input_ids: torch.Tensor,
+        instruct_ids: Optional[torch.Tensor] = None,
+        ref_ids: Optional[torch.Tensor] = None,
+        voice_clone_prompt: Optional[Dict[str, Any]] = None,
+        language: str = "Auto",
+        speaker: Optional[str] = None,
+        non_streaming_mode: bool = False,
+        max_new_tokens: Optional[int] = None,
+        prompt_cache_key: Any = None,
+        request_id: Any = None,
+    ) -> Any:
+        """
+        Queue one prompt. The arguments are the per-sample entries of the `generate` inputs, i.e.
+        `input_ids` is a `(1, T)` tensor and `voice_clone_prompt` a dict of single-item lists
+        (see `Qwen3TTSModel._prompt_items_to_voice_clone_prompt`). `prompt_cache_key` has the same meaning
+        as in `generate` and lets the prefill reuse the model's prompt cache.
+
+        Returns:
+            The request id, generated when `request_id` is None.
+        """
+        if request_id is None:
+            request_id = next(self._request_counter)
+        request = _TalkerRequest(
+            request_id=request_id,
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            language=language,
+            speaker=speaker,
+            non_streaming_mode=non_streaming_mode,
+            max_new_tokens=max_new_tokens if max_new_tokens is not None else self.generate_kwargs["max_new_tokens"],
+            prompt_cache_key=prompt_cache_key,
+        )
+        with self._lock:
+            self._waiting.append(request)
+        return request_id
+
+    def abort_request(self, request_id: Any):
+        """Drop a waiting or running request at the next step. No output is produced for it."""
+        with self._lock:
+            self._aborted.add(request_id)
+
+    def has_unfinished_requests(self) -> bool:
+        with self._lock:
+            return len(self._waiting) > 0 or len(self._running) > 0
+
+    def num_running(self) -> int:
+        return len(self._running)
+
+    def num_waiting(self) -> int:
+        with self._lock:
+            return len(self._waiting)
+
+    def _process_logits(self, logits: torch.Tensor, num_tokens: torch.Tensor, seen_tokens: torch.Tensor) -> torch.Tensor:
+        # Same processors as `generate`: repetition penalty over the generated tokens, suppressed special
+        # tokens and no EOS before `min_new_tokens`, applied per row.
+        penalty = self.generate_kwargs["repetition_penalty"]
+        if penalty != 1.0:
+            penalized = torch.where(logits < 0, logits * penalty, logits / penalty)
+            logits = torch.where(seen_tokens, penalized, logits)
+        logits = logits.masked_fill(self.suppress_mask, -float("inf"))
+        ban_eos = num_tokens < self.generate_kwargs["min_new_tokens"]
+        logits[:, self.eos_token_id] = torch.where(
+            ban_eos, torch.full_like(logits[:, self.eos_token_id], -float("inf")), logits[:, self.eos_token_id]
+        )
+        return sample_next_token(
+            logits,
+            do_sample=self.generate_kwargs["do_sample"],
+            top_k=self.generate_kwargs["top_k"],
+            top_p=self.generate_kwargs["top_p"],
+            temperature=self.generate_kwargs["temperature"],
+        )
+
+    def _prefill(self, request: _TalkerRequest):
+        """Run the prompt of one request and sample its first token. Returns its per-row batch state."""
+        talker_input_embeds, attention_mask, trailing_text_hiddens, tts_pad_embed = self.model._build_talker_inputs(
+            input_ids=[request.input_ids],
+            instruct_ids=[request.instruct_ids],
+            ref_ids=[request.ref_ids],
+            voice_clone_prompt=request.voice_clone_prompt,
+            languages=[request.language],
+            speakers=[request.speaker],
+            non_streaming_mode=request.non_streaming_mode,
+        )
+        self._tts_pad_embed = tts_pad_embed
+        position_ids, _ = self.talker.get_rope_index(attention_mask)
+
+        cache_key = self.model._get_prompt_cache_key(
+            request.prompt_cache_key,
+            [request.input_ids],
+            [request.instruct_ids],
+            [request.language],
+            [request.speaker],
+            request.non_streaming_mode,
+        )
+        past_key_values, prefix_length = None, 0
+        if cache_key is not None:
+            past_key_values, prefix_length = self.model.prompt_cache.lookup(cache_key, talker_input_embeds)
+        if past_key_values is None:
+            past_key_values = DynamicCache()
+        prompt_length = talker_input_embeds.shape[1]
+        outputs = self.talker.model(
+            inputs_embeds=talker_input_embeds[:, prefix_length:],
+            attention_mask=attention_mask,
+            position_ids=position_ids[..., prefix_length:],
+            past_key_values=past_key_values,
+            use_cache=True,
+            cache_position=torch.arange(prefix_length, prompt_length, device=talker_input_embeds.device),
+        )
+        if cache_key is not None:
+            self.model.prompt_cache.update(cache_key, talker_input_embeds, past_key_values)
+        past_hidden = outputs.last_hidden_state[:, -1:, :]
+        logits = self.talker.codec_head(past_hidden[:, -1, :]).float()
+        seen_tokens = torch.zeros_like(logits, dtype=torch.bool)
+        num_tokens = torch.zeros(1, dtype=torch.long, device=logits.device)
+        next_token = self._process_logits(logits, num_tokens, seen_tokens)
+        seen_tokens[0, next_token] = True
+
+        request.trailing_text_hidden = trailing_text_hiddens[0]
+        request.generation_step = 0
+        request.num_tokens = 1
+        return {
+            "past_key_values": past_key_values,
+            "attention_mask": attention_mask,
+            "last_tokens": next_token.view(1, 1),
+            "past_hidden": past_hidden,
+            "positions": attention_mask.sum(dim=-1),
+            "seen_tokens": seen_tokens,
+        }
+
+    def _merge(self, state: Dict[str, Any]):
+        """Append a prefilled row to the running batch, left-padding whichever side is shorter."""
+        if self._past_key_values is None:
+            self._past_key_values = state["past_key_values"]
+            self._attention_mask = state["attention_mask"]
+            self._last_tokens = state["last_tokens"]
+            self._past_hidden = state["past_hidden"]
+            self._positions = state["positions"]
+            self._seen_tokens = state["seen_tokens"]
+            return
+
+        def _left_pad(x: torch.Tensor, length: int, dim: int) -> torch.Tensor:
+            if x.shape[dim] == length:
+                return x
+            pad_shape = list(x.shape)
+            pad_shape[dim] = length - x.shape[dim]
+            return torch.cat([x.new_zeros(pad_shape), x], dim=dim)
+
+        length = max(self._attention_mask.shape[1], state["attention_mask"].shape[1])
+        self._attention_mask = torch.cat(
+            [_left_pad(self._attention_mask, length, 1), _left_pad(state["attention_mask"], length, 1)], dim=0
+        )
+        merged = []
+        for batch_layer, new_layer in zip(self._past_key_values.layers, state["past_key_values"].layers):
+            merged.append((
+                torch.cat([_left_pad(batch_layer.keys, length, -2), _left_pad(new_layer.keys, length, -2)], dim=0),
+                torch.cat([_left_pad(batch_layer.values, length, -2), _left_pad(new_layer.values, length, -2)], dim=0),
+            ))
+        self._past_key_values = DynamicCache(ddp_cache_data=merged)
+        self._last_tokens = torch.cat([self._last_tokens, state["last_tokens"]], dim=0)
+        self._past_hidden = torch.cat([self._past_hidden, state["past_hidden"]], dim=0)
+        self._positions = torch.cat([self._positions, state["positions"]], dim=0)
+        self._seen_tokens = torch.cat([self._seen_tokens, state["seen_tokens"]], dim=0)
+
+    def _evict(self, keep: List[int]):
+        """Keep only the rows in `keep` and drop KV/mask columns that are padding for every remaining row."""
+        if len(keep) == len(self._running):
+            return
+        self._running = [self._running[i] for i in keep]
+        if not keep:
+            self._reset_batch()
+            return
+        index = torch.tensor(keep, dtype=torch.long, device=self._attention_mask.device)
+        attention_mask = self._attention_mask[index]
+        start = int(attention_mask.any(dim=0).long().argmax())
+        self._attention_mask = attention_mask[:, start:]
+        for layer in self._past_key_values.layers:
+            layer.keys = layer.keys[index, :, start:]
+            layer.values = layer.values[index, :, start:]
+        self._last_tokens = self._last_tokens[index]
+        self._past_hidden = self._past_hidden[index]
+        self._positions = self._positions[index]
+        self._seen_tokens = self._seen_tokens[index]
+
+    def _is_finished(self, request: _TalkerRequest, token: int) -> bool:
+        return token == self.eos_token_id or request.num_tokens >= request.max_new_tokens
+
+    def _finish(self, request: _TalkerRequest) -> Qwen3TTSSchedulerOutput:
+        num_code_groups = self.talker.config.num_code_groups
+        if request.frames:
+            codes = torch.stack(request.frames, dim=0)
+        else:
+            codes = torch.zeros(0, num_code_groups, dtype=torch.long, device=self.talker.device)
+        return Qwen3TTSSchedulerOutput(request_id=request.request_id, codec_ids=None, finished=True, codes=codes)
+
+    def _admit(self) -> List[Qwen3TTSSchedulerOutput]:
+        outputs = []
+        with self._lock:
+            aborted = self._aborted
+            self._aborted = set()
+            if aborted:
+                self._waiting = deque(r for r in self._waiting if r.request_id not in aborted)
+        if aborted:
+            self._evict([i for i, r in enumerate(self._running) if r.request_id not in aborted])
+
+        while len(self._running) < self.max_batch_size:
+            with self._lock:
+                if not self._waiting:
+                    break
+                request = self._waiting.popleft()
+            state = self._prefill(request)
+            if self._is_finished(request, int(state["last_tokens"])):
+                outputs.append(self._finish(request))
+                continue
+            self._merge(state)
+            self._running.append(request)
+        return outputs
+
+    @torch.no_grad()
+    def step(self) -> List[Qwen3TTSSchedulerOutput]:
+        """
+        Admit waiting requests into free slots, then run one talker + sub-talker decoding step for every
+        running row.
+
+        Returns:
+            One output per running request with the frame completed during this step, followed by a
+            `finished=True` output (carrying all of its codes) for every request that ended.
+        """
+        outputs = self._admit()
+        if not self._running:
+            return outputs
+
+        talker = self.talker
+        kwargs = self.generate_kwargs
+        last_id_hidden = talker.get_input_embeddings()(self._last_tokens)
+        predictor_codes = talker.code_predictor.generate_codes(
+            inputs_embeds=torch.cat((self._past_hidden, last_id_hidden), dim=1),
+            do_sample=kwargs["subtalker_dosample"],
+            top_p=kwargs["subtalker_top_p"],
+            top_k=kwargs["subtalker_top_k"],
+            temperature=kwargs["subtalker_temperature"],
+            cache_implementation=kwargs.get("subtalker_cache_implementation"),
+        )
+        codec_ids = torch.cat((self._last_tokens, predictor_codes), dim=-1)
+        codec_hiddens = torch.cat(
+            [last_id_hidden]
+            + [talker.code_predictor.get_input_embeddings()[i](predictor_codes[..., i:i+1]) for i in range(talker.config.num_code_groups - 1)],
+            dim=1,
+        )
+        inputs_embeds = codec_hiddens.sum(1, keepdim=True)
+        text_hiddens = []
+        for request in self._running:
+            if request.generation_step < request.trailing_text_hidden.shape[0]:
+                text_hiddens.append(request.trailing_text_hidden[request.generation_step])
+            else:
+                text_hiddens.append(self._tts_pad_embed.view(-1))
+        inputs_embeds = inputs_embeds + torch.stack(text_hiddens, dim=0).unsqueeze(1)
+
+        batch_size, cache_length = self._attention_mask.shape
+        attention_mask = torch.cat([self._attention_mask, self._attention_mask.new_ones(batch_size, 1)], dim=1)
+        position_ids = self._positions.view(1, -1, 1).expand(3, -1, -1)
+        talker_outputs = talker.model(
+            inputs_embeds=inputs_embeds,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=self._past_key_values,
+            use_cache=True,
+            cache_position=torch.tensor([cache_length], device=inputs_embeds.device),
+        )
+        past_hidden = talker_outputs.last_hidden_state[:, -1:, :]
+        logits = talker.codec_head(past_hidden[:, -1, :]).float()
+        num_tokens = torch.tensor([r.num_tokens for r in self._running], device=logits.device)
+        next_tokens = self._process_logits(logits, num_tokens, self._seen_tokens)
+
+        self._attention_mask = attention_mask
+        self._past_hidden = past_hidden
+        self._positions = self._positions + 1
+        self._last_tokens = next_tokens.unsqueeze(1)
+        self._seen_tokens[torch.arange(batch_size, device=logits.device), next_tokens] = True
+
+        keep, finished = [], []
+        for i, (request, token) in enumerate(zip(self._running, next_tokens.tolist())):
+            request.frames.append(codec_ids[i])
+            request.generation_step += 1
+            request.num_tokens += 1
+            outputs.append(Qwen3TTSSchedulerOutput(request_id=request.request_id, codec_ids=codec_ids[i]))
+            if self._is_finished(request, token):
+                finished.append(request)
+            else:
+                keep.append(i)
+        self._evict(keep)
+        outputs.extend(self._finish(request) for request in finished)
+        return outputs
+
+    def run_until_complete(self) -> Dict[Any, torch.Tensor]:
+        """Drive `step` until every queued request has finished. Returns `{request_id: codes (T, Q)}`."""
+        results = {}
+        while self.has_unfinished_requests():
+            for output in self.step():
+                if output.finished:
+                    results[output.request_id] = output.codes
+        return results
@@ -14,12 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import hashlib
 import io
+import os
+import threading
 import urllib.request
+import weakref
 from typing import List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import librosa
 import numpy as np
 import soundfile as sf
 import torch
@@ -32,6 +35,8 @@ from ..core import (
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2Model,
 )
+from ..core.audio_io import DEFAULT_AUDIO_LOAD_WORKERS, map_in_threads, read_audio_file
+from ..core.resampler import resample_batch
 
 AudioInput = Union[
     str,  # wav path, or base64 string
@@ -41,6 +46,45 @@ AudioInput = Union[
 ]
 
 
+# Process-wide tokenizer instances of `from_pretrained_shared`, dropped once no model holds them anymore.
+_SHARED_TOKENIZERS: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_SHARED_TOKENIZERS_LOCK = threading.Lock()
+# Per-key load locks, alive only while a `from_pretrained_shared` call for that key holds or waits on them.
+_SHARED_TOKENIZER_LOAD_LOCKS: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+
+
+# sha256 of file contents, keyed by (realpath, size, mtime_ns), so a checkpoint is read in full only once.
+_FILE_DIGESTS = {}
+
+
+def _file_digest(path: str, chunk_bytes: int = 1 << 20) -> str:
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _FILE_DIGESTS.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_bytes), b""):
+                sha.update(chunk)
+        digest = _FILE_DIGESTS[key] = sha.hexdigest()
+    return digest
+
+
+def _directory_fingerprint(path: str) -> str:
+    """
+    Content identity of a checkpoint directory: relative names and full-content hashes of every file. Copies of
+    the same tokenizer in different checkpoint folders get the same fingerprint, checkpoints differing anywhere
+    in their weights do not.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(f"{os.path.relpath(file_path, path)}:{_file_digest(file_path)}".encode())
+    return digest.hexdigest()
+
+
 class Qwen3TTSTokenizer:
     """
     A wrapper for Qwen3 TTS Tokenizer 25Hz/12Hz with HuggingFace-style loading.
@@ -59,6 +103,8 @@ class Qwen3TTSTokenizer:
         self.feature_extractor = None
         self.config = None
         self.device = None
+        # Number of threads used to read audio files concurrently in `encode`.
+        self.audio_load_workers = DEFAULT_AUDIO_LOAD_WORKERS
 
     @classmethod
     def from_pretrained(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
@@ -98,6 +144,56 @@ class Qwen3TTSTokenizer:
 
         return inst
 
+    @classmethod
+    def from_pretrained_shared(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
+        """
+        Like `from_pretrained`, but return the instance already loaded in this process for the same tokenizer,
+        dtype and device, so several TTS checkpoints that ship the same speech tokenizer hold it once. Local
+        directories are resolved and identified by `_directory_fingerprint`, so identical copies inside different
+        checkpoint folders are shared too; hub ids are keyed by name.
+
+        Concurrent calls with the same key wait for a single load. Instances are held weakly and freed together
+        with the last model using them. A cached instance that was moved to another device type (e.g. offloaded
+        to CPU) is moved back to the requested device.
+
+        Args:
+            pretrained_model_name_or_path (str):
+                HuggingFace repo id or local directory.
+            **kwargs (Any):
+                Forwarded to `from_pretrained(...)`.
+
+        Returns:
+            Qwen3TTSTokenizer:
+                Shared instance.
+        """
+        path = pretrained_model_name_or_path
+        if os.path.isdir(path):
+            path = _directory_fingerprint(os.path.realpath(path))
+        device_map = kwargs.get("device_map")
+        key = (path, str(kwargs.get("dtype", kwargs.get("torch_dtype"))), str(device_map))
+
+        with _SHARED_TOKENIZERS_LOCK:
+            load_lock = _SHARED_TOKENIZER_LOAD_LOCKS.setdefault(key, threading.Lock())
+        with load_lock:
+            inst = _SHARED_TOKENIZERS.get(key)
+            if inst is None:
+                inst = cls.from_pretrained(pretrained_model_name_or_path, **kwargs)
+                _SHARED_TOKENIZERS[key] = inst
+            elif isinstance(device_map, (str, torch.device)) and torch.device(device_map).type != inst.device.type:
+                inst.model.to(device_map)
+                inst.device = torch.device(device_map)
+        return inst
+
+    def unshare(self):
+        """
+        Remove this instance from the `from_pretrained_shared` cache, so later loads get a fresh copy instead. Call it
+        before modifying the model in place (e.g. quantizing its decoder); models already holding it keep using it.
+        """
+        with _SHARED_TOKENIZERS_LOCK:
+            for key, inst in list(_SHARED_TOKENIZERS.items()):
+                if inst is self:
+                    del _SHARED_TOKENIZERS[key]
+
     def _is_probably_base64(self, s: str) -> bool:
         if s.startswith("data:audio"):
             return True
@@ -137,6 +233,12 @@ class Qwen3TTSTokenizer:
             np.ndarray:
                 1-D float32 waveform at target_sr.
         """
+        audio, sr = self._load_audio_to_np(x)
+        if sr != target_sr:
+            audio = resample_batch([audio], sr, target_sr, device=self.device)[0]
+        return audio
+
+    def _load_audio_to_np(self, x: str) -> Tuple[np.ndarray, int]:
         if self._is_url(x):
             with urllib.request.urlopen(x) as resp:
                 audio_bytes = resp.read()
@@ -147,15 +249,12 @@ class Qwen3TTSTokenizer:
             with io.BytesIO(wav_bytes) as f:
                 audio, sr = sf.read(f, dtype="float32", always_2d=False)
         else:
-            audio, sr = librosa.load(x, sr=None, mono=True)
+            audio, sr = read_audio_file(x)
 
         if audio.ndim > 1:
             audio = np.mean(audio, axis=-1)
 
-        if sr != target_sr:
-            audio = librosa.resample(y=audio, orig_sr=sr, target_sr=target_sr)
-
-        return audio.astype(np.float32)
+        return audio.astype(np.float32), int(sr)
 
     def _normalize_audio_inputs(
         self,
@@ -187,8 +286,9 @@ class Qwen3TTSTokenizer:
             return []
 
         if isinstance(audios[0], str):
-            # wav path list or base64 list
-            return [self.load_audio(x, target_sr=target_sr) for x in audios]  # type: ignore[arg-type]
+            # wav path list or base64 list, decoded concurrently and resampled as one batch
+            loaded = map_in_threads(self._load_audio_to_np, audios, self.audio_load_workers)  # type: ignore[arg-type]
+            return resample_batch([a for a, _ in loaded], [s for _, s in loaded], target_sr, device=self.device)
 
         # numpy list
         if sr is None:
@@ -200,10 +300,8 @@ class Qwen3TTSTokenizer:
                 raise TypeError("Mixed input types are not supported. Use all paths/base64 or all numpy arrays.")
             if a.ndim > 1:
                 a = np.mean(a, axis=-1)
-            if int(sr) != target_sr:
-                a = librosa.resample(y=a.astype(np.float32), orig_sr=int(sr), target_sr=target_sr)
             out.append(a.astype(np.float32))
-        return out
+        return resample_batch(out, int(sr), target_sr, device=self.device)
 
     def encode(
         self,
@@ -259,6 +357,8 @@ class Qwen3TTSTokenizer:
     def decode(
         self,
         encoded,
+        max_batch_frames: int = 4096,
+        **kwargs,
     ) -> Tuple[List[np.ndarray], int]:
         """
         Decode back to waveform.
@@ -272,11 +372,21 @@ class Qwen3TTSTokenizer:
            - 12Hz dict keys: {"audio_codes"}
            Values can be torch tensors or numpy arrays.
 
+        Samples are decoded in batches of similar length (see `max_batch_frames`) and each output is cut to the
+        exact number of frames of its codes. A single already padded codes tensor carries no lengths, so
+        for it the non-zero frames of the first codebook are counted instead.
+
         Args:
             encoded (Any):
                 - ModelOutput returned by `encode()`, OR
                 - dict, OR
                 - list[dict]
+            max_batch_frames (int, default=4096):
+                Maximum number of padded code frames (batch size x longest sample) per decoder forward pass.
+            kwargs:
+                25Hz only: options of the DiT flow-matching sampler for this call, e.g. `num_steps`, `solver`
+                ("euler" / "midpoint" / "rk4" / "adaptive") or `guidance_stop_time`. See
+                `Qwen3TTSTokenizerV1DecoderDiTModel.sample`.
 
         Returns:
             Tuple[List[np.ndarray], int]:
@@ -312,57 +422,83 @@ class Qwen3TTSTokenizer:
         else:
             raise TypeError("`encoded` must be an encode output, a dict, or a list of dicts.")
 
-        # Ensure list form for per-sample tensors
+        is_25hz = model_type == "qwen3_tts_tokenizer_25hz"
+        if not is_25hz and model_type != "qwen3_tts_tokenizer_12hz":
+            raise ValueError(f"Unknown model type: {model_type}")
+        if is_25hz and (xvectors_list is None or ref_mels_list is None):
+            raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
+        if kwargs and not is_25hz:
+            raise ValueError(f"Unexpected decode arguments for the 12Hz tokenizer: {sorted(kwargs)}")
+
+        # Split everything into per-sample tensors with exact frame lengths.
         if isinstance(audio_codes_list, torch.Tensor):
-            # Could be a single sample tensor or an already padded batch tensor.
             t = audio_codes_list
-            if t.dim() == 1:
-                # 25Hz single sample: (C,) -> (1, C)
-                t = t.unsqueeze(0)
-            elif t.dim() == 2:
-                # 12Hz single sample: (C, Q) -> (1, C, Q)
-                t = t.unsqueeze(0)
-            audio_codes_padded = t.to(self.device)
-        else:
-            # List[Tensor/np]
-            audio_codes_list = [_to_tensor(c, dtype=torch.long) for c in audio_codes_list]
-            audio_codes_padded = pad_sequence(audio_codes_list, batch_first=True, padding_value=0).to(self.device)
-
+            if t.dim() == (1 if is_25hz else 2):
+                # single sample: 25Hz (C,) / 12Hz (C, Q)
+                audio_codes_list = [t]
+            else:
+                # An already padded batch does not carry its lengths, count the non-padding frames instead.
+                first_codebook = t if is_25hz else t[..., 0]
+                lengths = (first_codebook > 0).sum(1).tolist()
+                audio_codes_list = [t[i, :length] for i, length in enumerate(lengths)]
+        audio_codes_list = [_to_tensor(c, dtype=torch.long) for c in audio_codes_list]
+        code_lengths = [int(c.shape[0]) for c in audio_codes_list]
+
+        if is_25hz:
+            if isinstance(xvectors_list, torch.Tensor):
+                xvectors_list = xvectors_list.unsqueeze(0) if xvectors_list.dim() == 1 else xvectors_list  # (D,) -> (1, D)
+            xvectors_list = [_to_tensor(x, dtype=torch.float32) for x in xvectors_list]
+            if isinstance(ref_mels_list, torch.Tensor):
+                ref_mels_list = ref_mels_list.unsqueeze(0) if ref_mels_list.dim() == 2 else ref_mels_list  # (T, M) -> (1, T, M)
+            ref_mels_list = [_to_tensor(m, dtype=torch.float32) for m in ref_mels_list]
+
+        wavs: List[Optional[np.ndarray]] = [np.zeros(0, dtype=np.float32) if n == 0 else None for n in code_lengths]
         with torch.inference_mode():
-            if model_type == "qwen3_tts_tokenizer_25hz":
-                if xvectors_list is None or ref_mels_list is None:
-                    raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
-
-                if isinstance(xvectors_list, torch.Tensor):
-                    xvectors_batch = xvectors_list
-                    if xvectors_batch.dim() == 1:  # (D,) -> (1, D)
-                        xvectors_batch = xvectors_batch.unsqueeze(0)
-                    xvectors_batch = xvectors_batch.to(self.device).to(self.model.dtype)
+            for bucket in self._make_decode_buckets(code_lengths, max_batch_frames):
+                audio_codes_padded = pad_sequence(
+                    [audio_codes_list[i] for i in bucket], batch_first=True, padding_value=0
+                ).to(self.device)
+                audio_lengths = torch.tensor([code_lengths[i] for i in bucket], device=self.device)
+                if is_25hz:
+                    xvectors_batch = torch.stack([xvectors_list[i] for i in bucket], dim=0).to(self.device).to(self.model.dtype)
+                    ref_mels_padded = pad_sequence(
+                        [ref_mels_list[i] for i in bucket], batch_first=True, padding_value=0
+                    ).to(self.device).to(self.model.dtype)
+                    dec = self.model.decode(
+                        audio_codes_padded,
+                        xvectors_batch,
+                        ref_mels_padded,
+                        audio_lengths=audio_lengths,
+                        return_dict=True,
+                        **kwargs,
+                    )
                 else:
-                    xvectors_list = [_to_tensor(x, dtype=torch.float32) for x in xvectors_list]
-                    xvectors_batch = torch.stack(xvectors_list, dim=0).to(self.device).to(self.model.dtype)
-
-                if isinstance(ref_mels_list, torch.Tensor):
-                    ref_mels_padded = ref_mels_list
-                    if ref_mels_padded.dim() == 2:  # (T, M) -> (1, T, M)
-                        ref_mels_padded = ref_mels_padded.unsqueeze(0)
-                    ref_mels_padded = ref_mels_padded.to(self.device).to(self.model.dtype)
-                else:
-                    ref_mels_list = [_to_tensor(m, dtype=torch.float32) for m in ref_mels_list]
-                    ref_mels_padded = pad_sequence(ref_mels_list, batch_first=True, padding_value=0).to(self.device).to(self.model.dtype)
-
-                dec = self.model.decode(audio_codes_padded, xvectors_batch, ref_mels_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+                    dec = self.model.decode(audio_codes_padded, audio_lengths=audio_lengths, return_dict=True)
+                for i, w in zip(bucket, dec.audio_values):
+                    wavs[i] = w.to(torch.float32).detach().cpu().numpy()
 
-            elif model_type == "qwen3_tts_tokenizer_12hz":
-                dec = self.model.decode(audio_codes_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+        return wavs, int(self.model.get_output_sample_rate())
 
-            else:
-                raise ValueError(f"Unknown model type: {model_type}")
+    @staticmethod
+    def _make_decode_buckets(code_lengths: List[int], max_batch_frames: int) -> List[List[int]]:
+        """
+        Group sample indices into decode batches of similar length.
 
-        wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
-        return wavs, int(self.model.get_output_sample_rate())
+        Samples are sorted by length, and a new batch starts when the padded batch would exceed
+        `max_batch_frames` frames or the next sample is less than half as long as the longest one in the batch.
+        Empty samples are left out.
+        """
+        order = sorted((i for i, n in enumerate(code_lengths) if n > 0), key=lambda i: code_lengths[i], reverse=True)
+        buckets: List[List[int]] = []
+        for i in order:
+            if buckets:
+                bucket = buckets[-1]
+                longest = code_lengths[bucket[0]]
+                if (len(bucket) + 1) * longest <= max_batch_frames and 2 * code_lengths[i] >= longest:
+                    bucket.append(i)
+                    continue
+            buckets.append([i])
+        return buckets
 
     def get_model_type(self) -> str:
         """
@@ -22,12 +22,47 @@ DEFAULT_PATHS = {
 # 默认模型路径（相对于工作空间）
 DEFAULT_MODELS = {
     "base": str(WORKSPACE_ROOT / "Qwen3-TTS" / "Qwen3-TTS-12Hz-1.7B-Base"),
-    "voice_design": str(WORKSPACE_ROOT / "Qwen3-TTS" / "Qwen3-TTS-12Hz-1.7B-VoiceDesign")
+    "voice_design": str(WORKSPACE_ROOT / "Qwen3-TTS" / "Qwen3-TTS-12Hz-1.7B-VoiceDesign"),
+    "custom_voice": str(WORKSPACE_ROOT / "Qwen3-TTS" / "Qwen3-TTS-12Hz-1.7B-CustomVoice")
 }
 
 # 支持的语言
 SUPPORTED_LANGUAGES = ["Chinese", "English", "Japanese", "Korean", "Auto"]
 
+# 长文本分段合成参数
+DEFAULT_SEGMENT = {
+    "max_chars": 200,       # 每段最大字符数
+    "batch_size": 4,        # 每批并行合成的段数
+    "silence_ms": 200,      # 段间静音（毫秒）
+    "crossfade_ms": 20      # 段边缘淡入淡出/交叉混合（毫秒）
+}
+
+# 音色特征缓存
+DEFAULT_VOICE_CACHE = {
+    "max_mb": 256,          # 已加载音色特征的内存上限（MB）
+    "prewarm_count": 3      # 启动时预加载使用次数最多的音色数量
+}
+
+# 模型内存预算（超出时淘汰最久未使用的模型）
+DEFAULT_MODEL_CACHE = {
+    "max_device_mb": 0,         # 设备上所有模型的总上限（MB），0 表示 GPU 总显存的 80% / CPU 物理内存的 50%
+    "max_offload_mb": 0,        # 从 GPU 移到内存暂存的模型总上限（MB），0 表示不限
+    "offload_to_cpu": True      # GPU 上被淘汰的模型移到内存，再次使用时搬回，而不是重新加载
+}
+
+# CPU 推理线程与核心绑定（首次加载模型时生效，多路 CPU 服务器上避免线程过多和跨 NUMA 节点）
+DEFAULT_CPU_THREADS = {
+    "num_threads": 0,           # PyTorch 算子内线程数，0 表示绑定核心数（未绑定时用 PyTorch 默认值）
+    "num_interop_threads": 0,   # PyTorch 算子间线程数，0 表示默认
+    "ort_threads": 0,           # ONNX Runtime 线程数（25Hz tokenizer 的 x-vector 提取），0 表示 1
+    "cpus": "",                 # 绑定的核心，如 "0-15,32-47"，空表示不绑定
+    "numa_node": -1             # 绑定到该 NUMA 节点的核心，-1 表示不绑定
+}
+
+# 文本长度上限（分段合成时放宽）
+MAX_TEXT_LENGTH = 5000
+MAX_SEGMENTED_TEXT_LENGTH = 200000
+
 # 窗口默认大小
 DEFAULT_WINDOW_SIZE = {
     "width": 1000,
@@ -2,7 +2,10 @@
 """配置管理"""
 import json
 from pathlib import Path
-from .constants import DEFAULT_PATHS, DEFAULT_MODELS, DEFAULT_WINDOW_SIZE
+from .constants import (
+    DEFAULT_PATHS, DEFAULT_MODELS, DEFAULT_WINDOW_SIZE, DEFAULT_SEGMENT, DEFAULT_VOICE_CACHE, DEFAULT_MODEL_CACHE,
+    DEFAULT_CPU_THREADS
+)
 
 class Settings:
     """设置管理类"""
@@ -17,8 +20,14 @@ class Settings:
             "defaults": {
                 "language": "Chinese",
                 "device": "cuda:0",
-                "use_flash_attention": True
+                "use_flash_attention": True,
+                "preload_model": "base",
+                "cpu_quantization": "none"
             },
+            "segment": DEFAULT_SEGMENT.copy(),
+            "voice_cache": DEFAULT_VOICE_CACHE.copy(),
+            "model_cache": DEFAULT_MODEL_CACHE.copy(),
+            "cpu_threads": DEFAULT_CPU_THREADS.copy(),
             "ui": DEFAULT_WINDOW_SIZE.copy()
         }
         
@@ -1,161 +1,511 @@
 # coding=utf-8
 """模型加载器（单例模式）"""
-import torch
+import gc
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 
 # 添加工作空间路径
 WORKSPACE_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(WORKSPACE_ROOT / "Qwen3-TTS"))
 
-from qwen_tts import Qwen3TTSModel
+MODEL_NAMES = {
+    "base": "Base",
+    "voice_design": "VoiceDesign",
+    "custom_voice": "CustomVoice",
+}
+
+class _ModelEntry:
+    """已登记的模型：显存/内存占用（参数 + buffer 实测字节数）与当前位置"""
+
+    def __init__(self, kind, model_path, model, device, requested_device):
+        self.kind = kind
+        self.model_path = model_path
+        self.model = model
+        self.device = device                  # 实际使用的设备
+        self.requested_device = requested_device
+        self.nbytes = _measure_bytes(model.model)
+        # 使用相同 speech tokenizer 的模型共享同一个实例，单独计量
+        self.tokenizer = getattr(model.model, "speech_tokenizer", None)
+        tokenizer_model = getattr(self.tokenizer, "model", None)
+        self.tokenizer_nbytes = _measure_bytes(tokenizer_model) if tokenizer_model is not None else 0
+        self.offloaded = False                # 被淘汰后暂存在 CPU 内存
+
+def _measure_bytes(module):
+    """参数与 buffer 的实际字节数（共享存储只计一次）"""
+    seen = set()
+    nbytes = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        if tensor.data_ptr() in seen:
+            continue
+        seen.add(tensor.data_ptr())
+        nbytes += tensor.numel() * tensor.element_size()
+    for submodule in module.modules():
+        # 动态 int8 量化的 Linear 把权重打包保存，不在参数和 buffer 中
+        if hasattr(submodule, "_packed_params"):
+            for tensor in submodule._weight_bias():
+                if tensor is not None:
+                    nbytes += tensor.numel() * tensor.element_size()
+    return nbytes
+
+def _physical_memory_bytes():
+    """物理内存总量（字节），无法获取时返回 None"""
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+
+        class _MemoryStatusEx(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = _MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+    return None
+
+def _total_bytes(entries):
+    """模型自身占用加上它们用到的 speech tokenizer（共享实例只计一次）"""
+    tokenizers = {id(e.tokenizer): e.tokenizer_nbytes for e in entries if e.tokenizer is not None}
+    return sum(e.nbytes for e in entries) + sum(tokenizers.values())
 
 class ModelLoader:
-    """模型加载器（单例模式）"""
+    """模型加载器（单例模式）
+
+    torch 与 qwen_tts 在首次加载模型时才导入，窗口可以立即显示。
+    同一模型同时只有一次加载：并发请求共享同一个进行中的 Future，等待同一次加载完成。
+
+    已加载的模型按 (类型, 路径) 登记在 LRU 表中，并记录实测的参数和 buffer 字节数。
+    加载或恢复模型前，如果设备预算不足，会淘汰最久未使用的模型：
+    在 GPU 上且 offload_to_cpu 开启时移到 CPU 内存，之后再次使用时搬回；否则直接释放，需要时重新加载。
+    某个线程最近一次获取的模型在该线程结束前不会被淘汰，正在生成的任务不受影响。
+    """
     _instance = None
-    _base_model = None
-    _voice_design_model = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ModelLoader, cls).__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.initialized = True
             self.base_model_path = None
             self.voice_design_model_path = None
+            self.custom_voice_model_path = None
             self.device = "cuda:0"
             self.use_flash_attention = True
-    
+            self.cpu_quantization = None      # CPU 推理时 Linear 层的量化：None / "int8" / "bf16" / "auto"
+            self.max_device_bytes = 0         # 0：GPU 取总显存的 80%，CPU 取物理内存的 50%
+            self.max_offload_bytes = 0        # 0：不限
+            self.offload_to_cpu = True
+            self.cpu_threads = None           # set_cpu_threads 的配置，首次加载模型前生效一次
+            self._lock = threading.Lock()
+            self._load_lock = threading.Lock()  # 加载/搬运串行进行，预算核算不会相互穿插
+            self._models = OrderedDict()        # (kind, model_path) -> _ModelEntry，按最近使用排序
+            self._loading = {}                  # (kind, model_path) -> (Future, device)
+            self._pins = {}                     # thread -> (kind, model_path)
+            self._progress_listeners = []
+
+    def set_memory_budget(self, max_device_mb=0, max_offload_mb=0, offload_to_cpu=True):
+        """
+        设置模型内存预算
+
+        Args:
+            max_device_mb: 模型所在设备（GPU 或 CPU）上所有模型的总上限，0 表示 GPU 总显存的 80% / CPU 物理内存的 50%
+            max_offload_mb: 淘汰后暂存在 CPU 内存中的模型总上限，0 表示不限
+            offload_to_cpu: GPU 上被淘汰的模型是否移到 CPU 内存（否则直接释放）
+        """
+        self.max_device_bytes = int(max_device_mb * 1024 * 1024)
+        self.max_offload_bytes = int(max_offload_mb * 1024 * 1024)
+        self.offload_to_cpu = offload_to_cpu
+
+    def set_cpu_threads(self, num_threads=0, num_interop_threads=0, ort_threads=0, cpus="", numa_node=-1):
+        """
+        设置 CPU 推理线程与核心绑定，在首次加载模型前生效（之后修改需重启程序）
+
+        Args:
+            num_threads: PyTorch 算子内线程数，0 表示绑定核心数（未绑定时用 PyTorch 默认值）
+            num_interop_threads: PyTorch 算子间线程数，0 表示默认
+            ort_threads: ONNX Runtime 线程数，0 表示 1
+            cpus: 绑定的核心，如 "0-15,32-47"，空表示不绑定
+            numa_node: 绑定到该 NUMA 节点的核心，-1 表示不绑定
+        """
+        config = dict(
+            num_threads=num_threads or None,
+            num_interop_threads=num_interop_threads or None,
+            ort_num_threads=ort_threads or None,
+            cpus=cpus or None,
+            numa_node=numa_node if numa_node is not None and numa_node >= 0 else None,
+        )
+        self.cpu_threads = config if any(v is not None for v in config.values()) else None
+
+    def _apply_cpu_threads(self):
+        if self.cpu_threads is None:
+            return
+        from qwen_tts.core.cpu_threads import configure_cpu_threads
+
+        config, self.cpu_threads = self.cpu_threads, None
+        try:
+            print(f"✓ CPU 线程设置: {configure_cpu_threads(**config)}")
+        except (ValueError, OSError) as e:
+            print(f"⚠ CPU 线程设置无效，使用默认设置: {e}")
+
+    def add_progress_listener(self, callback):
+        """注册加载进度回调 callback(kind, message)，在加载线程中调用"""
+        self._progress_listeners.append(callback)
+
+    def _publish(self, kind, message):
+        print(message)
+        for callback in list(self._progress_listeners):
+            try:
+                callback(kind, message)
+            except Exception:
+                pass
+
+    def is_loaded(self, kind="base"):
+        """该类型是否有模型在设备上"""
+        with self._lock:
+            return any(e.kind == kind and not e.offloaded for e in self._models.values())
+
+    def is_loading(self, kind="base"):
+        """该类型是否有模型正在加载"""
+        with self._lock:
+            return any(key[0] == kind for key in self._loading)
+
+    def memory_usage(self):
+        """
+        已登记模型的占用
+
+        Returns:
+            list: [(kind, model_path, device, nbytes, offloaded)]，按最近使用排序（最久未使用在前）；
+                nbytes 含 speech tokenizer，多个模型共享时各自都计入
+        """
+        with self._lock:
+            return [
+                (e.kind, e.model_path, e.device, e.nbytes + e.tokenizer_nbytes, e.offloaded)
+                for e in self._models.values()
+            ]
+
+    def preload(self, kind="base"):
+        """
+        在后台线程预加载默认模型
+
+        Args:
+            kind: "base"、"voice_design" 或 "custom_voice"
+
+        Returns:
+            future: 加载完成后返回模型；之后的 get_*_model 调用会等待同一次加载
+        """
+        future = Future()
+
+        def _run():
+            try:
+                future.set_result(self._get_model(kind, None, None, None))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_run, name=f"preload-{kind}", daemon=True).start()
+        return future
+
     def get_base_model(self, model_path=None, device=None, use_flash_attention=None):
         """获取Base模型"""
+        return self._get_model("base", model_path, device, use_flash_attention)
+
+    def get_voice_design_model(self, model_path=None, device=None, use_flash_attention=None):
+        """获取VoiceDesign模型"""
+        return self._get_model("voice_design", model_path, device, use_flash_attention)
+
+    def get_custom_voice_model(self, model_path=None, device=None, use_flash_attention=None):
+        """获取CustomVoice模型"""
+        return self._get_model("custom_voice", model_path, device, use_flash_attention)
+
+    def _get_model(self, kind, model_path, device, use_flash_attention):
         if model_path is None:
             from config.constants import DEFAULT_MODELS
-            model_path = DEFAULT_MODELS["base"]
-        
+            model_path = DEFAULT_MODELS[kind]
+
         if device is None:
             device = self.device
-        
+
         if use_flash_attention is None:
             use_flash_attention = self.use_flash_attention
-        
-        # 如果模型已加载且路径相同，直接返回
-        if (self._base_model is not None and 
-            self.base_model_path == model_path and
-            self.device == device):
-            return self._base_model
-        
-        # 检测设备
-        if device.startswith("cuda") and not torch.cuda.is_available():
-            print("⚠ CUDA 不可用，切换到 CPU")
-            device = "cpu"
-        
-        # 检测 FlashAttention
-        attn_implementation = None
-        if use_flash_attention and device != "cpu":
+
+        key = (kind, model_path)
+        while True:
+            with self._lock:
+                # 如果模型已加载且在设备上，直接返回
+                entry = self._models.get(key)
+                if entry is not None and device not in (entry.device, entry.requested_device):
+                    entry = None
+                if entry is not None and not entry.offloaded:
+                    return self._use(key, entry)
+
+                in_flight = self._loading.get(key)
+                if in_flight is None:
+                    future = Future()
+                    self._loading[key] = (future, device)
+                    break
+
+            # 已有加载在进行：等待它完成；设备相同则直接复用结果，否则重新检查
+            future, loading_device = in_flight
             try:
-                import flash_attn
-                attn_implementation = "flash_attention_2"
-                print("✓ 使用 FlashAttention 2")
-            except ImportError:
-                print("⚠ FlashAttention 未安装，使用默认实现")
-                attn_implementation = "eager"
-        else:
-            attn_implementation = "eager"
-        
-        # 设置 dtype
-        dtype = torch.bfloat16 if device != "cpu" else torch.float32
-        
-        # 确保路径是绝对路径且存在
-        model_path_obj = Path(model_path).resolve()
-        if not model_path_obj.exists():
-            raise FileNotFoundError(f"模型路径不存在: {model_path_obj}")
-        
-        # 转换为字符串，使用正斜杠（HuggingFace 可能更兼容）
-        model_path_str = str(model_path_obj).replace('\\', '/')
-        
-        print(f"正在加载Base模型: {model_path_str}")
+                model = future.result()
+            except Exception:
+                if loading_device == device:
+                    raise
+                continue
+            if loading_device == device:
+                with self._lock:
+                    entry = self._models.get(key)
+                    if entry is not None and entry.model is model:
+                        self._use(key, entry)
+                return model
+
         try:
-            self._base_model = Qwen3TTSModel.from_pretrained(
-                model_path_str,
-                device_map=device,
-                dtype=dtype,
-                attn_implementation=attn_implementation,
-            )
-            self.base_model_path = model_path
-            self.device = device
-            print("✓ Base模型加载成功")
-            return self._base_model
-        except Exception as e:
-            print(f"✗ Base模型加载失败: {e}")
+            with self._load_lock:
+                # 等锁期间暂存的模型可能已被释放
+                if entry is not None and self._models.get(key) is entry:
+                    model = self._restore(key, entry)
+                else:
+                    model = self._load(key, model_path, device, use_flash_attention)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            future.set_exception(e)
             raise
-    
-    def get_voice_design_model(self, model_path=None, device=None, use_flash_attention=None):
-        """获取VoiceDesign模型"""
-        if model_path is None:
-            from config.constants import DEFAULT_MODELS
-            model_path = DEFAULT_MODELS["voice_design"]
-        
-        if device is None:
-            device = self.device
-        
-        if use_flash_attention is None:
-            use_flash_attention = self.use_flash_attention
-        
-        # 如果模型已加载且路径相同，直接返回
-        if (self._voice_design_model is not None and 
-            self.voice_design_model_path == model_path and
-            self.device == device):
-            return self._voice_design_model
-        
+        with self._lock:
+            self._loading.pop(key, None)
+        future.set_result(model)
+        return model
+
+    def _use(self, key, entry):
+        """标记最近使用，并把模型固定给当前线程（调用时持有 self._lock）"""
+        self._models.move_to_end(key)
+        for thread in [t for t in self._pins if not t.is_alive()]:
+            del self._pins[thread]
+        self._pins[threading.current_thread()] = key
+        setattr(self, f"{entry.kind}_model_path", entry.model_path)
+        if entry.kind == "base":
+            self.device = entry.device
+        return entry.model
+
+    def _is_pinned(self, key):
+        current = threading.current_thread()
+        return any(k == key and t is not current and t.is_alive() for t, k in self._pins.items())
+
+    def _load(self, key, model_path, device, use_flash_attention):
+        kind = key[0]
+        model, actual_device = self._load_model(kind, model_path, device, use_flash_attention)
+        entry = _ModelEntry(kind, model_path, model, actual_device, device)
+        with self._lock:
+            self._models[key] = entry
+        # 以实测占用再核算一次（加载前只能按权重文件大小估算）
+        self._make_room(0, actual_device, exclude=key)
+        self._publish(kind, f"{MODEL_NAMES[kind]}模型占用 {(entry.nbytes + entry.tokenizer_nbytes) / 1024 ** 2:.0f} MB")
+        with self._lock:
+            return self._use(key, entry)
+
+    def _restore(self, key, entry):
+        """把暂存在 CPU 内存中的模型搬回设备"""
+        name = MODEL_NAMES[entry.kind]
+        nbytes = entry.nbytes
+        if entry.tokenizer is not None and str(entry.tokenizer.device) == "cpu" and entry.device != "cpu":
+            nbytes += entry.tokenizer_nbytes
+        self._make_room(nbytes, entry.device, exclude=key)
+        self._publish(entry.kind, f"正在恢复{name}模型到 {entry.device}...")
+        self._move_model(entry.model, entry.device, move_tokenizer=True)
+        with self._lock:
+            entry.offloaded = False
+            model = self._use(key, entry)
+        self._publish(entry.kind, f"✓ {name}模型已恢复")
+        return model
+
+    def _device_budget(self, device):
+        if self.max_device_bytes > 0:
+            return self.max_device_bytes
+        if device.startswith("cuda"):
+            import torch
+            return int(torch.cuda.get_device_properties(torch.device(device)).total_memory * 0.8)
+        # CPU 上还要留给系统、界面和推理时的中间结果，只取一半；获取不到物理内存时不限
+        total = _physical_memory_bytes()
+        return int(total * 0.5) if total else None
+
+    def _make_room(self, nbytes, device, exclude=None):
+        """淘汰最久未使用的模型，直到设备上已有模型加上 nbytes 不超过预算"""
+        budget = self._device_budget(device)
+        if budget is None:
+            return
+        with self._lock:
+            resident = [(k, e) for k, e in self._models.items() if not e.offloaded and e.device == device]
+            remaining = [e for _, e in resident]
+            victims = []
+            for k, e in resident:
+                if _total_bytes(remaining) + nbytes <= budget:
+                    break
+                if k == exclude or self._is_pinned(k):
+                    continue
+                # 在锁内标记，其他线程不会再拿到正要搬走/释放的模型
+                if self.offload_to_cpu and e.device != "cpu":
+                    e.offloaded = True
+                else:
+                    del self._models[k]
+                victims.append((k, e))
+                remaining.remove(e)
+            used = _total_bytes(remaining)
+            # 仍有模型在用的共享 tokenizer 留在设备上
+            in_use = {id(e.tokenizer) for e in remaining if e.tokenizer is not None}
+            victims = [(k, e, id(e.tokenizer) not in in_use) for k, e in victims]
+        for k, e, move_tokenizer in victims:
+            self._evict(k, e, move_tokenizer)
+        if victims:
+            self._release_memory()
+        if used + nbytes > budget:
+            print(f"⚠ 模型占用 {(used + nbytes) / 1024 ** 2:.0f} MB 超出预算 {budget / 1024 ** 2:.0f} MB（其余模型正在使用）")
+
+    def _evict(self, key, entry, move_tokenizer=True):
+        name = MODEL_NAMES[entry.kind]
+        if entry.offloaded:
+            self._publish(entry.kind, f"{name}模型移至内存以腾出显存")
+            self._move_model(entry.model, "cpu", move_tokenizer=move_tokenizer)
+            self._trim_offloaded()
+        else:
+            self._publish(entry.kind, f"卸载{name}模型以腾出内存")
+
+    def _trim_offloaded(self):
+        """暂存在 CPU 内存中的模型超过上限时，释放最久未使用的"""
+        if self.max_offload_bytes <= 0:
+            return
+        with self._lock:
+            offloaded = [(k, e) for k, e in self._models.items() if e.offloaded]
+            remaining = [e for _, e in offloaded]
+            for k, e in offloaded:
+                if _total_bytes(remaining) <= self.max_offload_bytes:
+                    break
+                if self._is_pinned(k):
+                    continue
+                del self._models[k]
+                remaining.remove(e)
+
+    @staticmethod
+    def _move_model(model, device, move_tokenizer=True):
+        """搬运模型；move_tokenizer=False 时共享的 speech tokenizer 留在原设备供其他模型使用"""
+        import torch
+        model.model.to(device)
+        speech_tokenizer = getattr(model.model, "speech_tokenizer", None)
+        if move_tokenizer and speech_tokenizer is not None and getattr(speech_tokenizer, "model", None) is not None:
+            speech_tokenizer.model.to(device)
+            speech_tokenizer.device = torch.device(device)
+        model.device = torch.device(device)
+        # 旧设备上缓存的 prefill KV 状态作废
+        if getattr(model.model, "prompt_cache", None) is not None:
+            model.model.enable_prompt_cache()
+
+    @staticmethod
+    def _estimate_bytes(model_path, device):
+        """按权重文件大小估算加载后的占用（CPU 上以 float32 加载，约为 bf16 权重文件的两倍）"""
+        nbytes = sum(
+            f.stat().st_size
+            for pattern in ("*.safetensors", "*.bin")
+            for f in Path(model_path).rglob(pattern)
+        )
+        return nbytes * 2 if device == "cpu" else nbytes
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _load_model(self, kind, model_path, device, use_flash_attention):
+        name = MODEL_NAMES[kind]
+        if "torch" not in sys.modules:
+            self._publish(kind, "正在导入 PyTorch...")
+        import torch
+        from qwen_tts import Qwen3TTSModel
+        from qwen_tts.core.cpu_quantization import resolve_cpu_quantization
+
+        # 在加载权重之前绑定核心，权重内存分配在对应的 NUMA 节点上
+        self._apply_cpu_threads()
+
         # 检测设备
         if device.startswith("cuda") and not torch.cuda.is_available():
             print("⚠ CUDA 不可用，切换到 CPU")
             device = "cpu"
-        
+
         # 检测 FlashAttention
         attn_implementation = None
         if use_flash_attention and device != "cpu":
             try:
                 import flash_attn
                 attn_implementation = "flash_attention_2"
+                print("✓ 使用 FlashAttention 2")
             except ImportError:
+                print("⚠ FlashAttention 未安装，使用默认实现")
                 attn_implementation = "eager"
         else:
             attn_implementation = "eager"
-        
+
         # 设置 dtype
         dtype = torch.bfloat16 if device != "cpu" else torch.float32
-        
+
         # 确保路径是绝对路径且存在
         model_path_obj = Path(model_path).resolve()
         if not model_path_obj.exists():
+            self._publish(kind, f"✗ {name}模型路径不存在")
             raise FileNotFoundError(f"模型路径不存在: {model_path_obj}")
-        
+
+        # 先按权重文件大小腾出空间
+        self._make_room(self._estimate_bytes(model_path_obj, device), device)
+
         # 转换为字符串，使用正斜杠（HuggingFace 可能更兼容）
         model_path_str = str(model_path_obj).replace('\\', '/')
-        
-        print(f"正在加载VoiceDesign模型: {model_path_str}")
+
+        self._publish(kind, f"正在加载{name}模型...")
+        print(f"模型路径: {model_path_str}")
+        start = time.perf_counter()
         try:
-            self._voice_design_model = Qwen3TTSModel.from_pretrained(
+            model = Qwen3TTSModel.from_pretrained(
                 model_path_str,
                 device_map=device,
                 dtype=dtype,
                 attn_implementation=attn_implementation,
             )
-            self.voice_design_model_path = model_path
-            print("✓ VoiceDesign模型加载成功")
-            return self._voice_design_model
         except Exception as e:
-            print(f"✗ VoiceDesign模型加载失败: {e}")
+            self._publish(kind, f"✗ {name}模型加载失败: {e}")
             raise
-    
+
+        quantization = resolve_cpu_quantization(self.cpu_quantization) if device == "cpu" else None
+        if quantization:
+            # 加载后再量化，模型文件不变；auto 在支持 AVX512-BF16 的 CPU 上用 bf16，否则用 int8
+            self._publish(kind, f"正在将{name}模型量化为 {quantization}...")
+            model.model.quantize_for_cpu(quantization)
+        if kind == "base":
+            # 缓存音色提示词的 prefill 结果，同一音色的后续生成只需 prefill 新文本部分
+            model.model.enable_prompt_cache()
+        self._publish(kind, f"✓ {name}模型加载成功 ({time.perf_counter() - start:.1f}s)")
+        return model, device
+
     def unload_models(self):
         """卸载所有模型（释放内存）"""
-        self._base_model = None
-        self._voice_design_model = None
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
+        with self._lock:
+            self._models.clear()
+        self._release_memory()
         print("模型已卸载")
@@ -9,9 +9,9 @@ WORKSPACE_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(WORKSPACE_ROOT / "Qwen3-TTS"))
 sys.path.insert(0, str(WORKSPACE_ROOT / "scripts"))
 
-from qwen_tts import Qwen3TTSModel, VoiceClonePromptItem
 from utils.logger import get_logger
 from utils.file_manager import FileManager
+from utils.voice_cache import get_voice_cache
 
 class VoiceCloneManager:
     """语音克隆管理器"""
@@ -106,6 +106,7 @@ class VoiceCloneManager:
         }
         
         torch.save(payload, output_path)
+        get_voice_cache().invalidate(output_path)
         
         # 保存元数据到JSON
         self.file_manager.save_voice_metadata(voice_name, metadata)
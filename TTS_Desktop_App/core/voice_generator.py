@@ -1,6 +1,7 @@
 # coding=utf-8
 """语音生成器"""
 import sys
+import hashlib
 from pathlib import Path
 from datetime import datetime
 
@@ -12,15 +13,22 @@ sys.path.insert(0, str(WORKSPACE_ROOT / "scripts"))
 from utils.logger import get_logger
 from utils.file_manager import FileManager
 from utils.generation_params import GenerationParams
+from utils.text_utils import split_text
+from utils.voice_cache import get_voice_cache
 
 class VoiceGenerator:
     """语音生成器"""
     
-    def __init__(self, model_loader):
+    def __init__(self, model_loader, settings=None):
         self.model_loader = model_loader
+        self.settings = settings
         self.logger = get_logger()
         self.file_manager = FileManager()
         self.params_manager = GenerationParams()
+        self.voice_cache = get_voice_cache()
+        self._feature_digests = {}  # 特征文件路径 -> (大小, 修改时间, 内容哈希)
+        if settings is not None:
+            self.voice_cache.set_max_bytes(int(settings.get("voice_cache.max_mb", 256) * 1024 * 1024))
     
     def generate_with_voice(self, features_path, text, instruct=None,
                            language="Chinese", output_dir="data/outputs",
@@ -65,19 +73,33 @@ class VoiceGenerator:
             output_path = Path(output_dir) / output_filename
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            if instruct:
+            prompt_cache_key = self._get_prompt_cache_key(features_path)
+            
+            # 长文本按句切分，分批合成后拼接
+            segments = split_text(text, max_chars=self._get_segment_setting("max_chars"))
+            
+            if len(segments) > 1:
+                if progress_callback:
+                    progress_callback(60, f"正在分段生成语音（共 {len(segments)} 段）...")
+                output_path = self._generate_segmented(
+                    model, prompt_items, segments, instruct, language, str(output_path),
+                    progress_callback=progress_callback, prompt_cache_key=prompt_cache_key
+                )
+            elif instruct:
                 # 使用带语气控制的生成
                 if progress_callback:
                     progress_callback(60, "正在生成语音（带语气控制）...")
                 output_path = self._generate_with_emotion(
-                    model, prompt_items, text, instruct, language, str(output_path)
+                    model, prompt_items, text, instruct, language, str(output_path),
+                    prompt_cache_key=prompt_cache_key
                 )
             else:
                 # 使用普通生成
                 if progress_callback:
                     progress_callback(60, "正在生成语音...")
                 output_path = self._generate_normal(
-                    model, prompt_items, text, language, str(output_path)
+                    model, prompt_items, text, language, str(output_path),
+                    prompt_cache_key=prompt_cache_key
                 )
             
             if progress_callback:
@@ -113,13 +135,25 @@ class VoiceGenerator:
             self.logger.error(f"生成语音失败: {e}")
             raise
     
-    def _load_voice_features(self, features_path):
-        """加载语音特征"""
+    def _load_voice_features(self, features_path, device=None):
+        """加载语音特征（优先从缓存读取）"""
+        if device is None:
+            device = self.model_loader.device
+        
+        cache_key = self.voice_cache.make_key(features_path, device)
+        prompt_items = self.voice_cache.get(cache_key)
+        if prompt_items is not None:
+            return prompt_items
+        
+        prompt_items = self._read_voice_features(features_path, device)
+        self.voice_cache.put(cache_key, prompt_items)
+        return prompt_items
+    
+    def _read_voice_features(self, features_path, device):
+        """从特征文件读取语音特征"""
         import torch
         from qwen_tts import VoiceClonePromptItem
         
-        device = self.model_loader.device
-        
         payload = torch.load(features_path, map_location=device)
         items_data = payload.get("items", [])
         
@@ -136,37 +170,144 @@ class VoiceGenerator:
         
         return prompt_items
     
-    def _generate_normal(self, model, prompt_items, text, language, output_path):
+    def prewarm_voice_cache(self, count=None):
+        """
+        预加载使用次数最多的音色特征到缓存
+        
+        Args:
+            count: 预加载的音色数量，默认读取配置 voice_cache.prewarm_count
+        
+        Returns:
+            loaded: 成功预加载的音色数量
+        """
+        import torch
+        
+        if count is None:
+            count = self.settings.get("voice_cache.prewarm_count", 3) if self.settings is not None else 3
+        if count <= 0:
+            return 0
+        
+        # 模型加载前按与 ModelLoader 相同的规则确定设备
+        device = self.model_loader.device
+        if device.startswith("cuda") and not torch.cuda.is_available():
+            device = "cpu"
+        
+        voices = sorted(
+            self.file_manager.list_voices(),
+            key=lambda v: v["meta"].get("usage_count", 0),
+            reverse=True
+        )
+        loaded = 0
+        for voice in voices[:count]:
+            try:
+                self._load_voice_features(voice["path"], device=device)
+                loaded += 1
+            except Exception as e:
+                self.logger.warning(f"预加载音色失败 {voice['name']}: {e}")
+        if loaded:
+            self.logger.info(f"已预加载 {loaded} 个常用音色")
+        return loaded
+    
+    def _get_prompt_cache_key(self, features_path):
+        """音色提示词缓存键：特征文件内容哈希 + 模型标识"""
+        model_id = self.model_loader.base_model_path or "Qwen3-TTS-12Hz-1.7B-Base"
+        return f"{model_id}:{self._get_features_digest(features_path)}"
+    
+    def _get_features_digest(self, features_path):
+        """特征文件内容哈希；文件大小和修改时间不变时复用上次结果，不再整读文件"""
+        path = Path(features_path).resolve()
+        stat = path.stat()
+        cached = self._feature_digests.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        self._feature_digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+    
+    def _generate_normal(self, model, prompt_items, text, language, output_path, prompt_cache_key=None):
         """普通生成（无语气控制）"""
         import soundfile as sf
         
-        wavs, sr = model.generate_voice_clone(
-            text=text,
-            language=language,
-            voice_clone_prompt=prompt_items,
-        )
+        wavs, sr = self._synthesize(model, prompt_items, [text], None, language, prompt_cache_key)
         
         sf.write(output_path, wavs[0], sr)
         return output_path
     
-    def _generate_with_emotion(self, model, prompt_items, text, instruct, language, output_path):
+    def _generate_with_emotion(self, model, prompt_items, text, instruct, language, output_path,
+                               prompt_cache_key=None):
         """带语气控制的生成"""
         import soundfile as sf
+        
+        wavs, sr = self._synthesize(model, prompt_items, [text], instruct, language, prompt_cache_key)
+        
+        # 保存结果
+        sf.write(output_path, wavs[0], sr)
+        return output_path
+    
+    def _generate_segmented(self, model, prompt_items, segments, instruct, language, output_path,
+                            progress_callback=None, prompt_cache_key=None):
+        """
+        长文本分段生成：按批并行合成各片段，按顺序拼接并逐段写入磁盘
+        """
+        from utils.audio_utils import SegmentStitcher
+        
+        batch_size = max(1, int(self._get_segment_setting("batch_size")))
+        silence_ms = self._get_segment_setting("silence_ms")
+        crossfade_ms = self._get_segment_setting("crossfade_ms")
+        
+        total = len(segments)
+        stitcher = None
+        try:
+            for start in range(0, total, batch_size):
+                batch = segments[start:start + batch_size]
+                wavs, sr = self._synthesize(model, prompt_items, batch, instruct, language, prompt_cache_key)
+                if stitcher is None:
+                    stitcher = SegmentStitcher(output_path, sr, silence_ms=silence_ms, crossfade_ms=crossfade_ms)
+                for wav in wavs:
+                    stitcher.add(wav)
+                
+                done = start + len(batch)
+                self.logger.info(f"分段生成进度: {done}/{total}")
+                if progress_callback:
+                    progress_callback(60 + int(35 * done / total), f"正在生成语音（{done}/{total} 段）...")
+        finally:
+            if stitcher is not None:
+                stitcher.close()
+        
+        return output_path
+    
+    def _synthesize(self, model, prompt_items, texts, instruct, language, prompt_cache_key=None):
+        """合成一批文本，返回 (wavs, sr)"""
+        if not instruct:
+            return model.generate_voice_clone(
+                text=texts,
+                language=language,
+                voice_clone_prompt=prompt_items,
+                prompt_cache_key=prompt_cache_key,
+            )
+        
         import torch
         
+        # 单个音色用于整批文本
+        if len(prompt_items) == 1 and len(texts) > 1:
+            prompt_items = prompt_items * len(texts)
+        
         # 转换 prompt items 为 voice_clone_prompt 字典
         voice_clone_prompt_dict = model._prompt_items_to_voice_clone_prompt(prompt_items)
         
-        # 准备文本和语言
-        texts = [text]
-        languages = [language]
+        # 准备语言
+        languages = [language] * len(texts)
         
         # 构建输入文本
         input_texts = [model._build_assistant_text(t) for t in texts]
         input_ids = model._tokenize_texts(input_texts)
         
         # 构建语气指令
-        instruct_texts = [model._build_instruct_text(instruct)]
+        instruct_texts = [model._build_instruct_text(instruct)] * len(texts)
         instruct_ids = model._tokenize_texts(instruct_texts)
         
         # 准备 ref_ids
@@ -192,6 +333,7 @@ class VoiceGenerator:
             instruct_ids=instruct_ids,
             languages=languages,
             non_streaming_mode=False,
+            prompt_cache_key=prompt_cache_key,
             **gen_kwargs,
         )
         
@@ -218,6 +360,11 @@ class VoiceGenerator:
             else:
                 wavs_out.append(wav)
         
-        # 保存结果
-        sf.write(output_path, wavs_out[0], fs)
-        return output_path
+        return wavs_out, fs
+    
+    def _get_segment_setting(self, name):
+        """获取分段合成配置"""
+        from config.constants import DEFAULT_SEGMENT
+        if self.settings is None:
+            return DEFAULT_SEGMENT[name]
+        return self.settings.get(f"segment.{name}", DEFAULT_SEGMENT[name])
@@ -1,8 +1,9 @@
 # coding=utf-8
 """主窗口"""
 import tkinter as tk
+import sys
+import threading
 from tkinter import ttk, messagebox
-import torch
 from core.model_loader import ModelLoader
 from core.voice_clone_manager import VoiceCloneManager
 from core.voice_generator import VoiceGenerator
@@ -24,8 +25,22 @@ class MainWindow:
         
         # 初始化核心组件
         self.model_loader = ModelLoader()
+        self.model_loader.set_memory_budget(
+            max_device_mb=self.settings.get("model_cache.max_device_mb", 0),
+            max_offload_mb=self.settings.get("model_cache.max_offload_mb", 0),
+            offload_to_cpu=self.settings.get("model_cache.offload_to_cpu", True),
+        )
+        # 无 CUDA 时 CPU 推理的量化方式（none / int8 / bf16 / auto）
+        self.model_loader.cpu_quantization = self.settings.get("defaults.cpu_quantization", "none")
+        self.model_loader.set_cpu_threads(
+            num_threads=self.settings.get("cpu_threads.num_threads", 0),
+            num_interop_threads=self.settings.get("cpu_threads.num_interop_threads", 0),
+            ort_threads=self.settings.get("cpu_threads.ort_threads", 0),
+            cpus=self.settings.get("cpu_threads.cpus", ""),
+            numa_node=self.settings.get("cpu_threads.numa_node", -1),
+        )
         self.voice_clone_manager = VoiceCloneManager(self.model_loader)
-        self.voice_generator = VoiceGenerator(self.model_loader)
+        self.voice_generator = VoiceGenerator(self.model_loader, self.settings)
         self.voice_designer = VoiceDesigner(self.model_loader)
         self.params_regenerator = ParamsRegenerator(
             self.model_loader,
@@ -33,6 +48,8 @@ class MainWindow:
             self.voice_designer
         )
         
+        self.device_info = "检测中..."
+
         self.setup_window()
         self.create_menu()
         self.create_tabs()
@@ -40,6 +57,37 @@ class MainWindow:
         
         # 更新状态栏
         self.update_status("就绪")
+        
+        # 后台预加载常用音色特征
+        threading.Thread(target=self.voice_generator.prewarm_voice_cache, daemon=True).start()
+
+        # 窗口显示后再在后台预加载默认模型
+        self.model_loader.add_progress_listener(self.on_model_progress)
+        self.root.after_idle(self.start_model_preload)
+    
+    def start_model_preload(self):
+        """后台预加载配置的默认模型（defaults.preload_model: base / voice_design / custom_voice / none）"""
+        kind = self.settings.get("defaults.preload_model", "base")
+        if kind not in ("base", "voice_design", "custom_voice"):
+            self.detect_device()
+            return
+        self.logger.info(f"后台预加载模型: {kind}")
+        self.model_loader.preload(kind)
+    
+    def on_model_progress(self, kind, message):
+        """模型加载进度（在加载线程中调用）"""
+        self.detect_device()
+        self.root.after(0, lambda: self.update_status(message))
+    
+    def detect_device(self):
+        """torch 已导入后记录设备信息"""
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return
+        if torch.cuda.is_available():
+            self.device_info = f"CUDA ({torch.cuda.get_device_name(0)})"
+        else:
+            self.device_info = "CPU"
     
     def setup_window(self):
         """设置窗口属性"""
@@ -131,17 +179,15 @@ class MainWindow:
     
     def update_status(self, message):
         """更新状态栏"""
-        # 获取GPU信息
-        gpu_info = "GPU: "
-        if torch.cuda.is_available():
-            gpu_info += f"CUDA ({torch.cuda.get_device_name(0)})"
-        else:
-            gpu_info += "CPU"
+        # 获取GPU信息（torch 延迟导入，导入前显示“检测中”）
+        gpu_info = f"GPU: {self.device_info}"
         
         # 获取模型状态
         model_status = "模型: "
-        if self.model_loader._base_model is not None:
+        if self.model_loader.is_loaded("base"):
             model_status += "已加载"
+        elif self.model_loader.is_loading("base"):
+            model_status += "加载中"
         else:
             model_status += "未加载"
         
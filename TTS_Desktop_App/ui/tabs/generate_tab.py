@@ -8,6 +8,7 @@ from ui.widgets.progress_bar import ProgressBar
 from utils.logger import get_logger
 from utils.text_utils import read_text_file, validate_text
 from utils.file_manager import FileManager
+from config.constants import MAX_SEGMENTED_TEXT_LENGTH
 
 class GenerateTab:
     """文本朗读标签页"""
@@ -183,7 +184,8 @@ class GenerateTab:
             return
         
         text = self.text_text.get(1.0, tk.END).strip()
-        is_valid, msg = validate_text(text)
+        # 长文本会自动分段合成
+        is_valid, msg = validate_text(text, max_length=MAX_SEGMENTED_TEXT_LENGTH)
         if not is_valid:
             messagebox.showerror("错误", msg)
             return
@@ -31,3 +31,70 @@ def validate_audio_file(audio_path):
         return True, "验证通过"
     except Exception as e:
         return False, f"音频文件格式错误: {e}"
+
+class SegmentStitcher:
+    """
+    分段音频拼接写入器
+    
+    按顺序接收各片段的波形并立即写入磁盘，片段之间插入静音；
+    crossfade 时长内对片段边缘做淡入淡出（无静音时直接交叉混合），避免拼接处的爆音。
+    """
+    
+    def __init__(self, output_path, sample_rate, silence_ms=200, crossfade_ms=20):
+        self.output_path = str(output_path)
+        self.sample_rate = sample_rate
+        self.silence = np.zeros(int(sample_rate * silence_ms / 1000), dtype=np.float32)
+        self.crossfade = int(sample_rate * crossfade_ms / 1000)
+        self.num_segments = 0
+        self._tail = None
+        Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = sf.SoundFile(self.output_path, mode='w', samplerate=sample_rate, channels=1)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def add(self, wav):
+        """追加一个片段"""
+        wav = np.asarray(wav, dtype=np.float32).reshape(-1)
+        if self._tail is None:
+            fade = min(self.crossfade, len(wav) // 2)
+        else:
+            fade = min(self.crossfade, len(wav) // 2, len(self._tail))
+        
+        if self._tail is not None:
+            if len(self.silence) > 0 or fade == 0:
+                # 上一段结尾淡出 + 静音 + 本段开头淡入
+                self._file.write(self._fade_out(self._tail))
+                if len(self.silence) > 0:
+                    self._file.write(self.silence)
+                wav = np.concatenate([self._fade_in(wav[:fade]), wav[fade:]])
+            else:
+                # 无静音时交叉混合
+                ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+                head = self._tail[:len(self._tail) - fade]
+                mixed = self._tail[len(self._tail) - fade:] * (1.0 - ramp) + wav[:fade] * ramp
+                self._file.write(np.concatenate([head, mixed]))
+                wav = wav[fade:]
+        
+        keep = min(self.crossfade, len(wav))
+        self._file.write(wav[:len(wav) - keep])
+        self._tail = wav[len(wav) - keep:]
+        self.num_segments += 1
+    
+    def _fade_in(self, x):
+        return x * np.linspace(0.0, 1.0, len(x), dtype=np.float32)
+    
+    def _fade_out(self, x):
+        return x * np.linspace(1.0, 0.0, len(x), dtype=np.float32)
+    
+    def close(self):
+        """写入剩余数据并关闭文件"""
+        if self._file is None:
+            return
+        if self._tail is not None and len(self._tail) > 0:
+            self._file.write(self._tail)
+        self._file.close()
+        self._file = None
@@ -5,6 +5,7 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 from .logger import get_logger
+from .voice_cache import get_voice_cache
 
 class FileManager:
     """文件管理器"""
@@ -94,6 +95,9 @@ class FileManager:
         pt_file = self.voices_dir / f"{voice_name}.pt"
         meta_file = self.voices_dir / f"{voice_name}_meta.json"
         
+        # 清除已加载的特征缓存
+        get_voice_cache().invalidate(pt_file)
+        
         try:
             if pt_file.exists():
                 pt_file.unlink()
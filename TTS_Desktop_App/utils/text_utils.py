@@ -1,7 +1,19 @@
 # coding=utf-8
 """文本处理工具"""
+import re
 from pathlib import Path
 
+# 句子边界：中英文句末标点（可带后引号/括号）、英文句点后接空白、换行
+# 换行符保留在前一句末尾，合并时不会把相邻两行的英文单词连在一起
+_SENTENCE_BOUNDARY = re.compile(
+    r'(?<=[。！？!?；;…])(?![。！？!?；;…”’"\'）)\]])'
+    r'|(?<=[。！？!?；;…][”’"\'）)\]])'
+    r'|(?<=\.)(?=\s)'
+    r'|(?<=\n)(?!\n)'
+)
+# 子句边界：中文逗号/顿号/冒号，英文逗号/冒号后接空白
+_CLAUSE_BOUNDARY = re.compile(r'(?<=[，、：])|(?<=[,:])(?=\s)')
+
 def read_text_file(file_path):
     """读取文本文件"""
     try:
@@ -10,10 +22,75 @@ def read_text_file(file_path):
     except Exception as e:
         return None
 
-def validate_text(text):
+def validate_text(text, max_length=5000):
     """验证文本"""
     if not text or not text.strip():
         return False, "文本不能为空"
-    if len(text) > 5000:
-        return False, "文本过长（最多5000字符）"
+    if len(text) > max_length:
+        return False, f"文本过长（最多{max_length}字符）"
     return True, "验证通过"
+
+def _hard_split(clause, max_chars):
+    """按长度切分超长子句：优先在 max_chars 内最后一个空白处切，无空白（如中文）时按字符切"""
+    parts = []
+    while len(clause) > max_chars:
+        cut = max(clause.rfind(' ', 0, max_chars + 1), clause.rfind('\t', 0, max_chars + 1))
+        if cut <= 0:
+            cut = max_chars
+        parts.append(clause[:cut])
+        clause = clause[cut:]
+    if clause:
+        parts.append(clause)
+    return parts
+
+def split_text(text, max_chars=200):
+    """
+    将长文本切分为适合单次合成的片段
+    
+    优先在句末标点处切分，超长句子再按逗号等子句边界切分，仍超长则在空白处（无空白时按长度）硬切；
+    相邻的短句会合并，使每段尽量接近但不超过 max_chars。
+    
+    Args:
+        text: 文本内容
+        max_chars: 每段最大字符数
+    
+    Returns:
+        segments: 片段列表（按原文顺序）
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    
+    pieces = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        if not sentence:
+            continue
+        if not sentence.strip():
+            # 纯空白（如空行）并入前一句，保留分隔
+            if pieces:
+                pieces[-1] += sentence
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_BOUNDARY.split(sentence):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+            else:
+                pieces.extend(_hard_split(clause, max_chars))
+    
+    # 合并相邻短句
+    segments = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            segments.append(current)
+            current = piece
+        else:
+            current += piece
+    if current:
+        segments.append(current)
+    
+    return [s.strip() for s in segments if s.strip()]
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""音色特征缓存"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+_voice_cache = None
+
+class VoiceFeatureCache:
+    """
+    已加载音色特征（VoiceClonePromptItem 列表）的 LRU 缓存
+    
+    键为 (特征文件路径, 修改时间, 设备)，文件被覆盖后修改时间变化，旧条目自然失效；
+    总占用超过 max_bytes 时淘汰最久未使用的条目。
+    """
+    
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (prompt_items, nbytes)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(features_path, device):
+        """生成缓存键"""
+        path = Path(features_path).resolve()
+        return (str(path), path.stat().st_mtime_ns, str(device))
+    
+    @staticmethod
+    def _items_nbytes(prompt_items):
+        nbytes = 0
+        for item in prompt_items:
+            for tensor in (item.ref_code, item.ref_spk_embedding):
+                if tensor is not None:
+                    nbytes += tensor.numel() * tensor.element_size()
+        return nbytes
+    
+    def get(self, key):
+        """获取缓存的音色特征，未命中返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return list(entry[0])
+    
+    def put(self, key, prompt_items):
+        """写入音色特征"""
+        nbytes = self._items_nbytes(prompt_items)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (list(prompt_items), nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+    
+    def invalidate(self, features_path):
+        """移除某个特征文件的所有缓存条目（任意修改时间和设备）"""
+        path = str(Path(features_path).resolve())
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self.total_bytes -= self._entries.pop(key)[1]
+    
+    def set_max_bytes(self, max_bytes):
+        """调整缓存容量"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _evict(self):
+        while self._entries and self.total_bytes > self.max_bytes:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+
+def get_voice_cache():
+    """获取全局音色特征缓存实例"""
+    global _voice_cache
+    if _voice_cache is None:
+        _voice_cache = VoiceFeatureCache()
+    return _voice_cache